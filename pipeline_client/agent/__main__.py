@@ -2,6 +2,8 @@
 
 Usage:
     python -m pipeline_client.agent <race_id> [--cheap-mode]
+    python -m pipeline_client.agent <race_id> --record cassettes/<race_id>.json
+    python -m pipeline_client.agent <race_id> --replay cassettes/<race_id>.json
 
 Used by the Cloud Run Job (infra/run-job.tf) to process a single race.
 """
@@ -31,9 +33,15 @@ async def main() -> None:
     parser.add_argument("race_id", help="Race slug, e.g. mo-senate-2024")
     parser.add_argument("--cheap-mode", action="store_true", default=True)
     parser.add_argument("--no-cheap-mode", dest="cheap_mode", action="store_false")
+    parser.add_argument(
+        "--issue-concurrency", type=int, default=None, help="Max issue sub-agents running at once (default: agent default)"
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="CASSETTE", help="Record all outbound calls to a cassette file")
+    cassette.add_argument("--replay", metavar="CASSETTE", help="Serve the run offline from a recorded cassette")
     args = parser.parse_args()
 
-    from pipeline_client.agent.agent import run_agent
+    from pipeline_client.agent.agent import DEFAULT_ISSUE_CONCURRENCY, run_agent
 
     def on_log(level: str, message: str) -> None:
         logger.log(getattr(logging, level.upper(), logging.INFO), message)
@@ -43,6 +51,9 @@ async def main() -> None:
         args.race_id,
         on_log=on_log,
         cheap_mode=args.cheap_mode,
+        issue_concurrency=args.issue_concurrency or DEFAULT_ISSUE_CONCURRENCY,
+        cassette_path=args.record or args.replay,
+        cassette_mode="record" if args.record else "replay" if args.replay else None,
     )
 
     # Write result to published dir
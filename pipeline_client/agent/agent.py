@@ -11,12 +11,19 @@ Phases (fresh run):
 
 Update run adds Phase 0 (roster sync) before Phase 1 (meta update).
 
+Phases 1b, 2 and 2b only depend on the roster and run concurrently as a
+dependency graph (``pipeline_client.agent.phases``); refinement waits for all
+three.
+
 Uses a SQLite search cache (``pipeline_client.agent.search_cache``) to avoid
 redundant Serper API calls across runs.  Token usage and estimated USD cost
 are attached to the output JSON under ``agent_metrics``.
 """
 
 import asyncio
+import codecs
+import copy
+import hashlib
 import json
 import logging
 import os
@@ -24,13 +31,24 @@ import re
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import httpx
 
-from .cost import _cost_ctx, accumulate, estimate_cost
+from .ballotpedia import lookup_candidate_data as _ballotpedia_lookup
+from .cassette import CassetteMiss, ReplayedError, _cassette_ctx, env_flag, open_cassette, recorded
+from .checkpoint import RunCheckpointer
+from .compaction import DEFAULT_CONTEXT_TOKEN_BUDGET, compact_messages
+from .cost import _cost_ctx, accumulate, estimate_cost, record_metric
 from .handlers import _make_editing_handlers
+from .html_text import extract_text
+from .http_client import get_http_client
 from .images import resolve_candidate_images
+from .offload import run_cpu
+from .passages import select_passages
+from .phases import Phase, run_phase_graph
+from .prefetch import Prefetcher, _prefetch_ctx, get_prefetcher
 from .prompts import (
     CANONICAL_ISSUES,
     DISCOVERY_SYSTEM,
@@ -39,12 +57,12 @@ from .prompts import (
     FINANCE_VOTING_USER,
     ISSUE_SUBAGENT_SYSTEM,
     ISSUE_SUBAGENT_USER,
+    ITERATE_META_USER,
     ITERATE_SYSTEM,
     ITERATE_USER,
-    ITERATE_META_USER,
+    REFINE_META_USER,
     REFINE_SYSTEM,
     REFINE_USER,
-    REFINE_META_USER,
     ROSTER_SYNC_SYSTEM,
     ROSTER_SYNC_USER,
     UPDATE_ISSUE_SUBAGENT_SYSTEM,
@@ -52,8 +70,11 @@ from .prompts import (
     UPDATE_META_SYSTEM,
     UPDATE_META_USER,
 )
+from .rate_limit import estimate_request_tokens, get_rate_limiter
 from .review import compute_validation_grade, run_reviews
-from .ballotpedia import lookup_candidate_data as _ballotpedia_lookup
+from .schemas import DISCOVERY_FORMAT, FINANCE_VOTING_FORMAT
+from .search_cache import search_key
+from .single_flight import get_single_flight
 from .tools import (
     ADD_CANDIDATE_TOOL,
     ADD_LINK_TOOL,
@@ -63,8 +84,8 @@ from .tools import (
     CANDIDATE_TOOLS,
     FETCH_TOOL,
     ISSUE_TOOLS,
-    READ_PROFILE_TOOL,
     RACE_TOOLS,
+    READ_PROFILE_TOOL,
     RECORD_TOOLS,
     REMOVE_CANDIDATE_TOOL,
     RENAME_CANDIDATE_TOOL,
@@ -77,7 +98,7 @@ from .tools import (
     SET_VOTING_SUMMARY_TOOL,
     UPDATE_RACE_FIELD_TOOL,
 )
-from .utils import _extract_json, make_logger
+from .utils import _extract_json_with_repairs, make_logger
 
 logger = logging.getLogger("pipeline")
 
@@ -86,8 +107,11 @@ logger = logging.getLogger("pipeline")
 # ---------------------------------------------------------------------------
 
 DEFAULT_MODEL = "gpt-5.4"
-CHEAP_MODEL  = "gpt-5.4-mini"
-NANO_MODEL   = "gpt-5-nano"   # fastest/cheapest — used for focused sub-tasks in cheap mode
+CHEAP_MODEL = "gpt-5.4-mini"
+NANO_MODEL = "gpt-5-nano"  # fastest/cheapest — used for focused sub-tasks in cheap mode
+
+# Max issue sub-agent sessions running at once during the issues phase.
+DEFAULT_ISSUE_CONCURRENCY = 3
 
 
 # ---------------------------------------------------------------------------
@@ -99,6 +123,7 @@ def _get_search_cache():
     """Return the shared SearchCache instance, or None if unavailable."""
     try:
         from pipeline_client.agent.search_cache import get_search_cache
+
         return get_search_cache()
     except Exception:
         return None
@@ -109,38 +134,30 @@ def _get_search_cache():
 # ---------------------------------------------------------------------------
 
 
-def _strip_html(html: str) -> str:
-    """Strip HTML tags and collapse whitespace to get readable page text."""
-    # Remove script/style blocks entirely
-    text = re.sub(r"<(script|style|noscript)[^>]*>.*?</\1>", "", html, flags=re.DOTALL | re.IGNORECASE)
-    # Remove HTML comments
-    text = re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
-    # Replace block-level tags with newlines so paragraphs stay readable
-    text = re.sub(r"</(p|div|li|h[1-6]|tr|br)[^>]*>", "\n", text, flags=re.IGNORECASE)
-    # Remove all remaining tags
-    text = re.sub(r"<[^>]+>", " ", text)
-    # Decode common HTML entities
-    for entity, char in [
-        ("&amp;", "&"), ("&lt;", "<"), ("&gt;", ">"),
-        ("&nbsp;", " "), ("&quot;", '"'), ("&#39;", "'"),
-    ]:
-        text = text.replace(entity, char)
-    # Collapse whitespace
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    # Strip ASCII control characters that are invalid in JSON strings
-    # (keep \x09 tab, \x0a newline, \x0d carriage-return)
-    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text)
-    return text.strip()
-
-
+_SERPER_DEFAULT_URL = "https://google.serper.dev/search"
+# Page text returned to the model; pages are cached up to _PAGE_STORE_MAX_CHARS so a
+# focused fetch can pick relevant passages from past the head of the page.
 _PAGE_MAX_CHARS = 16000
+_PAGE_STORE_MAX_CHARS = 64000
+# Response bodies are read up to this many (decoded) bytes
+_PAGE_MAX_BYTES = int(os.getenv("PAGE_FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
 _PAGE_MIN_USEFUL_CHARS = 300
 _PAGE_PROXY_RETRY_CHARS = 900
-_BROWSER_UA = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
-)
+# Failed/unusable fetches are served from the negative cache for this long.
+_FETCH_FAILURE_TTL_HOURS = 0.5
+# A host's fetch strategy is skipped after this many failures in a row.
+_FETCH_STRATEGY_BLOCK_AFTER = 2
+# Some campaign sites block one header/profile but allow another.
+_FETCH_HEADER_PROFILES = {
+    "direct": {},
+    "alt_headers": {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Cache-Control": "no-cache",
+        "Pragma": "no-cache",
+    },
+}
+_FETCH_STRATEGIES = ("direct", "alt_headers", "proxy")
 
 _UNUSABLE_PAGE_MARKERS = [
     "enable javascript",
@@ -163,114 +180,276 @@ _UNUSABLE_PAGE_MARKERS = [
     "our systems have detected unusual traffic",
 ]
 
-_fetch_clients_by_loop: Dict[int, httpx.AsyncClient] = {}
-_serper_clients_by_loop: Dict[int, httpx.AsyncClient] = {}
-
 
 def _get_fetch_client() -> httpx.AsyncClient:
-    """Return a per-event-loop AsyncClient for page fetches."""
-    loop_id = id(asyncio.get_running_loop())
-    client = _fetch_clients_by_loop.get(loop_id)
-    if client is None or client.is_closed:
-        client = httpx.AsyncClient(
-            timeout=20,
-            follow_redirects=True,
-            headers={"User-Agent": _BROWSER_UA},
-        )
-        _fetch_clients_by_loop[loop_id] = client
-    return client
+    """Return the shared outbound client for page fetches (see ``http_client``)."""
+    return get_http_client()
 
 
 def _get_serper_client() -> httpx.AsyncClient:
-    """Return a per-event-loop AsyncClient for Serper API calls."""
-    loop_id = id(asyncio.get_running_loop())
-    client = _serper_clients_by_loop.get(loop_id)
-    if client is None or client.is_closed:
-        client = httpx.AsyncClient(timeout=15)
-        _serper_clients_by_loop[loop_id] = client
-    return client
+    """Return the shared outbound client for Serper API calls."""
+    return get_http_client()
+
 
+@recorded("fetch", ignore=("race_id",))
+async def _fetch_page(url: str, *, race_id: Optional[str] = None) -> str:
+    """Fetch a URL and return stripped text content, with caching and fallback.
 
-async def _fetch_page(url: str) -> str:
-    """Fetch a URL and return stripped text content, with caching and fallback."""
+    *race_id* adds the page to that race's cache index.  A URL whose fetch
+    failed recently gets the cached failure message without a new attempt.
+    """
     cache = _get_search_cache()
     if cache:
-        cached = cache.get_page(url)
+        cached = await cache.aget_page(url, race_id=race_id)
         if cached:
             logger.debug(f"Page cache HIT: {url[:60]}")
             return cached
+        failure = await cache.aget_fetch_failure(url)
+        if failure:
+            logger.debug(f"Fetch failure cache HIT: {url[:60]}")
+            record_metric("fetch", "negative_cache_hits")
+            return failure
+
+    # Concurrent sub-agents fetching the same URL share one download and one cache write.
+    text, shared = await get_single_flight().do(("page", url), lambda: _download_page(url, cache, race_id))
+    if shared:
+        record_metric("single_flight", "fetches_coalesced")
+        if cache and race_id:
+            cache.tag_page(url, race_id)
+    return text
+
+
+async def _prefetch_page(url: str) -> Optional[str]:
+    """Download hook of the run's ``Prefetcher``: warm the page cache unless *url* is cached or failed recently."""
+    cache = _get_search_cache()
+    # Existence checks only: a speculative look must not count as a cache hit or refresh LRU recency.
+    if cache and (await cache.ahas_page(url) or await cache.aget_fetch_failure(url)):
+        return None
+    # No race_id: the page joins the race's index only if the model actually fetches it.
+    return await _fetch_page(url)
 
-    client = _get_fetch_client()
-    failure_reasons: List[str] = []
 
-    # Some campaign sites block one header/profile but allow another.
-    header_profiles = [
-        {},
-        {
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-        },
+def _plan_fetch_strategies(stats: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Order in which to try the fetch strategies for a host, given its learned ``stats``.
+
+    Strategies that worked before go first, most recent success first; the
+    rest follow in the default order.  A strategy that failed
+    ``_FETCH_STRATEGY_BLOCK_AFTER`` times in a row is skipped, except the proxy,
+    which is always kept as the last resort.
+    """
+    usable = [
+        s
+        for s in _FETCH_STRATEGIES
+        if s == "proxy" or stats.get(s, {}).get("consecutive_failures", 0) < _FETCH_STRATEGY_BLOCK_AFTER
     ]
+    proven = sorted(
+        (s for s in usable if stats.get(s, {}).get("last_success")),
+        key=lambda s: stats[s]["last_success"],
+        reverse=True,
+    )
+    return proven + [s for s in usable if s not in proven]
 
-    for headers in header_profiles:
-        try:
-            resp = await client.get(url, headers=headers or None)
+
+def _truncate_page(text: str, limit: int = _PAGE_STORE_MAX_CHARS) -> str:
+    if len(text) > limit:
+        return text[:limit] + f"\n\n[...truncated at {limit} chars]"
+    return text
+
+
+def _page_for_model(text: str, focus: str) -> str:
+    """What ``fetch_page`` returns: the passages most relevant to *focus*, or the head of the page."""
+    if not focus:
+        return _truncate_page(text, _PAGE_MAX_CHARS)
+    selected, dropped = select_passages(text, focus, _PAGE_MAX_CHARS // 4)
+    if dropped:
+        record_metric("fetch", "focused_pages")
+        record_metric("fetch", "focus_chars_dropped", dropped)
+    return selected
+
+
+def _content_length(resp: httpx.Response) -> int:
+    try:
+        return int(resp.headers.get("content-length") or 0)
+    except ValueError:
+        return 0
+
+
+async def _read_capped(resp: httpx.Response) -> str:
+    """Read and decode a streamed body, stopping after ``_PAGE_MAX_BYTES``.
+
+    Bytes read and (for capped bodies with a known Content-Length) bytes
+    left unread are recorded in the run's fetch metrics.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(resp.charset_encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts: List[str] = []
+    received = 0
+    capped = False
+    async for chunk in resp.aiter_bytes():
+        received += len(chunk)
+        parts.append(decoder.decode(chunk))
+        if received >= _PAGE_MAX_BYTES:
+            capped = True
+            break
+    parts.append(decoder.decode(b"", final=True))
+    record_metric("fetch", "bytes_downloaded", resp.num_bytes_downloaded)
+    if capped:
+        record_metric("fetch", "byte_capped")
+        record_metric("fetch", "bytes_saved", max(0, _content_length(resp) - resp.num_bytes_downloaded))
+    return "".join(parts)
+
+
+class _PageNotModified(Exception):
+    """A conditional GET was answered with 304 Not Modified."""
+
+
+async def _fetch_direct(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Dict[str, str],
+    failure_reasons: List[str],
+    *,
+    stale: Optional[Dict[str, Any]] = None,
+    validators_out: Optional[Dict[str, Optional[str]]] = None,
+) -> Optional[str]:
+    """One direct GET of *url*; returns usable stripped text or None (reason appended).
+
+    With *stale* (validators of an expired cached copy) the GET is conditional
+    and a 304 raises ``_PageNotModified``.  The response's ETag /
+    Last-Modified are written to *validators_out*.
+    """
+    request_headers = dict(headers)
+    if stale:
+        if stale.get("etag"):
+            request_headers["If-None-Match"] = stale["etag"]
+        if stale.get("last_modified"):
+            request_headers["If-Modified-Since"] = stale["last_modified"]
+    try:
+        async with client.stream("GET", url, headers=request_headers or None) as resp:
+            if stale and resp.status_code == 304:
+                raise _PageNotModified(url)
             resp.raise_for_status()
+            if validators_out is not None:
+                validators_out["etag"] = resp.headers.get("etag")
+                validators_out["last_modified"] = resp.headers.get("last-modified")
             content_type = resp.headers.get("content-type", "")
             if "html" in content_type or "text" in content_type:
-                text = _strip_html(resp.text)
+                html = await _read_capped(resp)
             else:
-                text = f"[Non-text content: {content_type}]"
+                # Decided from the headers alone: the body is never read
+                html = None
+                record_metric("fetch", "non_text_skipped")
+                record_metric("fetch", "bytes_saved", _content_length(resp))
+    except _PageNotModified:
+        raise
+    except Exception as exc:
+        failure_reasons.append(str(exc))
+        return None
+    if html is None:
+        text = f"[Non-text content: {content_type}]"
+    else:
+        # Stop just past the stored-page limit; _truncate_page then marks the cut
+        text = await run_cpu(extract_text, html, _PAGE_STORE_MAX_CHARS)
+    if _is_unusable_page_text(text):
+        failure_reasons.append("primary_fetch_unusable_content")
+        return None
+    return text
+
+
+async def _fetch_via_proxy(
+    client: httpx.AsyncClient, url: str, failure_reasons: List[str], label: str = "proxy"
+) -> Optional[str]:
+    """Fetch *url* through the jina text proxy; returns usable text or None (reason appended)."""
+    try:
+        async with client.stream("GET", f"https://r.jina.ai/{url}") as resp:
+            resp.raise_for_status()
+            text = (await _read_capped(resp)).strip()
+    except Exception as exc:
+        failure_reasons.append(f"{label}: {exc}")
+        return None
+    if _is_unusable_page_text(text):
+        failure_reasons.append(f"{label}_unusable_content")
+        return None
+    return text
 
-            if _is_unusable_page_text(text):
-                failure_reasons.append("primary_fetch_unusable_content")
-                continue
 
+async def _download_page(url: str, cache: Any, race_id: Optional[str] = None) -> str:
+    """Network part of ``_fetch_page``: try the host's fetch strategies in learned order.
+
+    Strategies are direct, direct with alternate headers, and the jina text
+    proxy (which often succeeds when direct fetches hit bot checks).  Each
+    attempt's outcome is recorded per host, so hosts that keep blocking
+    direct requests go straight to the proxy.  A fetch that fails every
+    strategy is cached as a failure for ``_FETCH_FAILURE_TTL_HOURS``.
+
+    When an expired copy with an ETag / Last-Modified is still cached, direct
+    requests are conditional; a 304 extends the cached copy instead of
+    downloading and stripping the page again.
+    """
+    client = _get_fetch_client()
+    host = (urlparse(url).hostname or "").lower()
+    stats = await cache.afetch_strategy_stats(host) if cache and host else {}
+    stale = await cache.aget_page_validators(url) if cache else None
+    plan = _plan_fetch_strategies(stats)
+    skipped = len(_FETCH_STRATEGIES) - len(plan)
+    if skipped:
+        record_metric("fetch", "strategies_skipped", skipped)
+
+    failure_reasons: List[str] = []
+    outcomes: List[Tuple[str, bool]] = []
+    text: Optional[str] = None
+    validators: Dict[str, Optional[str]] = {}
+    not_modified = False
+    for strategy in plan:
+        validators = {}
+        if strategy == "proxy":
+            text = await _fetch_via_proxy(client, url, failure_reasons)
+        else:
+            try:
+                text = await _fetch_direct(
+                    client,
+                    url,
+                    _FETCH_HEADER_PROFILES[strategy],
+                    failure_reasons,
+                    stale=stale,
+                    validators_out=validators,
+                )
+            except _PageNotModified:
+                text, not_modified = stale["content"], True
             # Some anti-bot pages return HTTP 200 with short generic text. For very
             # short pages, opportunistically try the proxy and prefer richer content.
-            if len(text.strip()) < _PAGE_PROXY_RETRY_CHARS:
-                try:
-                    proxy_url = f"https://r.jina.ai/{url}"
-                    proxy_resp = await client.get(proxy_url)
-                    proxy_resp.raise_for_status()
-                    proxy_text = proxy_resp.text.strip()
-                    if (not _is_unusable_page_text(proxy_text)) and (len(proxy_text) > len(text) + 200):
-                        if len(proxy_text) > _PAGE_MAX_CHARS:
-                            proxy_text = proxy_text[:_PAGE_MAX_CHARS] + f"\n\n[...truncated at {_PAGE_MAX_CHARS} chars]"
-                        if cache:
-                            cache.set_page(url, proxy_text)
-                        return proxy_text
-                except Exception as exc:
-                    failure_reasons.append(f"short-page proxy probe: {exc}")
-
-            if len(text) > _PAGE_MAX_CHARS:
-                text = text[:_PAGE_MAX_CHARS] + f"\n\n[...truncated at {_PAGE_MAX_CHARS} chars]"
-
-            if cache:
-                cache.set_page(url, text)
-            return text
-        except Exception as exc:
-            failure_reasons.append(str(exc))
+            proxy_untried = "proxy" in plan and all(tried != "proxy" for tried, _ in outcomes)
+            if text is not None and not not_modified and len(text.strip()) < _PAGE_PROXY_RETRY_CHARS and proxy_untried:
+                proxy_text = await _fetch_via_proxy(client, url, failure_reasons, label="short-page proxy probe")
+                if proxy_text is not None and len(proxy_text) > len(text) + 200:
+                    outcomes.append((strategy, False))
+                    strategy, text, validators = "proxy", proxy_text, {}
+        outcomes.append((strategy, text is not None))
+        if text is not None:
+            break
+
+    if cache and host:
+        await cache.arecord_fetch_outcomes(host, outcomes)
+
+    if text is None:
+        message = f"[Failed to fetch {url}: {' | '.join(failure_reasons[:3])}]"
+        if cache:
+            await cache.aset_fetch_failure(url, message, _FETCH_FAILURE_TTL_HOURS)
+        return message
 
-    # Fallback: jina text proxy often succeeds when direct fetches hit bot checks.
-    proxy_url = f"https://r.jina.ai/{url}"
-    try:
-        proxy_resp = await client.get(proxy_url)
-        proxy_resp.raise_for_status()
-        proxy_text = proxy_resp.text.strip()
-        if not _is_unusable_page_text(proxy_text):
-            if len(proxy_text) > _PAGE_MAX_CHARS:
-                proxy_text = proxy_text[:_PAGE_MAX_CHARS] + f"\n\n[...truncated at {_PAGE_MAX_CHARS} chars]"
-            if cache:
-                cache.set_page(url, proxy_text)
-            return proxy_text
-        failure_reasons.append("proxy_unusable_content")
-    except Exception as exc:
-        failure_reasons.append(f"proxy: {exc}")
+    if not_modified:
+        record_metric("fetch", "revalidated_not_modified")
+        await cache.arefresh_page(url)
+        if race_id:
+            cache.tag_page(url, race_id)
+        return text
 
-    return f"[Failed to fetch {url}: {' | '.join(failure_reasons[:3])}]"
+    text = _truncate_page(text)
+    if cache:
+        await cache.aset_page(url, text, race_id=race_id, **validators)
+    return text
 
 
 def _is_unusable_page_text(text: str) -> bool:
@@ -288,9 +467,8 @@ def _is_unusable_page_text(text: str) -> bool:
     return False
 
 
-async def _serper_search(
-    query: str, *, num_results: int = 8, race_id: Optional[str] = None
-) -> List[Dict[str, Any]]:
+@recorded("serper")
+async def _serper_search(query: str, *, num_results: int = 8, race_id: Optional[str] = None) -> List[Dict[str, Any]]:
     """Execute a web search via the Serper API, with caching."""
     if not query or not query.strip():
         logger.warning("_serper_search called with empty query — skipping")
@@ -298,7 +476,7 @@ async def _serper_search(
 
     cache = _get_search_cache()
     if cache:
-        cached = cache.get(query, race_id)
+        cached = await cache.aget(query, race_id, num_results=num_results)
         if cached:
             logger.debug(f"Search cache HIT: {query[:60]}")
             return cached["results"]
@@ -307,34 +485,56 @@ async def _serper_search(
     if not api_key:
         return [{"error": "SERPER_API_KEY not configured"}]
 
+    # Same key as the cache: concurrent equivalent searches share one request, across races too.
+    results, shared = await get_single_flight().do(
+        ("search", search_key(query, num_results)),
+        lambda: _serper_request(query, api_key, num_results=num_results, race_id=race_id, cache=cache),
+    )
+    if shared:
+        record_metric("single_flight", "searches_coalesced")
+        if cache and race_id:
+            cache.tag(query, race_id, num_results=num_results)
+    return results
+
+
+async def _serper_request(
+    query: str, api_key: str, *, num_results: int, race_id: Optional[str], cache: Any
+) -> List[Dict[str, Any]]:
+    """POST one query to Serper, normalise the results and cache them."""
     client = _get_serper_client()
     resp = await client.post(
-        "https://google.serper.dev/search",
+        os.environ.get("SERPER_API_URL", _SERPER_DEFAULT_URL),
         headers={"X-API-KEY": api_key, "Content-Type": "application/json"},
         json={"q": query, "num": num_results},
+        timeout=15,
     )
     resp.raise_for_status()
     data = resp.json()
 
     results: List[Dict[str, Any]] = []
     for item in data.get("organic", []):
-        results.append({
-            "title": item.get("title", ""),
-            "snippet": item.get("snippet", ""),
-            "url": item.get("link", ""),
-        })
+        results.append(
+            {
+                "title": item.get("title", ""),
+                "snippet": item.get("snippet", ""),
+                "url": item.get("link", ""),
+            }
+        )
 
     kg = data.get("knowledgeGraph")
     if kg:
-        results.insert(0, {
-            "title": kg.get("title", ""),
-            "snippet": kg.get("description", ""),
-            "url": kg.get("website", kg.get("descriptionLink", "")),
-            "type": "knowledge_graph",
-        })
+        results.insert(
+            0,
+            {
+                "title": kg.get("title", ""),
+                "snippet": kg.get("description", ""),
+                "url": kg.get("website", kg.get("descriptionLink", "")),
+                "type": "knowledge_graph",
+            },
+        )
 
     if cache:
-        cache.set(query, results, race_id=race_id, provider="serper")
+        await cache.aset(query, results, race_id=race_id, provider="serper", num_results=num_results)
 
     return results
 
@@ -365,6 +565,134 @@ def _get_openai_client() -> Any:
     return _openai_client
 
 
+# Streaming (opt-in): AGENT_STREAM_COMPLETIONS=1 or _agent_loop(stream=True).
+_STREAM_DEFAULT = os.getenv("AGENT_STREAM_COMPLETIONS", "").strip().lower() in ("1", "true", "yes")
+# Structured outputs (on by default): json-mode phases that declare a schema send it as response_format.
+_STRUCTURED_OUTPUTS = os.getenv("AGENT_STRUCTURED_OUTPUTS", "1").strip().lower() not in ("0", "false", "no")
+# A JSON answer that has streamed this many characters without opening an
+# object/array is abandoned early and re-prompted.
+_STREAM_NOT_JSON_CHARS = 400
+_STREAM_PROGRESS_EVERY_S = 10.0
+
+
+async def _consume_stream(
+    stream: Any,
+    *,
+    model: str,
+    expect_json: bool,
+    stats: Dict[str, Any],
+) -> Any:
+    """Assemble a streamed chat completion into a regular ``ChatCompletion``.
+
+    Content and tool-call argument deltas are concatenated per index.  When
+    *expect_json* is set and the output is clearly not JSON, the stream is
+    closed early.  Fills *stats* with ``ttft_s``, ``tokens_per_s`` and
+    ``aborted_not_json``.
+    """
+    from openai.types.chat import ChatCompletion
+
+    t0 = time.perf_counter()
+    ttft: Optional[float] = None
+    content_parts: List[str] = []
+    n_chars = 0
+    tool_calls: Dict[int, Dict[str, Any]] = {}
+    finish_reason: Optional[str] = None
+    usage: Any = None
+    aborted = False
+    last_progress = t0
+
+    try:
+        async for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if ttft is None and (delta.content or delta.tool_calls):
+                ttft = time.perf_counter() - t0
+            if delta.content:
+                content_parts.append(delta.content)
+                n_chars += len(delta.content)
+            for tc in delta.tool_calls or []:
+                slot = tool_calls.setdefault(
+                    tc.index, {"id": None, "type": "function", "function": {"name": "", "arguments": ""}}
+                )
+                if tc.id:
+                    slot["id"] = tc.id
+                if tc.function is not None:
+                    slot["function"]["name"] += tc.function.name or ""
+                    slot["function"]["arguments"] += tc.function.arguments or ""
+                    n_chars += len(tc.function.arguments or "")
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+                if finish_reason == "length":
+                    logger.warning(f"OpenAI stream for {model} hit max tokens after {n_chars} chars")
+
+            if expect_json and not tool_calls and finish_reason is None and n_chars >= _STREAM_NOT_JSON_CHARS:
+                text = "".join(content_parts)
+                if "{" not in text and "[" not in text:
+                    aborted = True
+                    break
+
+            now = time.perf_counter()
+            if now - last_progress >= _STREAM_PROGRESS_EVERY_S:
+                last_progress = now
+                logger.info(f"  streaming {model}: {n_chars:,} chars in {now - t0:.0f}s")
+    finally:
+        if aborted and hasattr(stream, "close"):
+            try:
+                await stream.close()
+            except Exception:
+                pass
+
+    elapsed = time.perf_counter() - t0
+    completion_tokens = getattr(usage, "completion_tokens", None) or n_chars // 4
+    gen_time = max(elapsed - (ttft or 0.0), 1e-6)
+    stats.update(
+        {
+            "ttft_s": round(ttft if ttft is not None else elapsed, 3),
+            "tokens_per_s": round(completion_tokens / gen_time, 1),
+            "aborted_not_json": aborted,
+        }
+    )
+
+    assembled_calls = [tool_calls[i] for i in sorted(tool_calls)]
+    return ChatCompletion.model_validate(
+        {
+            "id": "stream",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": finish_reason or "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": "".join(content_parts) or None,
+                        "tool_calls": assembled_calls or None,
+                    },
+                }
+            ],
+            "usage": usage.model_dump() if usage is not None else None,
+        }
+    )
+
+
+def _completion_from_dict(data: Dict[str, Any]) -> Any:
+    """Rebuild a ``ChatCompletion`` from its cassette form."""
+    from openai.types.chat import ChatCompletion
+
+    return ChatCompletion.model_validate(data)
+
+
+@recorded(
+    "openai",
+    ignore=("max_retries", "stream", "expect_json", "stream_stats"),
+    encode=lambda resp: resp.model_dump(),
+    decode=_completion_from_dict,
+)
 async def _call_openai(
     messages: List[Dict[str, Any]],
     *,
@@ -372,27 +700,40 @@ async def _call_openai(
     tools: List[Dict[str, Any]] | None = None,
     max_retries: int = 12,
     max_tokens: int = 16384,
+    stream: bool = False,
+    expect_json: bool = False,
+    stream_stats: Optional[Dict[str, Any]] = None,
+    response_format: Optional[Dict[str, Any]] = None,
 ):
     """Call the OpenAI Chat Completions API with retry on transient errors.
 
-    429 rate-limit: exponential backoff starting at 30 s, capped at 10 min.
+    With *stream* the response is streamed and assembled incrementally (see
+    ``_consume_stream``); *expect_json* enables the early not-JSON abort and
+    *stream_stats* receives time-to-first-token and tokens/sec.
+    *response_format* (a ``json_schema`` format from ``schemas``) constrains
+    the answer to a schema; a model that rejects it is retried without.
+
+    Every attempt first acquires from the shared per-model rate limiter
+    (``rate_limit.get_rate_limiter``), which budgets requests and estimated
+    tokens per minute and learns the real limits from ``x-ratelimit-*``
+    headers.
+
+    429 rate-limit: the limiter pauses *all* callers of the model until the
+    Retry-After / reset time (or a shared exponential fallback) has passed.
     5xx transient errors: shorter exponential backoff (2, 4, 8 … s).
     400 bad-request errors: raised immediately as RuntimeError (unretryable).
-    The Retry-After response header always takes precedence.
 
     Policy violation errors (400 with "policy" in message) are attempted once
     more with simplified messaging; if still rejected, fail with clear error.
 
     Returns an ``openai.types.chat.ChatCompletion`` object.
     """
-    from openai import BadRequestError, RateLimitError, APIStatusError
+    from openai import APIStatusError, BadRequestError, RateLimitError
 
     client = _get_openai_client()
+    limiter = get_rate_limiter(model)
 
-    _supports_temperature = not (
-        model.startswith("o1") or model.startswith("o3") or model.startswith("o4")
-        or "nano" in model
-    )
+    _supports_temperature = not (model.startswith("o1") or model.startswith("o3") or model.startswith("o4") or "nano" in model)
     kwargs: Dict[str, Any] = {
         "model": model,
         "messages": messages,
@@ -403,15 +744,47 @@ async def _call_openai(
     if tools:
         kwargs["tools"] = tools
         kwargs["tool_choice"] = "auto"
+    if response_format:
+        kwargs["response_format"] = response_format
+
+    async def _create() -> Any:
+        estimated = estimate_request_tokens(kwargs["messages"], max_tokens)
+        await limiter.acquire(estimated)
+        if stream:
+            raw = await client.chat.completions.with_raw_response.create(
+                **kwargs, stream=True, stream_options={"include_usage": True}
+            )
+            limiter.update_from_headers(raw.headers)
+            stats = stream_stats if stream_stats is not None else {}
+            resp = await _consume_stream(raw.parse(), model=model, expect_json=expect_json, stats=stats)
+            if resp.usage is None:
+                # Aborted before the usage chunk — charge an estimate instead.
+                prompt_estimate = estimated - max_tokens
+                completion_estimate = len(resp.choices[0].message.content or "") // 4
+                accumulate(prompt_estimate, completion_estimate, model)
+                limiter.reconcile(estimated, prompt_estimate + completion_estimate)
+        else:
+            raw = await client.chat.completions.with_raw_response.create(**kwargs)
+            limiter.update_from_headers(raw.headers)
+            resp = raw.parse()
+        if resp.usage:
+            prompt_tokens = resp.usage.prompt_tokens or 0
+            completion_tokens = resp.usage.completion_tokens or 0
+            accumulate(prompt_tokens, completion_tokens, model)
+            limiter.reconcile(estimated, prompt_tokens + completion_tokens)
+        return resp
 
     for attempt in range(max_retries):
         try:
-            resp = await client.chat.completions.create(**kwargs)
-            if resp.usage:
-                accumulate(resp.usage.prompt_tokens or 0, resp.usage.completion_tokens or 0, model)
-            return resp
+            return await _create()
         except BadRequestError as exc:
             error_str = str(exc)
+            if "response_format" in kwargs and ("response_format" in error_str or "json_schema" in error_str):
+                # Model without structured-output support: fall back to parsing free-form JSON
+                logger.warning(f"OpenAI {model} rejected the response schema ({exc}); retrying without it")
+                record_metric("structured_output", "unsupported")
+                del kwargs["response_format"]
+                continue
             is_policy_violation = "policy" in error_str.lower() or "invalid_prompt" in error_str.lower()
 
             if is_policy_violation and attempt == 0:
@@ -423,51 +796,38 @@ async def _call_openai(
                 )
                 # Keep only system + first two user messages (system, original request, current request)
                 simplified_msgs = [
-                    m for i, m in enumerate(messages)
-                    if i < 2 or (i == len(messages) - 1 and m.get("role") == "user")
+                    m for i, m in enumerate(messages) if i < 2 or (i == len(messages) - 1 and m.get("role") == "user")
                 ]
                 if len(simplified_msgs) < len(messages):
                     # Reconstruct kwargs with simplified messages
                     kwargs["messages"] = simplified_msgs
                     try:
-                        resp = await client.chat.completions.create(**kwargs)
-                        if resp.usage:
-                            accumulate(resp.usage.prompt_tokens or 0, resp.usage.completion_tokens or 0, model)
+                        resp = await _create()
                         logger.warning("Simplified prompt accepted; continuing.")
                         return resp
                     except BadRequestError as retry_exc:
-                        logger.error(
-                            f"OpenAI policy violation persists even with simplified prompt for {model}: {retry_exc}"
-                        )
-                        raise RuntimeError(
-                            f"OpenAI policy violation (unrecoverable): {exc}"
-                        ) from retry_exc
+                        logger.error(f"OpenAI policy violation persists even with simplified prompt for {model}: {retry_exc}")
+                        raise RuntimeError(f"OpenAI policy violation (unrecoverable): {exc}") from retry_exc
                 # If couldn't simplify, fall through to normal error handling below
 
             # Non-policy 400 errors, or policy violation after attempted recovery
             logger.error(
-                f"OpenAI bad request (400) for model={model}: {exc}"
-                f"{' (policy violation)' if is_policy_violation else ''}"
+                f"OpenAI bad request (400) for model={model}: {exc}" f"{' (policy violation)' if is_policy_violation else ''}"
             )
             raise RuntimeError(f"OpenAI bad request: {exc}") from exc
         except RateLimitError as exc:
             if attempt >= max_retries - 1:
                 raise
-            retry_after = 0
-            if exc.response is not None:
-                retry_after = int(exc.response.headers.get("retry-after", 0))
-            backoff = min(600, 30 * (2 ** attempt))
-            wait = max(retry_after, backoff)
-            logger.warning(f"OpenAI 429, retrying in {wait}s (attempt {attempt + 1}/{max_retries})")
-            await asyncio.sleep(wait)
+            headers = exc.response.headers if exc.response is not None else None
+            pause = limiter.on_rate_limited(headers)
+            logger.warning(
+                f"OpenAI 429 for {model}, pausing all callers for {pause:.1f}s " f"(attempt {attempt + 1}/{max_retries})"
+            )
         except APIStatusError as exc:
             if attempt >= max_retries - 1 or exc.status_code < 500:
                 raise
             backoff = 2 ** (attempt + 1)
-            logger.warning(
-                f"OpenAI {exc.status_code}, retrying in {backoff}s "
-                f"(attempt {attempt + 1}/{max_retries})"
-            )
+            logger.warning(f"OpenAI {exc.status_code}, retrying in {backoff}s " f"(attempt {attempt + 1}/{max_retries})")
             await asyncio.sleep(backoff)
 
     raise RuntimeError("OpenAI: max retries exceeded")
@@ -514,6 +874,58 @@ def _normalize_candidate(candidate: Dict[str, Any], now_iso: str) -> None:
 # Generic agent loop used by each phase
 # ---------------------------------------------------------------------------
 
+# Read-only lookup tools that are safe to run concurrently within one turn.
+_NETWORK_TOOLS = frozenset({"web_search", "fetch_page", "ballotpedia_lookup"})
+
+
+async def _run_network_tool(fn: Any, log: Any, race_id: Optional[str]) -> str:
+    """Execute one web_search / fetch_page / ballotpedia_lookup call and return the tool message content."""
+    args = json.loads(fn.arguments)
+    if fn.name == "web_search":
+        query = args.get("query", "")
+        log("info", f"    🔍 {query}")
+        search_results = await _serper_search(query, race_id=race_id)
+        log("debug", f"    🔍 got {len(search_results)} results")
+        prefetcher = get_prefetcher()
+        if prefetcher is not None:
+            prefetcher.schedule(search_results)
+        return json.dumps(search_results)
+    if fn.name == "fetch_page":
+        url = args.get("url", "")
+        focus = str(args.get("focus") or "").strip()
+        log("info", f"    📄 fetching {url[:80]}" + (f" (focus: {focus[:40]})" if focus else ""))
+        prefetcher = get_prefetcher()
+        if prefetcher is not None:
+            prefetcher.claim(url)
+        page_text = _page_for_model(await _fetch_page(url, race_id=race_id), focus)
+        log("debug", f"    📄 got {len(page_text)} chars")
+        return page_text
+    candidate_name = args.get("candidate_name", "")
+    log("info", f"    📋 Ballotpedia lookup: {candidate_name}")
+    bp_data = await _ballotpedia_lookup(candidate_name)
+    log("debug", f"    📋 found={bp_data.get('found')}")
+    return json.dumps(bp_data)
+
+
+# Answers that fail to parse even after repair are saved here (when set), to
+# grow the regression corpus of tests/benchmarks/bench_json_repair.py.
+_JSON_FAILURES_DIR = os.getenv("AGENT_JSON_FAILURES_DIR", "")
+
+
+def _save_json_failure(content: str, phase_name: str) -> None:
+    """Keep an unparseable model answer in ``AGENT_JSON_FAILURES_DIR`` (best effort)."""
+    if not _JSON_FAILURES_DIR or not content:
+        return
+    try:
+        out_dir = Path(_JSON_FAILURES_DIR)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+        (out_dir / f"{re.sub(r'[^A-Za-z0-9_-]+', '-', phase_name) or 'phase'}-{digest}.txt").write_text(
+            content, encoding="utf-8"
+        )
+    except OSError as exc:
+        logger.debug(f"Could not save unparseable answer: {exc}")
+
 
 async def _agent_loop(
     system: str,
@@ -528,14 +940,40 @@ async def _agent_loop(
     extra_tools: List[Dict[str, Any]] | None = None,
     extra_tool_handlers: Dict[str, Any] | None = None,
     tools_mode: bool = False,
+    context_token_budget: Optional[int] = None,
+    stream: Optional[bool] = None,
+    response_format: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Run a single agent loop.
 
     In normal (json) mode: search → answer → parse JSON.
     In tools_mode: the LLM uses editing tools to mutate state directly;
     the loop exits when the LLM stops making tool calls.  Returns ``{}``.
+
+    Once the history exceeds *context_token_budget* (estimated prompt
+    tokens, default ``DEFAULT_CONTEXT_TOKEN_BUDGET``), old search/page tool
+    outputs are replaced with short digests before the next call.
+
+    *stream* (default: ``AGENT_STREAM_COMPLETIONS`` env) streams each
+    completion, logging time-to-first-token and tokens/sec, and abandons a
+    final JSON answer early once it is clearly not JSON.
+
+    *response_format* is the json-mode phase's answer schema (see
+    ``schemas``), sent unless ``AGENT_STRUCTURED_OUTPUTS`` is off.  The
+    "not valid JSON" re-prompt then only runs as a fallback;
+    ``agent_metrics["structured_output"]`` counts the parse retries avoided
+    (schema answers accepted without one) and the ones still needed.
+
+    Answers ``json.loads`` rejects go through the repair parser first
+    (``json_repair``); ``agent_metrics["json_repair"]`` counts the re-prompts
+    it saved and the repairs applied.
     """
     log = make_logger(on_log)
+    use_stream = _STREAM_DEFAULT if stream is None else stream
+    schema_format = response_format if response_format and not tools_mode and _STRUCTURED_OUTPUTS else None
+    # Only passed when set, so runs without a schema keep their cassette keys
+    format_kwargs: Dict[str, Any] = {"response_format": schema_format} if schema_format else {}
+    parse_retries = 0
 
     messages: List[Dict[str, Any]] = [
         {"role": "system", "content": system},
@@ -555,35 +993,54 @@ async def _agent_loop(
             tools_for_call = search_tools + _extra_tools if (search_tools or _extra_tools) else None
 
             if iteration == nudge_at and len(messages) > 2:
-                messages.append({
-                    "role": "user",
-                    "content": (
-                        "You have used several searches. Stop searching and use your "
-                        "editing tools to commit your findings now. When you are done "
-                        "editing, make no further tool calls — do not produce a text reply."
-                    ),
-                })
+                messages.append(
+                    {
+                        "role": "user",
+                        "content": (
+                            "You have used several searches. Stop searching and use your "
+                            "editing tools to commit your findings now. When you are done "
+                            "editing, make no further tool calls — do not produce a text reply."
+                        ),
+                    }
+                )
                 log("info", f"  [{phase_name}] nudging model to commit edits (iteration {iteration + 1})")
         else:
             # In json mode: all tools cut off at nudge_at
             if iteration == nudge_at and len(messages) > 2:
-                messages.append({
-                    "role": "user",
-                    "content": (
-                        "You have used several searches. Please now compile your findings "
-                        "and return ONLY the final JSON response. No more searches."
-                    ),
-                })
+                messages.append(
+                    {
+                        "role": "user",
+                        "content": (
+                            "You have used several searches. Please now compile your findings "
+                            "and return ONLY the final JSON response. No more searches."
+                        ),
+                    }
+                )
                 log("info", f"  [{phase_name}] nudging model to produce output (iteration {iteration + 1})")
 
             base_tools = [SEARCH_TOOL, FETCH_TOOL, BALLOTPEDIA_TOOL] if iteration < nudge_at else []
             # Extra tools (editing) stay available past nudge in json mode too
             tools_for_call = (base_tools + _extra_tools) if (base_tools or _extra_tools) else None
 
+        saved, n_compacted = compact_messages(messages, token_budget=context_token_budget or DEFAULT_CONTEXT_TOKEN_BUDGET)
+        if saved:
+            record_metric("context_compaction", "tokens_saved", saved)
+            record_metric("context_compaction", "messages_compacted", n_compacted)
+            log("info", f"  [{phase_name}] compacted {n_compacted} old tool outputs (~{saved:,} tokens saved)")
+
         t_call = time.perf_counter()
+        stream_stats: Dict[str, Any] = {}
         try:
             result = await _call_openai(
-                messages, model=model, tools=tools_for_call, max_tokens=max_tokens
+                messages,
+                model=model,
+                tools=tools_for_call,
+                max_tokens=max_tokens,
+                stream=use_stream,
+                # Only final-answer turns (no tools offered) can be judged "not JSON" early.
+                expect_json=not tools_mode and not tools_for_call,
+                stream_stats=stream_stats,
+                **format_kwargs,
             )
         except RuntimeError as e:
             # Detect and exit early for policy violations (don't retry the same flagged prompt)
@@ -602,8 +1059,15 @@ async def _agent_loop(
             "info",
             f"  [{phase_name}] response in {elapsed_call:.1f}s — "
             f"finish={finish_reason} "
-            f"tokens={getattr(usage, 'prompt_tokens', '?')}→{getattr(usage, 'completion_tokens', '?')}",
+            f"tokens={getattr(usage, 'prompt_tokens', '?')}→{getattr(usage, 'completion_tokens', '?')}"
+            + (f" ttft={stream_stats['ttft_s']:.1f}s {stream_stats['tokens_per_s']:.0f} tok/s" if stream_stats else ""),
         )
+        if stream_stats:
+            record_metric("streaming", "calls")
+            record_metric("streaming", "ttft_s_total", stream_stats["ttft_s"])
+            if stream_stats["aborted_not_json"]:
+                record_metric("streaming", "aborted_not_json")
+                log("warning", f"  [{phase_name}] streamed answer is not JSON — stopped early")
 
         # If the model wants to call tools, execute them
         if message.tool_calls and tools_for_call:
@@ -614,42 +1078,33 @@ async def _agent_loop(
                 "tool_calls": [tc.model_dump() for tc in message.tool_calls],
             }
             messages.append(msg_dict)
-            for tool_call in message.tool_calls:
+
+            # Consecutive network-bound lookups from one turn run concurrently;
+            # an editing handler waits for the calls issued before it and runs
+            # before any issued after it, so call order is kept around edits.
+            tool_outputs: List[Any] = [None] * len(message.tool_calls)
+            network_idx: List[int] = []
+
+            async def _flush_network() -> None:
+                if not network_idx:
+                    return
+                network_results = await asyncio.gather(
+                    *[_run_network_tool(message.tool_calls[idx].function, log, race_id) for idx in network_idx],
+                    return_exceptions=True,
+                )
+                for idx, res in zip(network_idx, network_results):
+                    if isinstance(res, BaseException):
+                        raise res
+                    tool_outputs[idx] = res
+                network_idx.clear()
+
+            for idx, tool_call in enumerate(message.tool_calls):
                 fn = tool_call.function
-                if fn.name == "web_search":
-                    args = json.loads(fn.arguments)
-                    query = args.get("query", "")
-                    log("info", f"    🔍 {query}")
-                    search_results = await _serper_search(query, race_id=race_id)
-                    log("debug", f"    🔍 got {len(search_results)} results")
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": json.dumps(search_results),
-                    })
-                elif fn.name == "fetch_page":
-                    args = json.loads(fn.arguments)
-                    url = args.get("url", "")
-                    log("info", f"    📄 fetching {url[:80]}")
-                    page_text = await _fetch_page(url)
-                    log("debug", f"    📄 got {len(page_text)} chars")
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": page_text,
-                    })
-                elif fn.name == "ballotpedia_lookup":
-                    args = json.loads(fn.arguments)
-                    candidate_name = args.get("candidate_name", "")
-                    log("info", f"    📋 Ballotpedia lookup: {candidate_name}")
-                    bp_data = await _ballotpedia_lookup(candidate_name)
-                    log("debug", f"    📋 found={bp_data.get('found')}")
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": json.dumps(bp_data),
-                    })
-                elif fn.name in _extra_handlers:
+                if fn.name in _NETWORK_TOOLS:
+                    network_idx.append(idx)
+                    continue
+                await _flush_network()
+                if fn.name in _extra_handlers:
                     args = json.loads(fn.arguments)
                     log("info", f"    🔧 {fn.name}({', '.join(f'{k}={v!r}' for k, v in args.items())})")
                     try:
@@ -658,18 +1113,21 @@ async def _agent_loop(
                     except Exception as exc:
                         handler_result = f"Error: {exc}"
                         log("warning", f"    🔧 {fn.name} → {exc}")
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": str(handler_result),
-                    })
+                    tool_outputs[idx] = str(handler_result)
                 else:
                     log("warning", f"    ⚠️ Unknown tool: {fn.name}")
-                    messages.append({
+                    tool_outputs[idx] = f"Error: unknown tool '{fn.name}'"
+            await _flush_network()
+
+            # Results go back in the order the calls were issued
+            for tool_call, content in zip(message.tool_calls, tool_outputs):
+                messages.append(
+                    {
                         "role": "tool",
                         "tool_call_id": tool_call.id,
-                        "content": f"Error: unknown tool '{fn.name}'",
-                    })
+                        "content": content,
+                    }
+                )
             continue
 
         # No tool calls — in tools_mode this means the LLM is done editing
@@ -684,43 +1142,62 @@ async def _agent_loop(
         if finish_reason == "length":
             log("warning", f"  [{phase_name}] response truncated (finish_reason=length) — retrying with brevity prompt")
             messages.append(message.model_dump())
-            messages.append({
-                "role": "user",
-                "content": (
-                    "Your previous response was cut off because it was too long. "
-                    "Please return a shorter JSON object. Use concise string values "
-                    "(under 200 characters each), omit optional or redundant fields, "
-                    "and return ONLY the JSON with no markdown fences or extra text."
-                ),
-            })
+            messages.append(
+                {
+                    "role": "user",
+                    "content": (
+                        "Your previous response was cut off because it was too long. "
+                        "Please return a shorter JSON object. Use concise string values "
+                        "(under 200 characters each), omit optional or redundant fields, "
+                        "and return ONLY the JSON with no markdown fences or extra text."
+                    ),
+                }
+            )
             continue
 
+        refusal = getattr(message, "refusal", None)
+        if schema_format and isinstance(refusal, str) and refusal:
+            log("warning", f"  [{phase_name}] model refused the structured answer: {refusal[:200]}")
+
         try:
-            parsed = _extract_json(content)
-            log("info", f"  [{phase_name}] JSON parsed OK")
+            parsed, repairs = await run_cpu(_extract_json_with_repairs, content, min_size=len(content))
+            if repairs:
+                level = "warning" if "truncated" in repairs else "info"
+                log(level, f"  [{phase_name}] JSON parsed OK after repairs: {', '.join(repairs)}")
+                record_metric("json_repair", "retries_avoided")
+                for repair in repairs:
+                    record_metric("json_repair", repair)
+            else:
+                log("info", f"  [{phase_name}] JSON parsed OK")
+            if schema_format and not parse_retries:
+                record_metric("structured_output", "parse_retries_avoided")
             return parsed
         except (json.JSONDecodeError, ValueError) as exc:
             log("warning", f"  [{phase_name}] bad JSON ({exc}) — retrying")
+            _save_json_failure(content, phase_name)
+            parse_retries += 1
+            if schema_format:
+                record_metric("structured_output", "parse_retries")
             messages.append(message.model_dump())
-            messages.append({
-                "role": "user",
-                "content": (
-                    f"Your response was not valid JSON. Parse error: {exc}. "
-                    "Common causes: using None/True/False instead of null/true/false, "
-                    "unescaped quotes or backslashes inside string values, or text "
-                    "appended after the closing brace. "
-                    "Return ONLY the raw JSON object — no markdown, no explanation, "
-                    "no trailing text whatsoever."
-                ),
-            })
+            messages.append(
+                {
+                    "role": "user",
+                    "content": (
+                        f"Your response was not valid JSON. Parse error: {exc}. "
+                        "Common causes: using None/True/False instead of null/true/false, "
+                        "unescaped quotes or backslashes inside string values, or text "
+                        "appended after the closing brace. "
+                        "Return ONLY the raw JSON object — no markdown, no explanation, "
+                        "no trailing text whatsoever."
+                    ),
+                }
+            )
             continue
 
     if tools_mode:
         log("warning", f"  [{phase_name}] tools-mode hit max iterations — returning")
         return {}
-    raise RuntimeError(
-        f"[{phase_name}] did not produce output within {max_iterations} iterations"
-    )
+    raise RuntimeError(f"[{phase_name}] did not produce output within {max_iterations} iterations")
 
 
 def _ensure_dict(result: Any, phase_name: str, log: Any) -> Dict[str, Any]:
@@ -800,9 +1277,7 @@ def _select_candidates_for_research(
     if max_candidates is None and not target_no_info:
         return candidate_names  # no filtering needed
 
-    cand_by_name: Dict[str, Dict[str, Any]] = {
-        c["name"]: c for c in race_json.get("candidates", []) if isinstance(c, dict)
-    }
+    cand_by_name: Dict[str, Dict[str, Any]] = {c["name"]: c for c in race_json.get("candidates", []) if isinstance(c, dict)}
     scored = [(name, _candidate_info_score(cand_by_name.get(name, {}))) for name in candidate_names]
     # target_no_info → ascending (least info first); default → descending
     scored.sort(key=lambda t: t[1], reverse=not target_no_info)
@@ -811,8 +1286,10 @@ def _select_candidates_for_research(
     if max_candidates is not None and max_candidates < len(selected):
         skipped = selected[max_candidates:]
         selected = selected[:max_candidates]
-        log("info", f"  Candidate limit: researching {len(selected)} of {len(candidate_names)} "
-            f"(skipped: {', '.join(skipped)})")
+        log(
+            "info",
+            f"  Candidate limit: researching {len(selected)} of {len(candidate_names)} " f"(skipped: {', '.join(skipped)})",
+        )
     return selected
 
 
@@ -848,8 +1325,7 @@ def _select_target_candidates(
         log("warning", f"  Candidate filter ignored unknown names: {', '.join(missing)}")
     if not selected:
         raise ValueError(
-            "No candidate names in candidate_names matched this race. "
-            f"Available: {', '.join(available_names)}"
+            "No candidate names in candidate_names matched this race. " f"Available: {', '.join(available_names)}"
         )
 
     log("info", f"  Candidate filter active: {', '.join(selected)}")
@@ -873,14 +1349,16 @@ def _candidate_source_hints(
 
     if isinstance(website, str) and website.startswith("http"):
         base = website.rstrip("/")
-        hints.extend([
-            f"{base}/issues",
-            f"{base}/issue",
-            f"{base}/policy",
-            f"{base}/policies",
-            f"{base}/priorities",
-            f"{base}/platform",
-        ])
+        hints.extend(
+            [
+                f"{base}/issues",
+                f"{base}/issue",
+                f"{base}/policy",
+                f"{base}/policies",
+                f"{base}/priorities",
+                f"{base}/platform",
+            ]
+        )
 
     for link in candidate.get("links", []):
         if not isinstance(link, dict):
@@ -919,6 +1397,13 @@ async def run_agent(
     max_candidates: Optional[int] = None,
     target_no_info: bool = False,
     candidate_names: Optional[List[str]] = None,
+    issue_concurrency: int = DEFAULT_ISSUE_CONCURRENCY,
+    parallel_issues: bool = False,
+    cassette_path: Optional[str] = None,
+    cassette_mode: Optional[str] = None,
+    checkpoint_store: Any = None,
+    resume: bool = False,
+    prefetch: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """Run the multi-phase research agent for a given race_id.
 
@@ -954,11 +1439,38 @@ async def run_agent(
         When *True*, prioritise candidates with the least existing info.
     candidate_names : list[str], optional
         Exact candidate names to update/research (case-insensitive exact match).
+    issue_concurrency : int
+        Max issue sub-agents running at once in the issues phase. Candidates
+        are researched concurrently up to this limit; ``1`` restores the
+        fully sequential behaviour.
+    parallel_issues : bool
+        When *True*, also run the issues of a single candidate concurrently
+        (sub-agents then see fewer handoffs from sibling issues).
+    cassette_path / cassette_mode : str, optional
+        Record every outbound call of this run to a cassette file
+        (``"record"``) or serve the run entirely from one (``"replay"``,
+        the default mode).  Default: ``AGENT_CASSETTE`` /
+        ``AGENT_CASSETTE_MODE``.  See ``pipeline_client.agent.cassette``.
+    checkpoint_store : StorageBackend, optional
+        Where to save a checkpoint after every phase and issue unit.
+        *None* (default) disables checkpointing.
+    resume : bool
+        Continue from the last checkpoint in *checkpoint_store*, skipping
+        completed phases and issue units.  Without a checkpoint the run
+        starts normally.  See ``pipeline_client.agent.checkpoint``.
+    prefetch : bool, optional
+        Start downloading the top results of every web search into the page
+        cache before the model asks for them.  Default: ``PAGE_PREFETCH``.
+        Never active while replaying a cassette.  See
+        ``pipeline_client.agent.prefetch``.
     """
     from .review import (
-        DEFAULT_CLAUDE_MODEL, CHEAP_CLAUDE_MODEL,
-        DEFAULT_GEMINI_MODEL, CHEAP_GEMINI_MODEL,
-        DEFAULT_GROK_MODEL, CHEAP_GROK_MODEL,
+        CHEAP_CLAUDE_MODEL,
+        CHEAP_GEMINI_MODEL,
+        CHEAP_GROK_MODEL,
+        DEFAULT_CLAUDE_MODEL,
+        DEFAULT_GEMINI_MODEL,
+        DEFAULT_GROK_MODEL,
     )
 
     model = research_model or (CHEAP_MODEL if cheap_mode else DEFAULT_MODEL)
@@ -981,172 +1493,250 @@ async def run_agent(
             except Exception:
                 pass
 
-    # Initialise a fresh cost accumulator for this run
-    _acc: Dict[str, Any] = {"prompt_tokens": 0, "completion_tokens": 0}
-    _ctx_token = _cost_ctx.set(_acc)
-
-    if existing_data is None:
-        existing_data = _load_existing(race_id)
-
-    if existing_data:
-        log("info", f"🔄 Update mode for {race_id} (model={model}, small_model={small_model})")
-        race_json = await _run_update(
-            race_id, existing_data, model=model, small_model=small_model,
-            on_log=on_log, max_iterations=max_iterations,
-            step_enabled=_step_enabled, track=_track,
-            max_candidates=max_candidates, target_no_info=target_no_info,
-            target_candidate_names=candidate_names,
+    checkpoint = RunCheckpointer.load(checkpoint_store, race_id) if resume else None
+    if checkpoint is not None:
+        log(
+            "info",
+            f"⏩ Resuming {race_id} from checkpoint ({checkpoint.mode} run, "
+            f"done: {', '.join(checkpoint.phases) or 'none'}; {len(checkpoint.units)} issue units)",
         )
+        # Start from the checkpointed profile; update runs treat it as the existing data.
+        existing_data = copy.deepcopy(checkpoint.race_json) if checkpoint.mode == "update" else {}
     else:
-        log("info", f"🆕 New research for {race_id} (model={model}, small_model={small_model})")
-        race_json = await _run_fresh(
-            race_id, model=model, small_model=small_model,
-            on_log=on_log, max_iterations=max_iterations,
-            step_enabled=_step_enabled, track=_track,
-            max_candidates=max_candidates, target_no_info=target_no_info,
-            target_candidate_names=candidate_names,
-        )
+        if resume:
+            log("info", f"No checkpoint found for {race_id} — starting from the beginning")
+        checkpoint = RunCheckpointer(checkpoint_store, race_id)
 
-    # LLMs sometimes wrap their output in {"race_json": {...}} — unwrap it so
-    # metadata we add below lands at the top level, not buried inside a key.
-    if "race_json" in race_json and isinstance(race_json.get("race_json"), dict):
-        log("warning", "LLM wrapped output in 'race_json' key — unwrapping")
-        race_json = race_json["race_json"]
-
-    race_json.setdefault("id", race_id)
-    now_iso = datetime.now(timezone.utc).isoformat()
-    race_json["updated_utc"] = now_iso
-
-    should_review = _step_enabled("review")
-    should_iterate = should_review and _step_enabled("iteration")
-
-    # Record the models actually used (deduplicated — nano == model in full mode)
-    generators = list(dict.fromkeys([model, small_model]))  # preserves order, drops duplicates
-    if should_review:
-        if os.getenv("ANTHROPIC_API_KEY"):
-            generators.append(claude_model or (CHEAP_CLAUDE_MODEL if cheap_mode else DEFAULT_CLAUDE_MODEL))
-        if os.getenv("GEMINI_API_KEY"):
-            generators.append(gemini_model or (CHEAP_GEMINI_MODEL if cheap_mode else DEFAULT_GEMINI_MODEL))
-        if os.getenv("XAI_API_KEY"):
-            generators.append(grok_model or (CHEAP_GROK_MODEL if cheap_mode else DEFAULT_GROK_MODEL))
-    race_json["generator"] = generators
+    # Initialise a fresh cost accumulator for this run (or carry over what the checkpointed attempt spent)
+    _acc: Dict[str, Any] = checkpoint.cost or {"prompt_tokens": 0, "completion_tokens": 0}
+    _ctx_token = _cost_ctx.set(_acc)
 
-    for candidate in race_json.get("candidates", []):
-        if isinstance(candidate, dict):
-            _normalize_candidate(candidate, now_iso)
+    cassette = open_cassette(cassette_path, cassette_mode)
+    _cassette_token = _cassette_ctx.set(cassette)
+    if cassette is not None:
+        log("info", f"📼 Cassette {cassette.mode}: {cassette.path}")
+        # The existing profile is a run input too — pin it so replays do not depend on local data.
+        if cassette.replaying and existing_data is None:
+            existing_data = cassette.inputs.get("existing_data")
+        elif not cassette.replaying:
+            if existing_data is None:
+                existing_data = _load_existing(race_id)
+            cassette.inputs["existing_data"] = existing_data or {}
+
+    if prefetch is None:
+        prefetch = env_flag("PAGE_PREFETCH")
+    # A replay only serves the fetches the recorded run made, so it never speculates.
+    prefetcher = Prefetcher.from_env(_prefetch_page) if prefetch and not (cassette and cassette.replaying) else None
+    _prefetch_token = _prefetch_ctx.set(prefetcher)
 
-    race_json.setdefault("polling", [])
+    try:
+        if existing_data is None:
+            existing_data = _load_existing(race_id)
 
-    if should_review:
-        _track("start", "review")
-        review_t0 = time.perf_counter()
-        log("info", "Phase 4: Sending to review agents (Claude, Gemini, Grok)...")
-        reviews = await run_reviews(
-            race_id, race_json,
-            on_log=on_log,
-            cheap_mode=cheap_mode,
-            claude_model=claude_model,
-            gemini_model=gemini_model,
-            grok_model=grok_model,
-        )
-        race_json["reviews"] = reviews
-        # Log review results to live logs
-        for rev in reviews:
-            model_name = rev.get("model", "unknown")
-            verdict = rev.get("verdict", "?")
-            score = rev.get("score", "?")
-            summary = rev.get("summary", "")
-            n_flags = len(rev.get("flags", []))
-            log("info", f"  {model_name}: {verdict} (score {score}/100, {n_flags} flags)")
-            if summary:
-                log("info", f"    → {summary}")
-        _track("complete", "review", duration_ms=int((time.perf_counter() - review_t0) * 1000))
-
-        # --- Phase 5: Iterate on review feedback (up to 2 cycles) ---
-        if should_iterate:
-            _track("start", "iteration")
-            iter_t0 = time.perf_counter()
-            max_review_cycles = 2
-            did_iterate = False
-            for cycle in range(1, max_review_cycles + 1):
-                # Cycle 2+: only iterate on error-severity flags to break subjective loops
-                min_severity = "error" if cycle > 1 else "warning"
-                if not _has_actionable_flags(reviews, min_severity=min_severity):
-                    if cycle == 1:
-                        log("info", "  No actionable review flags — skipping iteration")
-                    else:
-                        log("info", f"  Cycle {cycle}: no remaining {min_severity}+ flags — done")
-                    break
+        if existing_data:
+            log("info", f"🔄 Update mode for {race_id} (model={model}, small_model={small_model})")
+            race_json = await _run_update(
+                race_id,
+                existing_data,
+                model=model,
+                small_model=small_model,
+                on_log=on_log,
+                max_iterations=max_iterations,
+                step_enabled=_step_enabled,
+                track=_track,
+                max_candidates=max_candidates,
+                target_no_info=target_no_info,
+                target_candidate_names=candidate_names,
+                issue_concurrency=issue_concurrency,
+                parallel_issues=parallel_issues,
+                checkpoint=checkpoint,
+            )
+        else:
+            log("info", f"🆕 New research for {race_id} (model={model}, small_model={small_model})")
+            race_json = await _run_fresh(
+                race_id,
+                model=model,
+                small_model=small_model,
+                on_log=on_log,
+                max_iterations=max_iterations,
+                step_enabled=_step_enabled,
+                track=_track,
+                max_candidates=max_candidates,
+                target_no_info=target_no_info,
+                target_candidate_names=candidate_names,
+                issue_concurrency=issue_concurrency,
+                parallel_issues=parallel_issues,
+                checkpoint=checkpoint,
+            )
 
-                did_iterate = True
-                log("info", f"Phase 5 (cycle {cycle}/{max_review_cycles}): Iterating on review feedback...")
-                _track("progress", "iteration", pct=int(cycle / max_review_cycles * 80))
-                # Split iteration budget: 60% cycle 1, 40% cycle 2
-                cycle_budget = int(max_iterations * (0.6 if cycle == 1 else 0.4))
-                improved = await _run_iteration_pass(
-                    race_id, race_json, reviews,
-                    model=model, on_log=on_log, max_iterations=max(cycle_budget, 14),
+        # LLMs sometimes wrap their output in {"race_json": {...}} — unwrap it so
+        # metadata we add below lands at the top level, not buried inside a key.
+        if "race_json" in race_json and isinstance(race_json.get("race_json"), dict):
+            log("warning", "LLM wrapped output in 'race_json' key — unwrapping")
+            race_json = race_json["race_json"]
+
+        race_json.setdefault("id", race_id)
+        now_iso = datetime.now(timezone.utc).isoformat()
+        race_json["updated_utc"] = now_iso
+
+        should_review = _step_enabled("review")
+        should_iterate = should_review and _step_enabled("iteration")
+
+        # Record the models actually used (deduplicated — nano == model in full mode)
+        generators = list(dict.fromkeys([model, small_model]))  # preserves order, drops duplicates
+        if should_review:
+            if env_flag("ANTHROPIC_API_KEY"):
+                generators.append(claude_model or (CHEAP_CLAUDE_MODEL if cheap_mode else DEFAULT_CLAUDE_MODEL))
+            if env_flag("GEMINI_API_KEY"):
+                generators.append(gemini_model or (CHEAP_GEMINI_MODEL if cheap_mode else DEFAULT_GEMINI_MODEL))
+            if env_flag("XAI_API_KEY"):
+                generators.append(grok_model or (CHEAP_GROK_MODEL if cheap_mode else DEFAULT_GROK_MODEL))
+        race_json["generator"] = generators
+
+        for candidate in race_json.get("candidates", []):
+            if isinstance(candidate, dict):
+                _normalize_candidate(candidate, now_iso)
+
+        race_json.setdefault("polling", [])
+
+        if should_review:
+            _track("start", "review")
+            review_t0 = time.perf_counter()
+            if checkpoint.phase_done("review"):
+                log("info", "Phase 4: Reviews — restored from checkpoint")
+                reviews = race_json.get("reviews", [])
+            else:
+                log("info", "Phase 4: Sending to review agents (Claude, Gemini, Grok)...")
+                reviews = await run_reviews(
+                    race_id,
+                    race_json,
+                    on_log=on_log,
+                    cheap_mode=cheap_mode,
+                    claude_model=claude_model,
+                    gemini_model=gemini_model,
+                    grok_model=grok_model,
                 )
-                if improved is not None:
-                    race_json = improved
-                    # Re-normalize after iteration
-                    now_iso = datetime.now(timezone.utc).isoformat()
-                    race_json["updated_utc"] = now_iso
-                    for candidate in race_json.get("candidates", []):
-                        if isinstance(candidate, dict):
-                            _normalize_candidate(candidate, now_iso)
-                    race_json["generator"] = generators
-
-                    log("info", f"  Cycle {cycle}: Re-running reviews...")
-                    reviews = await run_reviews(
-                        race_id, race_json,
+                race_json["reviews"] = reviews
+                # Log review results to live logs
+                for rev in reviews:
+                    model_name = rev.get("model", "unknown")
+                    verdict = rev.get("verdict", "?")
+                    score = rev.get("score", "?")
+                    summary = rev.get("summary", "")
+                    n_flags = len(rev.get("flags", []))
+                    log("info", f"  {model_name}: {verdict} (score {score}/100, {n_flags} flags)")
+                    if summary:
+                        log("info", f"    → {summary}")
+                await checkpoint.mark_phase("review", race_json)
+            _track("complete", "review", duration_ms=int((time.perf_counter() - review_t0) * 1000))
+
+            # --- Phase 5: Iterate on review feedback (up to 2 cycles) ---
+            if should_iterate and checkpoint.phase_done("iteration"):
+                _track("start", "iteration")
+                log("info", "Phase 5: Iteration — restored from checkpoint")
+                _track("complete", "iteration", duration_ms=0)
+            elif should_iterate:
+                _track("start", "iteration")
+                iter_t0 = time.perf_counter()
+                max_review_cycles = 2
+                did_iterate = False
+                for cycle in range(1, max_review_cycles + 1):
+                    # Cycle 2+: only iterate on error-severity flags to break subjective loops
+                    min_severity = "error" if cycle > 1 else "warning"
+                    if not _has_actionable_flags(reviews, min_severity=min_severity):
+                        if cycle == 1:
+                            log("info", "  No actionable review flags — skipping iteration")
+                        else:
+                            log("info", f"  Cycle {cycle}: no remaining {min_severity}+ flags — done")
+                        break
+
+                    did_iterate = True
+                    log("info", f"Phase 5 (cycle {cycle}/{max_review_cycles}): Iterating on review feedback...")
+                    _track("progress", "iteration", pct=int(cycle / max_review_cycles * 80))
+                    # Split iteration budget: 60% cycle 1, 40% cycle 2
+                    cycle_budget = int(max_iterations * (0.6 if cycle == 1 else 0.4))
+                    improved = await _run_iteration_pass(
+                        race_id,
+                        race_json,
+                        reviews,
+                        model=model,
                         on_log=on_log,
-                        cheap_mode=cheap_mode,
-                        claude_model=claude_model,
-                        gemini_model=gemini_model,
-                        grok_model=grok_model,
+                        max_iterations=max(cycle_budget, 14),
                     )
-                    race_json["reviews"] = reviews
-                    for rev in reviews:
-                        model_name = rev.get("model", "unknown")
-                        verdict = rev.get("verdict", "?")
-                        score = rev.get("score", "?")
-                        summary = rev.get("summary", "")
-                        n_flags = len(rev.get("flags", []))
-                        log("info", f"  {model_name}: {verdict} (score {score}/100, {n_flags} flags)")
-                        if summary:
-                            log("info", f"    → {summary}")
+                    if improved is not None:
+                        race_json = improved
+                        # Re-normalize after iteration
+                        now_iso = datetime.now(timezone.utc).isoformat()
+                        race_json["updated_utc"] = now_iso
+                        for candidate in race_json.get("candidates", []):
+                            if isinstance(candidate, dict):
+                                _normalize_candidate(candidate, now_iso)
+                        race_json["generator"] = generators
+
+                        log("info", f"  Cycle {cycle}: Re-running reviews...")
+                        reviews = await run_reviews(
+                            race_id,
+                            race_json,
+                            on_log=on_log,
+                            cheap_mode=cheap_mode,
+                            claude_model=claude_model,
+                            gemini_model=gemini_model,
+                            grok_model=grok_model,
+                        )
+                        race_json["reviews"] = reviews
+                        for rev in reviews:
+                            model_name = rev.get("model", "unknown")
+                            verdict = rev.get("verdict", "?")
+                            score = rev.get("score", "?")
+                            summary = rev.get("summary", "")
+                            n_flags = len(rev.get("flags", []))
+                            log("info", f"  {model_name}: {verdict} (score {score}/100, {n_flags} flags)")
+                            if summary:
+                                log("info", f"    → {summary}")
+                    else:
+                        log("warning", f"  Cycle {cycle}: iteration failed — stopping")
+                        break
+                await checkpoint.mark_phase("iteration", race_json)
+                if not did_iterate:
+                    _track("skip", "iteration")
                 else:
-                    log("warning", f"  Cycle {cycle}: iteration failed — stopping")
-                    break
-            if not did_iterate:
-                _track("skip", "iteration")
+                    _track("complete", "iteration", duration_ms=int((time.perf_counter() - iter_t0) * 1000))
             else:
-                _track("complete", "iteration", duration_ms=int((time.perf_counter() - iter_t0) * 1000))
+                _track("skip", "iteration")
         else:
+            race_json.setdefault("reviews", [])
+            _track("skip", "review")
             _track("skip", "iteration")
-    else:
-        race_json.setdefault("reviews", [])
-        _track("skip", "review")
-        _track("skip", "iteration")
-
-    # Compute aggregate validation grade from review scores
-    grade = compute_validation_grade(race_json.get("reviews", []))
-    race_json["validation_grade"] = grade
 
-    elapsed = time.perf_counter() - t0
+        # Compute aggregate validation grade from review scores
+        grade = compute_validation_grade(race_json.get("reviews", []))
+        race_json["validation_grade"] = grade
+
+        elapsed = time.perf_counter() - t0
+    finally:
+        # Also on failure: outstanding prefetches must not keep downloading after the run ends.
+        if prefetcher is not None:
+            summary = await prefetcher.close()
+            log(
+                "info",
+                f"📥 Prefetch: {summary['hits']}/{summary['scheduled']} used, " f"{summary['wasted_bytes']} bytes unused",
+            )
+        _prefetch_ctx.reset(_prefetch_token)
+        # A failed run keeps its cassette too, so the failure can be replayed.
+        _cassette_ctx.reset(_cassette_token)
+        if cassette is not None:
+            cassette.save()
 
     # Compute and attach cost estimate (covers all LLMs: OpenAI + review providers)
     _cost_ctx.reset(_ctx_token)
+    if cassette is not None:
+        _acc.setdefault("metrics", {})["cassette"] = {"mode": cassette.mode, **cassette.stats}
     pt = _acc["prompt_tokens"]
     ct = _acc["completion_tokens"]
     total_tokens = pt + ct
     breakdown = _acc.get("model_breakdown", {})
     total_cost = (
-        sum(
-            estimate_cost(m, bd.get("prompt_tokens", 0), bd.get("completion_tokens", 0))
-            for m, bd in breakdown.items()
-        )
+        sum(estimate_cost(m, bd.get("prompt_tokens", 0), bd.get("completion_tokens", 0)) for m, bd in breakdown.items())
         if breakdown
         else estimate_cost(model, pt, ct)
     )
@@ -1158,6 +1748,7 @@ async def run_agent(
         "estimated_usd": round(total_cost, 4),
         "model_breakdown": breakdown,
         "duration_s": round(elapsed, 1),
+        **_acc.get("metrics", {}),
     }
     race_json["agent_metrics"] = agent_metrics
     log(
@@ -1217,6 +1808,71 @@ def _build_handoff_context(
     return "\n".join(parts) if parts else "No prior context available."
 
 
+# The search cache's state feeds the issue prompts but differs between a
+# recording and its replay, so these reads go on the cassette as well.
+
+
+@recorded("race_cache")
+async def _race_cache_view(race_id: str, cursor: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Searches and pages cached for *race_id* (after *cursor*, when given); None without a cache."""
+    cache = _get_search_cache()
+    if not cache:
+        return None
+    if cursor is None:
+        return await cache.alist_cached_for_race(race_id)
+    return await cache.achanges_since(race_id, cursor)
+
+
+@recorded("page_changes")
+async def _pages_changed_since(urls: List[str], since: str) -> Dict[str, bool]:
+    """``SearchCache.pages_changed_since``; empty without a cache or with an unparseable *since*."""
+    cache = _get_search_cache()
+    if not cache:
+        return {}
+    try:
+        return await cache.apages_changed_since(urls, since)
+    except (TypeError, ValueError):
+        return {}
+
+
+async def _source_change_note(sources: List[Any], since: str) -> str:
+    """Prompt line saying whether the cached pages behind *sources* changed since *since*.
+
+    Based on the page cache's content hashes; empty when nothing is known
+    (no cache, no cached source pages, or an unparseable *since*).
+    """
+    urls = [src.get("url") if isinstance(src, dict) else src for src in sources]
+    urls = [u for u in urls if isinstance(u, str) and u]
+    if not urls or not since:
+        return ""
+    changed = await _pages_changed_since(urls, since)
+    if not changed:
+        return ""
+    changed_urls = [u for u, did_change in changed.items() if did_change]
+    if changed_urls:
+        return f"\n  Source pages changed since last update: {', '.join(changed_urls)}"
+    return f"\n  Source pages unchanged since last update ({len(changed)} of {len(urls)} checked)"
+
+
+def _merge_cached_info(cached_info: Dict[str, Any] | None, delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold a ``changes_since`` delta into the cached-search summary.
+
+    Concurrent issue sub-agents may refresh from the same cursor, so entries
+    already present are skipped and an older delta is ignored.
+    """
+    if not cached_info:
+        return delta
+    if delta.get("cursor", 0) <= cached_info.get("cursor", 0):
+        return cached_info
+    known_queries = {s["query"] for s in cached_info["searches"]}
+    known_pages = set(cached_info["page_urls"])
+    return {
+        "searches": cached_info["searches"] + [s for s in delta["searches"] if s["query"] not in known_queries],
+        "page_urls": cached_info["page_urls"] + [u for u in delta["page_urls"] if u not in known_pages],
+        "cursor": delta["cursor"],
+    }
+
+
 async def _run_issue_research_for_candidate(
     candidate_name: str,
     race_json: Dict[str, Any],
@@ -1228,6 +1884,9 @@ async def _run_issue_research_for_candidate(
     is_update: bool = False,
     last_updated: str = "",
     on_issue_progress: Any | None = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    parallel_issues: bool = False,
+    checkpoint: Optional[RunCheckpointer] = None,
 ) -> None:
     """Run per-issue research for one candidate, mutating race_json in place.
 
@@ -1235,22 +1894,30 @@ async def _run_issue_research_for_candidate(
     call uses web_search + set_issue_stance. A structured handoff is passed
     between issues so the sub-agent knows what has already been written and
     which search queries are cached.
+
+    *semaphore* (optional) bounds how many sub-agent sessions run at once
+    across all candidates sharing it.  With *parallel_issues* the issues of
+    this candidate are also scheduled concurrently; each sub-agent then sees
+    the handoffs of whichever issues have finished so far.
+
+    With a *checkpoint*, issues already completed in an earlier attempt are
+    skipped and every finished issue is checkpointed.
     """
     log = make_logger(on_log)
     handlers = _make_editing_handlers(race_json, log)
-    cache = _get_search_cache()
-    cached_info = cache.list_cached_for_race(race_id) if cache else None
+    cached_info = await _race_cache_view(race_id)
     candidate_website, candidate_issue_urls = _candidate_source_hints(race_json, candidate_name)
     issue_hint_text = ", ".join(candidate_issue_urls) if candidate_issue_urls else "(none found)"
 
     handoffs: List[Dict[str, Any]] = []
 
-    for issue_idx, issue in enumerate(CANONICAL_ISSUES):
-        if on_issue_progress:
-            try:
-                on_issue_progress(issue_idx, issue)
-            except Exception:
-                pass
+    async def _research_issue(issue_idx: int, issue: str) -> None:
+        nonlocal cached_info
+
+        if checkpoint is not None and checkpoint.unit_done(candidate_name, issue):
+            log("info", f"    Issue {issue_idx + 1}/12: {issue} — restored from checkpoint")
+            _append_handoff(issue)
+            return
 
         handoff_ctx = _build_handoff_context(handoffs, cached_info)
 
@@ -1265,7 +1932,7 @@ async def _run_issue_research_for_candidate(
                             f"  Stance: {sd.get('stance', '?')}\n"
                             f"  Confidence: {sd.get('confidence', '?')}\n"
                             f"  Sources: {json.dumps(sd.get('sources', []))}"
-                        )
+                        ) + await _source_change_note(sd.get("sources", []), last_updated)
                     else:
                         existing_stance = "  MISSING — no existing stance"
                     break
@@ -1295,6 +1962,7 @@ async def _run_issue_research_for_candidate(
 
         log("info", f"    Issue {issue_idx + 1}/12: {issue}")
 
+        completed = False
         try:
             await _agent_loop(
                 sys_prompt,
@@ -1309,33 +1977,136 @@ async def _run_issue_research_for_candidate(
                 extra_tool_handlers=handlers,
                 tools_mode=True,
             )
+            completed = True
+        except (CassetteMiss, ReplayedError):
+            raise  # a replay that diverges from its recording must fail, not lose the issue
         except RuntimeError as exc:
             error_msg = str(exc)
             if "policy violation" in error_msg.lower():
                 log(
                     "error",
                     f"    Issue sub-agent skipped for {candidate_name}/{issue} "
-                    f"due to OpenAI policy violation (prompt flagged as inappropriate)"
+                    f"due to OpenAI policy violation (prompt flagged as inappropriate)",
                 )
             else:
                 log("warning", f"    Issue sub-agent failed for {candidate_name}/{issue}: {exc}")
         except Exception as exc:
             log("warning", f"    Issue sub-agent failed for {candidate_name}/{issue}: {exc}")
 
+        _append_handoff(issue)
+
+        # Pick up searches/pages cached since the last refresh (reads only the new index entries)
+        delta = await _race_cache_view(race_id, cached_info.get("cursor", 0) if cached_info else 0)
+        if delta is not None:
+            cached_info = _merge_cached_info(cached_info, delta)
+
+        # Failed issues are left unmarked so a resumed run retries them.
+        if completed and checkpoint is not None:
+            await checkpoint.mark_unit(candidate_name, issue, race_json)
+
+    def _append_handoff(issue: str) -> None:
         # Build handoff entry from what was just written
         for c in race_json.get("candidates", []):
             if c.get("name") == candidate_name:
                 sd = c.get("issues", {}).get(issue, {})
-                handoffs.append({
-                    "issue": issue,
-                    "stance": sd.get("stance", "(not set)") if isinstance(sd, dict) else "(not set)",
-                    "confidence": sd.get("confidence", "?") if isinstance(sd, dict) else "?",
-                })
+                handoffs.append(
+                    {
+                        "issue": issue,
+                        "stance": sd.get("stance", "(not set)") if isinstance(sd, dict) else "(not set)",
+                        "confidence": sd.get("confidence", "?") if isinstance(sd, dict) else "?",
+                    }
+                )
                 break
 
-        # Refresh cache info after each issue (new searches may have been cached)
-        if cache:
-            cached_info = cache.list_cached_for_race(race_id)
+    def _report(issue_idx: int, issue: str) -> None:
+        if on_issue_progress:
+            try:
+                on_issue_progress(issue_idx, issue)
+            except Exception:
+                pass
+
+    async def _run_one(issue_idx: int, issue: str) -> None:
+        # Report only once a slot is held, so queued issues don't count as started.
+        if semaphore is None:
+            _report(issue_idx, issue)
+            await _research_issue(issue_idx, issue)
+            return
+        async with semaphore:
+            _report(issue_idx, issue)
+            await _research_issue(issue_idx, issue)
+
+    if parallel_issues:
+        await asyncio.gather(*[_run_one(i, issue) for i, issue in enumerate(CANONICAL_ISSUES)])
+        return
+
+    for issue_idx, issue in enumerate(CANONICAL_ISSUES):
+        await _run_one(issue_idx, issue)
+
+
+async def _run_issue_phase(
+    research_names: List[str],
+    race_json: Dict[str, Any],
+    *,
+    race_id: str,
+    model: str,
+    on_log: Any | None = None,
+    max_iterations: int = 12,
+    is_update: bool = False,
+    last_updated: str = "",
+    track: Any = None,
+    issue_concurrency: int = DEFAULT_ISSUE_CONCURRENCY,
+    parallel_issues: bool = False,
+    checkpoint: Optional[RunCheckpointer] = None,
+) -> None:
+    """Research issues for every candidate in *research_names* concurrently.
+
+    At most *issue_concurrency* issue sub-agents run at the same time across
+    all candidates.  Editing handlers are synchronous and only ever run on the
+    event loop thread, so concurrent sub-agents cannot interleave partial
+    writes to the shared *race_json*.
+    """
+    log = make_logger(on_log)
+    if track is None:
+        track = lambda a, s, **kw: None
+
+    rn = len(research_names)
+    n_issues = len(CANONICAL_ISSUES)
+    total_units = max(rn * n_issues, 1)
+    semaphore = asyncio.Semaphore(max(1, issue_concurrency))
+    started = 0
+
+    def _make_issue_tracker(ci: int, cand_name: str):
+        def _on_issue(issue_idx: int, issue: str) -> None:
+            nonlocal started
+            combined_pct = int(started / total_units * 100)
+            started += 1
+            track(
+                "progress",
+                "issues",
+                pct=combined_pct,
+                message=f"Issues · {cand_name} ({ci + 1}/{rn}) · {issue} ({issue_idx + 1}/{n_issues})",
+            )
+
+        return _on_issue
+
+    async def _research_candidate(ci: int, cand_name: str) -> None:
+        log("info", f"  {'Updating issues for' if is_update else 'Researching'} {cand_name}...")
+        await _run_issue_research_for_candidate(
+            cand_name,
+            race_json,
+            race_id=race_id,
+            model=model,
+            on_log=on_log,
+            max_iterations=max_iterations,
+            is_update=is_update,
+            last_updated=last_updated,
+            on_issue_progress=_make_issue_tracker(ci, cand_name),
+            semaphore=semaphore,
+            parallel_issues=parallel_issues,
+            checkpoint=checkpoint,
+        )
+
+    await asyncio.gather(*[_research_candidate(ci, name) for ci, name in enumerate(research_names)])
 
 
 # ---------------------------------------------------------------------------
@@ -1343,6 +2114,53 @@ async def _run_issue_research_for_candidate(
 # ---------------------------------------------------------------------------
 
 
+def _research_phases(
+    *,
+    images: Any,
+    issues: Any,
+    finance: Any,
+    refinement: Any,
+    skip_messages: Dict[str, str],
+    race_json: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[RunCheckpointer] = None,
+    log: Any = None,
+) -> List[Phase]:
+    """Post-discovery phases with their race_json inputs/outputs (shared by fresh and update runs).
+
+    With a *checkpoint*, phases completed in an earlier attempt return
+    immediately and every finished phase checkpoints *race_json*.
+    """
+    if checkpoint is not None:
+        images, issues, finance, refinement = (
+            _checkpointed_phase(name, run, race_json, checkpoint, log)
+            for name, run in (("images", images), ("issues", issues), ("finance", finance), ("refinement", refinement))
+        )
+    return [
+        Phase("images", images, inputs=("roster",), outputs=("candidate_images",), skip_message=skip_messages["images"]),
+        Phase("issues", issues, inputs=("roster",), outputs=("issue_stances",), skip_message=skip_messages["issues"]),
+        Phase("finance", finance, inputs=("roster",), outputs=("finance_records",), skip_message=skip_messages["finance"]),
+        Phase(
+            "refinement",
+            refinement,
+            inputs=("roster", "candidate_images", "issue_stances", "finance_records"),
+            outputs=("refined_profile",),
+            skip_message=skip_messages["refinement"],
+        ),
+    ]
+
+
+def _checkpointed_phase(name: str, run: Any, race_json: Dict[str, Any], checkpoint: RunCheckpointer, log: Any) -> Any:
+    async def _run() -> None:
+        if checkpoint.phase_done(name):
+            if log:
+                log("info", f"  {name}: restored from checkpoint")
+            return
+        await run()
+        await checkpoint.mark_phase(name, race_json)
+
+    return _run
+
+
 async def _run_fresh(
     race_id: str,
     *,
@@ -1355,9 +2173,15 @@ async def _run_fresh(
     max_candidates: Optional[int] = None,
     target_no_info: bool = False,
     target_candidate_names: Optional[List[str]] = None,
+    issue_concurrency: int = DEFAULT_ISSUE_CONCURRENCY,
+    parallel_issues: bool = False,
+    checkpoint: Optional[RunCheckpointer] = None,
 ) -> Dict[str, Any]:
     """Phase 1 → 2 → 3: Discovery → Issue research → Refinement.
 
+    After discovery, images / issues / finance run concurrently through
+    ``run_phase_graph``; refinement starts once all three are done.
+
     *model* is used for complex phases (discovery, finance, refinement).
     *small_model* is used for focused sub-tasks (image resolution, per-issue sub-agents).
     """
@@ -1366,21 +2190,34 @@ async def _run_fresh(
         step_enabled = lambda s: True
     if track is None:
         track = lambda a, s, **kw: None
+    if checkpoint is not None:
+        checkpoint.mode = "fresh"
 
     # --- Phase 1: Discovery ---
     track("start", "discovery")
     disc_t0 = time.perf_counter()
-    log("info", "Phase 1/3: Discovering race and candidates...")
-    race_json = _ensure_dict(await _agent_loop(
-        DISCOVERY_SYSTEM,
-        DISCOVERY_USER.format(race_id=race_id),
-        model=model,
-        on_log=on_log,
-        race_id=race_id,
-        max_iterations=max_iterations,
-        phase_name="discovery",
-        max_tokens=16384,
-    ), "discovery", log)
+    if checkpoint is not None and checkpoint.phase_done("discovery"):
+        log("info", "Phase 1/3: Discovery — restored from checkpoint")
+        race_json = copy.deepcopy(checkpoint.race_json)
+    else:
+        log("info", "Phase 1/3: Discovering race and candidates...")
+        race_json = _ensure_dict(
+            await _agent_loop(
+                DISCOVERY_SYSTEM,
+                DISCOVERY_USER.format(race_id=race_id),
+                model=model,
+                on_log=on_log,
+                race_id=race_id,
+                max_iterations=max_iterations,
+                phase_name="discovery",
+                max_tokens=16384,
+                response_format=DISCOVERY_FORMAT,
+            ),
+            "discovery",
+            log,
+        )
+        if checkpoint is not None:
+            await checkpoint.mark_phase("discovery", race_json)
 
     candidate_names = [c["name"] for c in race_json.get("candidates", [])]
     candidate_names = _select_target_candidates(candidate_names, target_candidate_names, log)
@@ -1395,10 +2232,10 @@ async def _run_fresh(
     log("info", f"  Iteration budgets — refine:{refine_iters}  (n={n} candidates)")
     track("complete", "discovery", duration_ms=int((time.perf_counter() - disc_t0) * 1000))
 
-    # --- Phase 1b: Image URL verification & resolution (parallel) ---
-    if step_enabled("images"):
-        track("start", "images")
-        img_t0 = time.perf_counter()
+    # --- Phases 1b / 2 / 2b / 3 run as a dependency graph: images, issues and
+    # finance only need the roster, refinement needs all three. ---
+
+    async def _images_phase() -> None:
         log("info", "Phase 1b/3: Verifying and resolving candidate image URLs...")
 
         def _on_image_progress(pct: int, cand_name: str) -> None:
@@ -1417,52 +2254,39 @@ async def _run_fresh(
             max_iterations=min(max_iterations, 10),
             on_progress=_on_image_progress,
         )
-        track("complete", "images", duration_ms=int((time.perf_counter() - img_t0) * 1000))
-    else:
-        log("info", "Phase 1b/3: Image resolution — SKIPPED")
-        track("skip", "images")
 
     # --- Phase 2: Per-candidate, per-issue research (tools mode) ---
-    if step_enabled("issues"):
-        track("start", "issues")
-        iss_t0 = time.perf_counter()
+    async def _issues_phase() -> None:
         research_names = _select_candidates_for_research(
-            candidate_names, race_json,
-            max_candidates=max_candidates, target_no_info=target_no_info, log=log,
+            candidate_names,
+            race_json,
+            max_candidates=max_candidates,
+            target_no_info=target_no_info,
+            log=log,
         )
         rn = len(research_names)
         n_issues = len(CANONICAL_ISSUES)
-        total_units = max(rn * n_issues, 1)
-        log("info", f"Phase 2/3: Researching issues for {rn} candidates ({n_issues} issues each)...")
-        for ci, cand_name in enumerate(research_names):
-            log("info", f"  Researching {cand_name}...")
-
-            def _make_issue_tracker(ci=ci, cand_name=cand_name):
-                def _on_issue(issue_idx: int, issue: str) -> None:
-                    combined_pct = int((ci * n_issues + issue_idx) / total_units * 100)
-                    track("progress", "issues", pct=combined_pct,
-                          message=f"Issues · {cand_name} ({ci + 1}/{rn}) · {issue} ({issue_idx + 1}/{n_issues})")
-                return _on_issue
-
-            await _run_issue_research_for_candidate(
-                cand_name,
-                race_json,
-                race_id=race_id,
-                model=small_model,
-                on_log=on_log,
-                max_iterations=max_iterations,
-                is_update=False,
-                on_issue_progress=_make_issue_tracker(),
-            )
-        track("complete", "issues", duration_ms=int((time.perf_counter() - iss_t0) * 1000))
-    else:
-        log("info", "Phase 2/3: Issue research — SKIPPED")
-        track("skip", "issues")
+        log(
+            "info",
+            f"Phase 2/3: Researching issues for {rn} candidates ({n_issues} issues each, "
+            f"concurrency={issue_concurrency})...",
+        )
+        await _run_issue_phase(
+            research_names,
+            race_json,
+            race_id=race_id,
+            model=small_model,
+            on_log=on_log,
+            max_iterations=max_iterations,
+            is_update=False,
+            track=track,
+            issue_concurrency=issue_concurrency,
+            parallel_issues=parallel_issues,
+            checkpoint=checkpoint,
+        )
 
     # --- Phase 2b: Dedicated finance & voting record research ---
-    if step_enabled("finance"):
-        track("start", "finance")
-        fin_t0 = time.perf_counter()
+    async def _finance_phase() -> None:
         finance_iters = _scale_iterations(max_iterations, n, per_candidate=4, minimum=15)
         log("info", f"Phase 2b: Researching donors & voting records for {n} candidates...")
         try:
@@ -1478,6 +2302,7 @@ async def _run_fresh(
                 max_iterations=finance_iters,
                 phase_name="finance-voting",
                 max_tokens=16384,
+                response_format=FINANCE_VOTING_FORMAT,
             )
             if isinstance(finance_result, dict):
                 _apply_finance_patch(race_json, finance_result, log)
@@ -1485,15 +2310,9 @@ async def _run_fresh(
                 log("warning", "  Finance/voting phase returned non-dict — skipping")
         except Exception as exc:
             log("warning", f"  Finance/voting phase failed: {exc} — continuing without")
-        track("complete", "finance", duration_ms=int((time.perf_counter() - fin_t0) * 1000))
-    else:
-        log("info", "Phase 2b: Finance & voting — SKIPPED")
-        track("skip", "finance")
 
     # --- Phase 3: Refinement (tools mode — per-candidate + meta) ---
-    if step_enabled("refinement"):
-        track("start", "refinement")
-        ref_t0 = time.perf_counter()
+    async def _refinement_phase() -> None:
         log("info", "Phase 3/3: Refining profile (one candidate at a time, tools mode)...")
         handlers = _make_editing_handlers(race_json, log)
         candidate_names_in_json = [c["name"] for c in race_json.get("candidates", []) if c.get("name") in selected_name_set]
@@ -1504,7 +2323,12 @@ async def _run_fresh(
             candidate_website, candidate_issue_urls = _candidate_source_hints(race_json, cname)
             issue_hint_text = ", ".join(candidate_issue_urls) if candidate_issue_urls else "(none found)"
             log("info", f"  Refining {cname}...")
-            track("progress", "refinement", pct=int((ci / max(n_cands, 1)) * 100), message=f"Refinement: {cname} ({ci + 1}/{n_cands})")
+            track(
+                "progress",
+                "refinement",
+                pct=int((ci / max(n_cands, 1)) * 100),
+                message=f"Refinement: {cname} ({ci + 1}/{n_cands})",
+            )
             try:
                 await _agent_loop(
                     REFINE_SYSTEM,
@@ -1553,10 +2377,27 @@ async def _run_fresh(
             )
         except Exception as exc:
             log("warning", f"  Refine meta failed: {exc} — keeping existing meta")
-        track("complete", "refinement", duration_ms=int((time.perf_counter() - ref_t0) * 1000))
-    else:
-        log("info", "Phase 3/3: Refinement — SKIPPED")
-        track("skip", "refinement")
+
+    await run_phase_graph(
+        _research_phases(
+            images=_images_phase,
+            issues=_issues_phase,
+            finance=_finance_phase,
+            refinement=_refinement_phase,
+            race_json=race_json,
+            checkpoint=checkpoint,
+            log=log,
+            skip_messages={
+                "images": "Phase 1b/3: Image resolution — SKIPPED",
+                "issues": "Phase 2/3: Issue research — SKIPPED",
+                "finance": "Phase 2b: Finance & voting — SKIPPED",
+                "refinement": "Phase 3/3: Refinement — SKIPPED",
+            },
+        ),
+        step_enabled=step_enabled,
+        track=track,
+        log=log,
+    )
 
     return race_json
 
@@ -1579,6 +2420,9 @@ async def _run_update(
     max_candidates: Optional[int] = None,
     target_no_info: bool = False,
     target_candidate_names: Optional[List[str]] = None,
+    issue_concurrency: int = DEFAULT_ISSUE_CONCURRENCY,
+    parallel_issues: bool = False,
+    checkpoint: Optional[RunCheckpointer] = None,
 ) -> Dict[str, Any]:
     """Phase-based update mirroring _run_fresh but starting from existing data.
 
@@ -1590,9 +2434,10 @@ async def _run_update(
         step_enabled = lambda s: True
     if track is None:
         track = lambda a, s, **kw: None
+    if checkpoint is not None:
+        checkpoint.mode = "update"
 
     # Start from a deep copy of existing so we never mutate the original
-    import copy
     race_json: Dict[str, Any] = copy.deepcopy(existing)
 
     existing_candidates = existing.get("candidates", [])
@@ -1615,13 +2460,21 @@ async def _run_update(
             max_candidates=max_candidates,
             target_no_info=target_no_info,
             target_candidate_names=target_candidate_names,
+            issue_concurrency=issue_concurrency,
+            parallel_issues=parallel_issues,
+            checkpoint=checkpoint,
         )
 
     refine_iters = _scale_iterations(max_iterations, n, per_candidate=2, minimum=12)
     handlers = _make_editing_handlers(race_json, log)
 
     # --- Phase 0+1: Discovery (roster sync + meta update) ---
-    if step_enabled("discovery"):
+    if checkpoint is not None and checkpoint.phase_done("discovery"):
+        # Resumed: *existing* is the checkpointed profile, roster already synced.
+        track("start", "discovery")
+        log("info", "Update Phase 0+1: Discovery — restored from checkpoint")
+        track("complete", "discovery", duration_ms=0)
+    elif step_enabled("discovery"):
         track("start", "discovery")
         disc_t0 = time.perf_counter()
 
@@ -1667,6 +2520,9 @@ async def _run_update(
                 max_candidates=max_candidates,
                 target_no_info=target_no_info,
                 target_candidate_names=target_candidate_names,
+                issue_concurrency=issue_concurrency,
+                parallel_issues=parallel_issues,
+                checkpoint=checkpoint,
             )
 
         track("progress", "discovery", pct=50, message="Discovery: updating race metadata")
@@ -1695,6 +2551,8 @@ async def _run_update(
         except Exception as exc:
             log("warning", f"  Update meta phase failed: {exc} — keeping existing meta")
 
+        if checkpoint is not None:
+            await checkpoint.mark_phase("discovery", race_json)
         track("complete", "discovery", duration_ms=int((time.perf_counter() - disc_t0) * 1000))
     else:
         log("info", "Update Phase 0+1: Discovery — SKIPPED")
@@ -1705,10 +2563,9 @@ async def _run_update(
         selected_name_set = set(candidate_names)
         n = len(candidate_names)
 
-    # --- Phase 1b: Image URL verification & resolution (same position as fresh run) ---
-    if step_enabled("images"):
-        track("start", "images")
-        img_t0 = time.perf_counter()
+    # --- Phases 1b / 2 / 2b / 3 as a dependency graph (same shape as a fresh run) ---
+
+    async def _images_phase() -> None:
         log("info", "Update Phase 1b: Verifying and resolving candidate image URLs...")
 
         def _on_image_progress(pct: int, cand_name: str) -> None:
@@ -1727,53 +2584,40 @@ async def _run_update(
             max_iterations=min(max_iterations, 10),
             on_progress=_on_image_progress,
         )
-        track("complete", "images", duration_ms=int((time.perf_counter() - img_t0) * 1000))
-    else:
-        log("info", "Update Phase 1b: Image resolution — SKIPPED")
-        track("skip", "images")
 
     # --- Phase 2: Per-candidate, per-issue research (tools mode) ---
-    if step_enabled("issues"):
-        track("start", "issues")
-        iss_t0 = time.perf_counter()
+    async def _issues_phase() -> None:
         research_names = _select_candidates_for_research(
-            candidate_names, race_json,
-            max_candidates=max_candidates, target_no_info=target_no_info, log=log,
+            candidate_names,
+            race_json,
+            max_candidates=max_candidates,
+            target_no_info=target_no_info,
+            log=log,
         )
         rn = len(research_names)
         n_issues = len(CANONICAL_ISSUES)
-        total_units = max(rn * n_issues, 1)
-        log("info", f"Update Phase 2: Refreshing issue positions for {rn} candidates ({n_issues} issues each)...")
-        for ci, cand_name in enumerate(research_names):
-            log("info", f"  Updating issues for {cand_name}...")
-
-            def _make_issue_tracker(ci=ci, cand_name=cand_name):
-                def _on_issue(issue_idx: int, issue: str) -> None:
-                    combined_pct = int((ci * n_issues + issue_idx) / total_units * 100)
-                    track("progress", "issues", pct=combined_pct,
-                          message=f"Issues · {cand_name} ({ci + 1}/{rn}) · {issue} ({issue_idx + 1}/{n_issues})")
-                return _on_issue
-
-            await _run_issue_research_for_candidate(
-                cand_name,
-                race_json,
-                race_id=race_id,
-                model=small_model,
-                on_log=on_log,
-                max_iterations=max_iterations,
-                is_update=True,
-                last_updated=last_updated,
-                on_issue_progress=_make_issue_tracker(),
-            )
-        track("complete", "issues", duration_ms=int((time.perf_counter() - iss_t0) * 1000))
-    else:
-        log("info", "Update Phase 2: Issue research — SKIPPED")
-        track("skip", "issues")
+        log(
+            "info",
+            f"Update Phase 2: Refreshing issue positions for {rn} candidates ({n_issues} issues each, "
+            f"concurrency={issue_concurrency})...",
+        )
+        await _run_issue_phase(
+            research_names,
+            race_json,
+            race_id=race_id,
+            model=small_model,
+            on_log=on_log,
+            max_iterations=max_iterations,
+            is_update=True,
+            last_updated=last_updated,
+            track=track,
+            issue_concurrency=issue_concurrency,
+            parallel_issues=parallel_issues,
+            checkpoint=checkpoint,
+        )
 
     # --- Phase 2b: Dedicated finance & voting record refresh ---
-    if step_enabled("finance"):
-        track("start", "finance")
-        fin_t0 = time.perf_counter()
+    async def _finance_phase() -> None:
         finance_iters = _scale_iterations(max_iterations, n, per_candidate=4, minimum=15)
         log("info", f"Update Phase 2b: Refreshing donors & voting records for {n} candidates...")
         try:
@@ -1789,6 +2633,7 @@ async def _run_update(
                 max_iterations=finance_iters,
                 phase_name="update-finance-voting",
                 max_tokens=16384,
+                response_format=FINANCE_VOTING_FORMAT,
             )
             if isinstance(finance_result, dict):
                 _apply_finance_patch(race_json, finance_result, log)
@@ -1796,15 +2641,9 @@ async def _run_update(
                 log("warning", "  Finance/voting phase returned non-dict — skipping")
         except Exception as exc:
             log("warning", f"  Finance/voting phase failed: {exc} — continuing without")
-        track("complete", "finance", duration_ms=int((time.perf_counter() - fin_t0) * 1000))
-    else:
-        log("info", "Update Phase 2b: Finance & voting — SKIPPED")
-        track("skip", "finance")
 
     # --- Phase 3: Refinement (tools mode — per-candidate + meta) ---
-    if step_enabled("refinement"):
-        track("start", "refinement")
-        ref_t0 = time.perf_counter()
+    async def _refinement_phase() -> None:
         log("info", "Update Phase 3: Refining updated profile (one candidate at a time, tools mode)...")
         cand_list = [c for c in race_json.get("candidates", []) if c.get("name") in selected_name_set]
         n_cands = len(cand_list)
@@ -1813,7 +2652,12 @@ async def _run_update(
             candidate_website, candidate_issue_urls = _candidate_source_hints(race_json, cname)
             issue_hint_text = ", ".join(candidate_issue_urls) if candidate_issue_urls else "(none found)"
             log("info", f"  Refining {cname}...")
-            track("progress", "refinement", pct=int((ci / max(n_cands, 1)) * 100), message=f"Refinement: {cname} ({ci + 1}/{n_cands})")
+            track(
+                "progress",
+                "refinement",
+                pct=int((ci / max(n_cands, 1)) * 100),
+                message=f"Refinement: {cname} ({ci + 1}/{n_cands})",
+            )
             try:
                 await _agent_loop(
                     REFINE_SYSTEM,
@@ -1862,10 +2706,27 @@ async def _run_update(
             )
         except Exception as exc:
             log("warning", f"  Refine meta failed: {exc} — keeping existing meta")
-        track("complete", "refinement", duration_ms=int((time.perf_counter() - ref_t0) * 1000))
-    else:
-        log("info", "Update Phase 3: Refinement — SKIPPED")
-        track("skip", "refinement")
+
+    await run_phase_graph(
+        _research_phases(
+            images=_images_phase,
+            issues=_issues_phase,
+            finance=_finance_phase,
+            refinement=_refinement_phase,
+            race_json=race_json,
+            checkpoint=checkpoint,
+            log=log,
+            skip_messages={
+                "images": "Update Phase 1b: Image resolution — SKIPPED",
+                "issues": "Update Phase 2: Issue research — SKIPPED",
+                "finance": "Update Phase 2b: Finance & voting — SKIPPED",
+                "refinement": "Update Phase 3: Refinement — SKIPPED",
+            },
+        ),
+        step_enabled=step_enabled,
+        track=track,
+        log=log,
+    )
 
     return race_json
 
@@ -1933,8 +2794,17 @@ def _apply_candidate_patch(candidate: Dict[str, Any], patch: Dict[str, Any], log
     summary_sources replaces the existing array when non-empty.
     """
     cname = candidate.get("name", "?")
-    for key in ("summary", "image_url", "website", "incumbent", "party",
-                "donor_summary", "donor_source_url", "voting_summary", "voting_source_url"):
+    for key in (
+        "summary",
+        "image_url",
+        "website",
+        "incumbent",
+        "party",
+        "donor_summary",
+        "donor_source_url",
+        "voting_summary",
+        "voting_source_url",
+    ):
         if key in patch:
             candidate[key] = patch[key]
     for key in ("summary_sources", "career_history", "education"):
@@ -1956,9 +2826,13 @@ def _apply_candidate_patch(candidate: Dict[str, Any], patch: Dict[str, Any], log
     log("debug", f"  Candidate patch applied for {cname}")
 
 
-def _apply_refine_patch(race_json: Dict[str, Any], meta_patch: Dict[str, Any],
-                        candidate_patches: List[Dict[str, Any]], log: Any,
-                        iteration_notes: List[str]) -> None:
+def _apply_refine_patch(
+    race_json: Dict[str, Any],
+    meta_patch: Dict[str, Any],
+    candidate_patches: List[Dict[str, Any]],
+    log: Any,
+    iteration_notes: List[str],
+) -> None:
     """Apply refine meta + per-candidate patches to race_json in-place."""
     if meta_patch.get("description"):
         race_json["description"] = meta_patch["description"]
@@ -1975,7 +2849,13 @@ def _apply_refine_patch(race_json: Dict[str, Any], meta_patch: Dict[str, Any],
 
 
 def _apply_finance_patch(race_json: Dict[str, Any], patch: Dict[str, Any], log: Any) -> None:
-    """Merge finance/voting research results into race_json candidates in-place."""
+    """Merge finance/voting research results into race_json candidates in-place.
+
+    *patch* is either keyed by candidate name or, as the structured answer is,
+    ``{"candidates": [{"name": ..., ...}]}``.
+    """
+    if isinstance(patch.get("candidates"), list):
+        patch = {e["name"]: e for e in patch["candidates"] if isinstance(e, dict) and e.get("name")}
     candidates_by_name = {c["name"]: c for c in race_json.get("candidates", [])}
     updated = 0
     for cand_name, data in patch.items():
@@ -2079,6 +2959,7 @@ async def _run_iteration_pass(
     every call fails.
     """
     import copy
+
     log = make_logger(on_log)
 
     flags_text = _format_review_flags(reviews)
@@ -2091,7 +2972,9 @@ async def _run_iteration_pass(
 
     working = copy.deepcopy(race_json)
     handlers = _make_editing_handlers(working, log)
-    all_tools = ROSTER_TOOLS + CANDIDATE_TOOLS + ISSUE_TOOLS + RECORD_TOOLS + BACKGROUND_TOOLS + RACE_TOOLS + [READ_PROFILE_TOOL]
+    all_tools = (
+        ROSTER_TOOLS + CANDIDATE_TOOLS + ISSUE_TOOLS + RECORD_TOOLS + BACKGROUND_TOOLS + RACE_TOOLS + [READ_PROFILE_TOOL]
+    )
     any_success = False
 
     # Per-candidate iteration
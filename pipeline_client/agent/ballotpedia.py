@@ -13,14 +13,12 @@ import logging
 import re
 from typing import Any, Dict, List, Optional
 
-import httpx
+from .cassette import recorded
+from .http_client import get_http_client
+from .offload import run_cpu
 
 logger = logging.getLogger("pipeline")
 
-_BROWSER_UA = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
-)
 
 # External-link prefixes that are useful for electoral research.
 # We filter the full extlinks list down to these so the agent isn't buried in
@@ -73,6 +71,39 @@ async def lookup_candidate_image(candidate_name: str) -> Optional[str]:
     return result.get("image_url") if result else None
 
 
+def _parse_candidate_page(html: str) -> Dict[str, Any]:
+    """Pull the infobox image, the lead paragraph and useful external links out of a candidate page."""
+    # --- Image: first widget-img inside the infobox -----------------
+    image_url: Optional[str] = None
+    # The infobox renders as: <img src="https://s3.amazonaws.com/..." class="widget-img" />
+    infobox_m = re.search(r'class="infobox person".*?<img\s[^>]*src="([^"]+)"[^>]*>', html, re.DOTALL)
+    if infobox_m:
+        image_url = infobox_m.group(1)
+
+    # --- Extract: first non-trivial <p> inside mw-parser-output -----
+    extract: Optional[str] = None
+    parser_idx = html.find("mw-parser-output")
+    if parser_idx >= 0:
+        for para_m in re.finditer(r"<p>(.*?)</p>", html[parser_idx : parser_idx + 30000], re.DOTALL):
+            text = re.sub(r"<[^>]+>", "", para_m.group(1))
+            # Unescape common HTML entities
+            text = text.replace("&#91;", "[").replace("&#93;", "]").replace("&amp;", "&").strip()
+            if len(text) > 30:
+                extract = text[:1200]
+                break
+
+    # --- External links filtered to research-useful domains ---------
+    seen: set = set()
+    deduped_links: List[str] = []
+    for lnk in re.findall(r'href="(https?://[^"]+)"', html):
+        if lnk not in seen and _is_useful_link(lnk):
+            seen.add(lnk)
+            deduped_links.append(lnk)
+
+    return {"extract": extract, "external_links": deduped_links, "image_url": image_url}
+
+
+@recorded("ballotpedia")
 async def lookup_candidate_data(candidate_name: str) -> Dict[str, Any]:
     """Scrape a Ballotpedia candidate page for structured data.
 
@@ -87,67 +118,31 @@ async def lookup_candidate_data(candidate_name: str) -> Dict[str, Any]:
     """
     empty: Dict[str, Any] = {"found": False}
     try:
-        async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
-            # Step 1: try the canonical URL derived from the name
-            url_name = candidate_name.strip().replace(" ", "_")
+        client = get_http_client()
+        # Step 1: try the canonical URL derived from the name
+        url_name = candidate_name.strip().replace(" ", "_")
+        resp = await client.get(f"https://ballotpedia.org/{url_name}", timeout=10)
+
+        # Step 2: fall back to Special:Search (redirects when there is a unique match)
+        if resp.status_code != 200:
             resp = await client.get(
-                f"https://ballotpedia.org/{url_name}",
-                headers={"User-Agent": _BROWSER_UA},
+                "https://ballotpedia.org/Special:Search",
+                params={"search": candidate_name},
+                timeout=10,
             )
 
-            # Step 2: fall back to Special:Search (redirects when there is a unique match)
-            if resp.status_code != 200:
-                resp = await client.get(
-                    "https://ballotpedia.org/Special:Search",
-                    params={"search": candidate_name},
-                    headers={"User-Agent": _BROWSER_UA},
-                )
-
-            if resp.status_code != 200:
-                return empty
-
-            page_url = str(resp.url)
-
-            # If we ended up on the search-results page the candidate wasn't found
-            if "Special:Search" in page_url:
-                return empty
-
-            html = resp.text
-
-            # --- Image: first widget-img inside the infobox -----------------
-            image_url: Optional[str] = None
-            # The infobox renders as: <img src="https://s3.amazonaws.com/..." class="widget-img" />
-            infobox_m = re.search(r'class="infobox person".*?<img\s[^>]*src="([^"]+)"[^>]*>', html, re.DOTALL)
-            if infobox_m:
-                image_url = infobox_m.group(1)
-
-            # --- Extract: first non-trivial <p> inside mw-parser-output -----
-            extract: Optional[str] = None
-            parser_idx = html.find("mw-parser-output")
-            if parser_idx >= 0:
-                for para_m in re.finditer(r"<p>(.*?)</p>", html[parser_idx : parser_idx + 30000], re.DOTALL):
-                    text = re.sub(r"<[^>]+>", "", para_m.group(1))
-                    # Unescape common HTML entities
-                    text = text.replace("&#91;", "[").replace("&#93;", "]").replace("&amp;", "&").strip()
-                    if len(text) > 30:
-                        extract = text[:1200]
-                        break
-
-            # --- External links filtered to research-useful domains ---------
-            seen: set = set()
-            deduped_links: List[str] = []
-            for lnk in re.findall(r'href="(https?://[^"]+)"', html):
-                if lnk not in seen and _is_useful_link(lnk):
-                    seen.add(lnk)
-                    deduped_links.append(lnk)
-
-            return {
-                "found": True,
-                "page_url": page_url,
-                "extract": extract,
-                "external_links": deduped_links,
-                "image_url": image_url,
-            }
+        if resp.status_code != 200:
+            return empty
+
+        page_url = str(resp.url)
+
+        # If we ended up on the search-results page the candidate wasn't found
+        if "Special:Search" in page_url:
+            return empty
+
+        # Large pages are parsed off the event loop
+        parsed = await run_cpu(_parse_candidate_page, resp.text, min_size=len(resp.text))
+        return {"found": True, "page_url": page_url, **parsed}
 
     except Exception as exc:
         logger.debug("Ballotpedia lookup failed for %r: %s", candidate_name, exc)
@@ -0,0 +1,413 @@
+"""Tiered search/page cache: in-process LRU → local SQLite → shared tier.
+
+On Cloud Run every instance has its own ephemeral ``search_cache.db``, so a
+cold start loses every cached search and instances never share results.
+``TieredCache`` keeps the ``SearchCache`` API but looks entries up in three
+tiers, fastest first:
+
+1. ``LRUTier`` — in-process, bounded by entry count and by bytes.
+2. ``SearchCache`` — the local SQLite file.
+3. A ``SharedTier`` (optional) — a directory (e.g. a mounted volume, or a
+   local path in tests) or a GCS bucket prefix shared by all instances.
+
+A hit in a lower tier is promoted into the tiers above it with its remaining
+TTL; writes go through to every tier.  Entries the LRU evicts for space are
+demoted implicitly — they are still in SQLite and the shared tier.  Each
+tier keeps its own hit/miss counters (``tier_stats()``, also included in
+``get_stats()``).
+
+Search keys are the race-independent ``search_key`` (the same in every tier),
+so a query cached for one race is a hit for every other race.
+
+``clear_for_race`` / ``clear_all`` only clear the local tiers: the shared tier
+belongs to every instance, and its entries expire on their own.
+
+Configuration (``TieredCache.from_env``)::
+
+    SEARCH_CACHE_MEMORY_ENTRIES=2048      # LRU entry limit
+    SEARCH_CACHE_MEMORY_MB=64             # LRU size limit
+    SEARCH_CACHE_SHARED=gs://bucket/cache # or a directory path; unset = no shared tier
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Tuple, runtime_checkable
+
+from .search_cache import DEFAULT_NUM_RESULTS, SearchCache, search_key
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("memory", "sqlite", "shared")
+
+
+def _epoch(iso_utc: str) -> float:
+    """SearchCache timestamps are naive UTC ISO strings."""
+    return datetime.fromisoformat(iso_utc).replace(tzinfo=timezone.utc).timestamp()
+
+
+class LRUTier:
+    """Thread-safe in-process LRU bounded by entry count and total size in bytes."""
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any, size: int, expires_at: float) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+@runtime_checkable
+class SharedTier(Protocol):
+    """Cache tier shared between instances.
+
+    Entries are JSON dicts ``{"expires_at": <epoch seconds>, "value": ...}``
+    stored under keys like ``"search/<hash>"`` / ``"page/<hash>"``.
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        ...
+
+
+class DirectorySharedTier:
+    """Shared tier backed by a directory (a mounted volume, or a local path in tests)."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: several instances may write the same key at once.
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, default=str), encoding="utf-8")
+        tmp.replace(path)
+
+
+class GCSSharedTier:
+    """Shared tier backed by objects under ``gs://<bucket>/<prefix>/``."""
+
+    def __init__(self, bucket: str, prefix: str = "cache") -> None:
+        try:
+            from google.cloud import storage
+        except Exception as e:  # pragma: no cover - import guard
+            raise RuntimeError("google-cloud-storage is required for the GCS cache tier") from e
+
+        self.bucket = storage.Client().bucket(bucket)
+        self.prefix = prefix.strip("/")
+
+    def _blob(self, key: str) -> Any:
+        return self.bucket.blob(f"{self.prefix}/{key}.json" if self.prefix else f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._blob(key).download_as_text())
+        except Exception:  # NotFound, or a transient error — both are misses
+            return None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        self._blob(key).upload_from_string(json.dumps(entry, default=str), content_type="application/json")
+
+
+def shared_tier_from_env() -> Optional[SharedTier]:
+    """Build the shared tier named by ``SEARCH_CACHE_SHARED`` (``gs://bucket/prefix`` or a directory)."""
+    target = os.getenv("SEARCH_CACHE_SHARED", "").strip()
+    if not target:
+        return None
+    if target.startswith("gs://"):
+        bucket, _, prefix = target[len("gs://") :].partition("/")
+        return GCSSharedTier(bucket, prefix or "cache")
+    return DirectorySharedTier(target)
+
+
+class TieredCache:
+    """``SearchCache``-compatible cache that reads through memory, SQLite and a shared tier."""
+
+    def __init__(
+        self,
+        local: SearchCache,
+        *,
+        memory: Optional[LRUTier] = None,
+        shared: Optional[SharedTier] = None,
+    ) -> None:
+        self.local = local
+        self.memory = memory if memory is not None else LRUTier()
+        self.shared = shared
+        self._stats_lock = threading.Lock()
+        self._tier_stats: Dict[str, Dict[str, int]] = {t: {"hits": 0, "misses": 0} for t in TIERS}
+
+    @classmethod
+    def from_env(cls, local: SearchCache) -> "TieredCache":
+        memory = LRUTier(
+            max_entries=int(os.getenv("SEARCH_CACHE_MEMORY_ENTRIES", "2048")),
+            max_bytes=int(float(os.getenv("SEARCH_CACHE_MEMORY_MB", "64")) * 1024 * 1024),
+        )
+        try:
+            shared = shared_tier_from_env()
+        except Exception as e:
+            logger.warning(f"Shared cache tier unavailable, continuing without it: {e}")
+            shared = None
+        return cls(local, memory=memory, shared=shared)
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything not tiered (cleanup_expired, flush_hits, db_path, ...) is the local cache's.
+        if name == "local":
+            raise AttributeError(name)
+        return getattr(self.local, name)
+
+    def _count(self, tier: str, hit: bool) -> None:
+        with self._stats_lock:
+            self._tier_stats[tier]["hits" if hit else "misses"] += 1
+
+    def tier_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._stats_lock:
+            return {tier: dict(counts) for tier, counts in self._tier_stats.items()}
+
+    def _shared_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.shared is None:
+            return None
+        try:
+            entry = self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            entry = None
+        if entry is not None and entry.get("expires_at", 0) <= time.time():
+            entry = None
+        self._count("shared", entry is not None)
+        return entry
+
+    def _shared_put(self, key: str, value: Any, expires_at: float) -> None:
+        if self.shared is None:
+            return
+        try:
+            self.shared.put(key, {"expires_at": expires_at, "value": value})
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {key}: {e}")
+
+    # -- searches ------------------------------------------------------------
+
+    def get(
+        self, query_text: str, race_id: Optional[str] = None, num_results: int = DEFAULT_NUM_RESULTS
+    ) -> Optional[Dict[str, Any]]:
+        query_hash = search_key(query_text, num_results)
+        key = f"search/{query_hash}"
+
+        record = self.memory.get(key)
+        self._count("memory", record is not None)
+        if record is not None:
+            self.local._record_hit("search_cache", query_hash, race_id)
+            return dict(record, race_id=race_id or record.get("race_id"))
+
+        record = self.local.get(query_text, race_id, num_results)
+        self._count("sqlite", record is not None)
+        if record is not None:
+            self._remember(key, record, _epoch(record["expires_at"]))
+            return record
+
+        entry = self._shared_get(key)
+        if entry is None:
+            return None
+        record = entry["value"]
+        # Promote into SQLite and memory with the TTL it has left.
+        self.local.set(
+            record["query_text"],
+            record["results"],
+            race_id=race_id or record.get("race_id"),
+            provider=record.get("provider") or "unknown",
+            ttl_hours=(entry["expires_at"] - time.time()) / 3600,
+            num_results=num_results,
+        )
+        self._remember(key, record, entry["expires_at"])
+        return dict(record, race_id=race_id or record.get("race_id"), from_cache=True)
+
+    def set(
+        self,
+        query_text: str,
+        results: List[Dict[str, Any]],
+        race_id: Optional[str] = None,
+        provider: str = "unknown",
+        ttl_hours: Optional[float] = None,
+        num_results: int = DEFAULT_NUM_RESULTS,
+    ) -> bool:
+        ok = self.local.set(
+            query_text, results, race_id=race_id, provider=provider, ttl_hours=ttl_hours, num_results=num_results
+        )
+        if not ok:
+            return False
+        now = time.time()
+        expires_at = now + (ttl_hours or self.local.default_ttl_hours) * 3600
+        record = {
+            "query_text": query_text,
+            "race_id": race_id,
+            "provider": provider,
+            "results": results,
+            "result_count": len(results),
+            "searched_at": datetime.utcfromtimestamp(now).isoformat(),
+            "expires_at": datetime.utcfromtimestamp(expires_at).isoformat(),
+        }
+        key = f"search/{search_key(query_text, num_results)}"
+        self._remember(key, dict(record, from_cache=True), expires_at)
+        self._shared_put(key, record, expires_at)
+        return True
+
+    def _remember(self, key: str, record: Dict[str, Any], expires_at: float) -> None:
+        size = len(json.dumps(record.get("results", []), default=str)) + len(record.get("query_text", ""))
+        self.memory.put(key, record, size, expires_at)
+
+    # -- pages ---------------------------------------------------------------
+
+    def get_page(self, url: str, race_id: Optional[str] = None) -> Optional[str]:
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        key = f"page/{url_hash}"
+
+        content = self.memory.get(key)
+        self._count("memory", content is not None)
+        if content is not None:
+            self.local._record_hit("page_cache", url_hash, race_id)
+            return content
+
+        entry = self.local.get_page_entry(url, race_id)
+        self._count("sqlite", entry is not None)
+        if entry is not None:
+            self.memory.put(key, entry["content"], len(entry["content"]), _epoch(entry["expires_at"]))
+            return entry["content"]
+
+        shared = self._shared_get(key)
+        if shared is None:
+            return None
+        content = shared["value"]
+        self.local.set_page(url, content, ttl_hours=(shared["expires_at"] - time.time()) / 3600, race_id=race_id)
+        self.memory.put(key, content, len(content), shared["expires_at"])
+        return content
+
+    def set_page(
+        self,
+        url: str,
+        content: str,
+        ttl_hours: float = 24,
+        race_id: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        ok = self.local.set_page(url, content, ttl_hours=ttl_hours, race_id=race_id, etag=etag, last_modified=last_modified)
+        if not ok:
+            return False
+        expires_at = time.time() + ttl_hours * 3600
+        key = f"page/{hashlib.sha256(url.encode()).hexdigest()}"
+        self.memory.put(key, content, len(content), expires_at)
+        self._shared_put(key, content, expires_at)
+        return True
+
+    # -- async API (same as SearchCache: blocking work runs in a worker thread) --
+
+    async def aget(
+        self, query_text: str, race_id: Optional[str] = None, num_results: int = DEFAULT_NUM_RESULTS
+    ) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, query_text, race_id, num_results)
+
+    async def aset(
+        self,
+        query_text: str,
+        results: List[Dict[str, Any]],
+        race_id: Optional[str] = None,
+        provider: str = "unknown",
+        ttl_hours: Optional[float] = None,
+        num_results: int = DEFAULT_NUM_RESULTS,
+    ) -> bool:
+        return await asyncio.to_thread(self.set, query_text, results, race_id, provider, ttl_hours, num_results)
+
+    async def aget_page(self, url: str, race_id: Optional[str] = None) -> Optional[str]:
+        return await asyncio.to_thread(self.get_page, url, race_id)
+
+    async def aset_page(
+        self,
+        url: str,
+        content: str,
+        ttl_hours: float = 24,
+        race_id: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        return await asyncio.to_thread(self.set_page, url, content, ttl_hours, race_id, etag, last_modified)
+
+    async def alist_cached_for_race(self, race_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.local.list_cached_for_race, race_id)
+
+    async def achanges_since(self, race_id: str, cursor: int = 0) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.local.changes_since, race_id, cursor)
+
+    # -- maintenance ---------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.local.get_stats()
+        stats["tiers"] = self.tier_stats()
+        stats["memory_entries"] = len(self.memory)
+        stats["memory_bytes"] = self.memory.size_bytes
+        stats["shared_tier"] = type(self.shared).__name__ if self.shared is not None else None
+        return stats
+
+    def clear_for_race(self, race_id: str) -> int:
+        self.memory.clear()
+        return self.local.clear_for_race(race_id)
+
+    def clear_all(self) -> int:
+        self.memory.clear()
+        return self.local.clear_all()
@@ -0,0 +1,205 @@
+"""Record/replay cassettes for every outbound call the agent pipeline makes.
+
+In **record** mode each wrapped call (OpenAI, Serper, page fetches,
+Ballotpedia, image checks, the review providers and the search cache reads
+that issue prompts are built from) runs normally and its result is stored
+in a JSON cassette keyed by a hash of the call's arguments.
+In **replay** mode the same calls are answered from the cassette without
+touching the network, so a recorded ``run_agent`` can be re-run offline and
+deterministically — the base for benchmarking and regression tests.
+
+Activation is per run through a ``ContextVar`` (like the cost accumulator):
+``run_agent(cassette_path=..., cassette_mode=...)`` or the ``AGENT_CASSETTE``
+/ ``AGENT_CASSETTE_MODE`` environment variables.
+
+Request keys ignore ISO timestamps, which change between runs (``updated_utc``,
+``last_accessed``, ``reviewed_at``) and end up inside prompts.  A key that was
+requested several times replays its recorded answers in order.  Token usage
+reported during a recorded call is stored alongside it and re-accumulated on
+replay, so ``agent_metrics`` match the recorded run.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .cost import _usage_tap, accumulate
+
+logger = logging.getLogger("pipeline")
+
+CASSETTE_MODES = ("record", "replay")
+_FORMAT_VERSION = 1
+
+_ISO_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?")
+
+
+class CassetteMiss(RuntimeError):
+    """Raised in replay mode when a call was never recorded."""
+
+
+class ReplayedError(RuntimeError):
+    """Re-raised in replay mode for a call that failed while recording."""
+
+
+class Cassette:
+    """A set of recorded calls backed by one JSON file."""
+
+    def __init__(self, path: str | Path, mode: str):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"cassette mode must be one of {CASSETTE_MODES}, got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        # key -> list of {"kind", "result", "usage"} in call order
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        # Run inputs that are not outbound calls (existing data, provider keys present)
+        self.inputs: Dict[str, Any] = {}
+        self._replay_pos: Dict[str, int] = {}
+        self.stats: Dict[str, int] = {"recorded": 0, "replayed": 0, "misses": 0}
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        self.entries = data.get("entries", {})
+        self.inputs = data.get("inputs", {})
+
+    def save(self) -> None:
+        """Write the cassette atomically (record mode only)."""
+        if self.replaying:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        payload = {"version": _FORMAT_VERSION, "inputs": self.inputs, "entries": self.entries}
+        # Results keep their key order: replayed tool output must serialize exactly as
+        # recorded, or the next request's key no longer matches.
+        tmp.write_text(json.dumps(payload, indent=1, default=str), encoding="utf-8")
+        tmp.replace(self.path)
+        logger.info(f"Cassette saved: {self.path} ({self.stats['recorded']} calls)")
+
+    @staticmethod
+    def key(kind: str, payload: Any) -> str:
+        """Stable hash of a call, with volatile timestamps masked out."""
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        raw = _ISO_TIMESTAMP.sub("<ts>", raw)
+        return f"{kind}:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def record(self, key: str, kind: str, result: Any, usage: List[Tuple[int, int, str]], error: Optional[str] = None) -> None:
+        entry: Dict[str, Any] = {"kind": kind, "result": result, "usage": usage}
+        if error is not None:
+            entry["error"] = error
+        self.entries.setdefault(key, []).append(entry)
+        self.stats["recorded"] += 1
+
+    def replay(self, key: str) -> Dict[str, Any]:
+        recorded = self.entries.get(key)
+        if not recorded:
+            self.stats["misses"] += 1
+            raise CassetteMiss(f"No recorded call for {key} in {self.path}")
+        pos = self._replay_pos.get(key, 0)
+        self._replay_pos[key] = pos + 1
+        self.stats["replayed"] += 1
+        return recorded[min(pos, len(recorded) - 1)]
+
+    # -- run inputs ---------------------------------------------------------
+
+    def env_flag(self, name: str) -> bool:
+        """Whether env var *name* is set — recorded, and served from the cassette on replay."""
+        flags = self.inputs.setdefault("env", {})
+        if self.replaying:
+            return bool(flags.get(name, False))
+        flags[name] = bool(os.environ.get(name))
+        return flags[name]
+
+
+_cassette_ctx: ContextVar[Optional[Cassette]] = ContextVar("_cassette_ctx", default=None)
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Return the cassette active for the current run, if any."""
+    return _cassette_ctx.get()
+
+
+def open_cassette(path: Optional[str] = None, mode: Optional[str] = None) -> Optional[Cassette]:
+    """Build the cassette for a run from explicit args or ``AGENT_CASSETTE[_MODE]``."""
+    path = path or os.getenv("AGENT_CASSETTE") or None
+    if not path:
+        return None
+    mode = (mode or os.getenv("AGENT_CASSETTE_MODE") or "replay").strip().lower()
+    return Cassette(path, mode)
+
+
+def env_flag(name: str) -> bool:
+    """``bool(os.environ.get(name))``, pinned to the recorded value when a cassette is active."""
+    cassette = get_cassette()
+    if cassette is None:
+        return bool(os.environ.get(name))
+    return cassette.env_flag(name)
+
+
+def recorded(
+    kind: str,
+    *,
+    ignore: Iterable[str] = (),
+    encode: Callable[[Any], Any] = lambda value: value,
+    decode: Callable[[Any], Any] = lambda value: value,
+) -> Callable:
+    """Decorate an async outbound call so it is recorded to / replayed from the active cassette.
+
+    *ignore* names keyword arguments left out of the request key (out-params,
+    retry budgets).  *encode* / *decode* convert the result to and from JSON.
+    """
+    ignored = frozenset(ignore)
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cassette = _cassette_ctx.get()
+            if cassette is None:
+                return await fn(*args, **kwargs)
+
+            key = cassette.key(
+                kind,
+                {
+                    "args": list(args),
+                    "kwargs": {k: v for k, v in kwargs.items() if k not in ignored},
+                },
+            )
+            if cassette.replaying:
+                entry = cassette.replay(key)
+                for prompt_tokens, completion_tokens, model in entry.get("usage", []):
+                    accumulate(prompt_tokens, completion_tokens, model)
+                if "error" in entry:
+                    raise ReplayedError(entry["error"])
+                return decode(entry["result"])
+
+            usage: List[Tuple[int, int, str]] = []
+            tap_token = _usage_tap.set(usage)
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as exc:
+                cassette.record(key, kind, None, usage, error=f"{type(exc).__name__}: {exc}")
+                raise
+            finally:
+                _usage_tap.reset(tap_token)
+                # A wrapped call nested in another one also charges the outer recording.
+                parent = _usage_tap.get()
+                if parent is not None:
+                    parent.extend(usage)
+            cassette.record(key, kind, encode(result), usage)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,112 @@
+"""Phase-level checkpoints so a failed run can resume instead of starting over.
+
+``run_agent`` saves a checkpoint after every completed phase (discovery,
+images, issues, finance, refinement, review, iteration) and after every
+candidate/issue unit inside the issues phase.  A checkpoint holds the current
+``race_json``, the run's cost accumulator and the names of the completed
+phases and units; it is written through the configured ``StorageBackend``
+(``checkpoints/{race_id}.json`` locally under ``data/`` or in GCS).
+
+With ``run_agent(..., resume=True)`` the last checkpoint for the race is
+loaded: completed phases and issue units are skipped, ``race_json`` picks up
+where it was, and token usage already spent is carried over so
+``agent_metrics`` cover the whole run.  The handler deletes the checkpoint
+once the draft is saved.
+"""
+
+import asyncio
+import copy
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from .cost import _cost_ctx
+
+logger = logging.getLogger("pipeline")
+
+_FORMAT_VERSION = 1
+
+
+def _unit_key(candidate_name: str, issue: str) -> str:
+    return f"{candidate_name}|{issue}"
+
+
+class RunCheckpointer:
+    """Tracks completed phases/units of one run and persists them to a storage backend."""
+
+    def __init__(self, store: Any, race_id: str, *, mode: str = "fresh", state: Optional[Dict[str, Any]] = None):
+        self.store = store
+        self.race_id = race_id
+        state = state or {}
+        self.mode: str = state.get("mode", mode)
+        self.phases = list(state.get("phases", []))
+        self.units = set(state.get("units", []))
+        self.race_json: Optional[Dict[str, Any]] = state.get("race_json")
+        self.cost: Optional[Dict[str, Any]] = state.get("cost")
+        self._lock = asyncio.Lock()
+        self._pending: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def load(cls, store: Any, race_id: str) -> Optional["RunCheckpointer"]:
+        """Return the saved checkpoint for *race_id*, or *None* when there is none."""
+        if store is None:
+            return None
+        try:
+            state = store.load_checkpoint(race_id)
+        except Exception as exc:
+            logger.warning(f"Failed to load checkpoint for {race_id}: {exc}")
+            return None
+        if not state or state.get("version") != _FORMAT_VERSION or not isinstance(state.get("race_json"), dict):
+            return None
+        return cls(store, race_id, state=state)
+
+    # -- queries -------------------------------------------------------------
+
+    def phase_done(self, name: str) -> bool:
+        return name in self.phases
+
+    def unit_done(self, candidate_name: str, issue: str) -> bool:
+        return _unit_key(candidate_name, issue) in self.units
+
+    # -- updates -------------------------------------------------------------
+
+    async def mark_phase(self, name: str, race_json: Dict[str, Any]) -> None:
+        if name not in self.phases:
+            self.phases.append(name)
+        await self._save(race_json)
+
+    async def mark_unit(self, candidate_name: str, issue: str, race_json: Dict[str, Any]) -> None:
+        self.units.add(_unit_key(candidate_name, issue))
+        await self._save(race_json)
+
+    def clear(self) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.delete_checkpoint(self.race_id)
+        except Exception as exc:
+            logger.warning(f"Failed to delete checkpoint for {self.race_id}: {exc}")
+
+    async def _save(self, race_json: Dict[str, Any]) -> None:
+        if self.store is None:
+            return
+        # Snapshot on the loop thread: sibling sub-agents keep editing race_json while we write.
+        self._pending = {
+            "version": _FORMAT_VERSION,
+            "race_id": self.race_id,
+            "mode": self.mode,
+            "phases": list(self.phases),
+            "units": sorted(self.units),
+            "race_json": copy.deepcopy(race_json),
+            "cost": copy.deepcopy(_cost_ctx.get()),
+            "saved_utc": datetime.now(timezone.utc).isoformat(),
+        }
+        async with self._lock:
+            # Marks that queued up behind a slow write collapse into one write of the newest snapshot.
+            data, self._pending = self._pending, None
+            if data is None:
+                return
+            try:
+                await asyncio.to_thread(self.store.save_checkpoint, self.race_id, data)
+            except Exception as exc:
+                logger.warning(f"Failed to save checkpoint for {self.race_id}: {exc}")
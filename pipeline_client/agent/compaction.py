@@ -0,0 +1,137 @@
+"""Context compaction for long ``_agent_loop`` message histories.
+
+Every iteration of ``_agent_loop`` resends the whole message list, and search
+results / fetched pages make up most of it.  Once the history passes a token
+budget, ``compact_messages()`` rewrites the *oldest* tool outputs as short
+digests (titles + URLs for searches, a head excerpt for pages) while the most
+recent messages stay verbatim.  Digests point back at the URL so the model
+can re-fetch a page — the page cache serves it without a network round trip.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from .rate_limit import estimate_request_tokens
+
+# Approximate prompt-token budget for one agent loop before compaction kicks in.
+DEFAULT_CONTEXT_TOKEN_BUDGET = int(os.getenv("AGENT_CONTEXT_TOKEN_BUDGET", "48000"))
+# Trailing messages that are never compacted (covers the last couple of tool turns).
+DEFAULT_KEEP_RECENT = 8
+
+_COMPACTED_PREFIX = "[compacted "
+_PAGE_EXCERPT_CHARS = 600
+_SEARCH_MAX_RESULTS = 8
+# Outputs shorter than this are cheaper to keep than to summarise.
+_MIN_COMPACT_CHARS = 800
+
+
+def _tool_call_index(messages: List[Dict[str, Any]]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """Map tool_call_id → (tool name, parsed arguments) from assistant messages."""
+    index: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    for msg in messages:
+        tool_calls = msg.get("tool_calls")
+        if not isinstance(tool_calls, list):
+            continue
+        for tc in tool_calls:
+            if not isinstance(tc, dict):
+                continue
+            fn = tc.get("function") or {}
+            try:
+                args = json.loads(fn.get("arguments") or "{}")
+            except (TypeError, ValueError):
+                args = {}
+            index[str(tc.get("id"))] = (str(fn.get("name", "")), args if isinstance(args, dict) else {})
+    return index
+
+
+def _digest_search(content: str, query: str) -> Optional[str]:
+    try:
+        results = json.loads(content)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(results, list):
+        return None
+    lines = [f"{_COMPACTED_PREFIX}search results for {query!r} — snippets elided]"]
+    for r in results[:_SEARCH_MAX_RESULTS]:
+        if isinstance(r, dict) and r.get("url"):
+            lines.append(f"- {str(r.get('title', ''))[:100]} — {r['url']}")
+    return "\n".join(lines)
+
+
+def _digest_page(content: str, url: str) -> str:
+    excerpt = content[:_PAGE_EXCERPT_CHARS].rstrip()
+    elided = len(content) - len(excerpt)
+    return (
+        f"{_COMPACTED_PREFIX}page {url or '(unknown url)'} — {elided} chars elided; "
+        f"call fetch_page again if you need the full text]\n{excerpt}"
+    )
+
+
+def _digest_ballotpedia(content: str) -> Optional[str]:
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return f"{_COMPACTED_PREFIX}ballotpedia lookup] " + json.dumps(
+        {
+            "found": data.get("found"),
+            "page_url": data.get("page_url"),
+            "extract": (data.get("extract") or "")[:300] or None,
+            "image_url": data.get("image_url"),
+        }
+    )
+
+
+def _digest(content: str, tool_name: str, args: Dict[str, Any]) -> Optional[str]:
+    if tool_name == "web_search":
+        return _digest_search(content, str(args.get("query", "")))
+    if tool_name == "fetch_page":
+        return _digest_page(content, str(args.get("url", "")))
+    if tool_name == "ballotpedia_lookup":
+        return _digest_ballotpedia(content)
+    return None
+
+
+def compact_messages(
+    messages: List[Dict[str, Any]],
+    *,
+    token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET,
+    keep_recent: int = DEFAULT_KEEP_RECENT,
+) -> Tuple[int, int]:
+    """Compact old tool outputs in-place until *messages* fits *token_budget*.
+
+    Only ``tool`` messages for web_search / fetch_page / ballotpedia_lookup
+    older than the last *keep_recent* messages are rewritten, oldest first.
+    Message count and ``tool_call_id`` pairing are preserved.
+
+    Returns ``(tokens_saved, messages_compacted)`` (estimated tokens).
+    """
+    before = estimate_request_tokens(messages, 0)
+    if before <= token_budget:
+        return 0, 0
+
+    index = _tool_call_index(messages)
+    remaining = before
+    compacted = 0
+    for msg in messages[: max(len(messages) - keep_recent, 0)]:
+        if remaining <= token_budget:
+            break
+        if msg.get("role") != "tool":
+            continue
+        content = msg.get("content")
+        if not isinstance(content, str) or len(content) < _MIN_COMPACT_CHARS or content.startswith(_COMPACTED_PREFIX):
+            continue
+        tool_name, args = index.get(str(msg.get("tool_call_id")), ("", {}))
+        digest = _digest(content, tool_name, args)
+        if digest is None or len(digest) >= len(content):
+            continue
+        msg["content"] = digest
+        remaining -= (len(content) - len(digest)) // 4
+        compacted += 1
+
+    if not compacted:
+        return 0, 0
+    return max(before - estimate_request_tokens(messages, 0), 0), compacted
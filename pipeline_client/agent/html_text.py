@@ -0,0 +1,132 @@
+"""Single-pass extraction of readable text from fetched HTML pages.
+
+``extract_text`` tokenizes the page once with the stdlib ``html.parser``:
+script / style / noscript / template content is dropped, block-level tags
+become line breaks, every other tag separates words, and all HTML entities
+are decoded.  Whitespace is collapsed as the text is produced, so the
+extractor can stop as soon as it has ``max_chars`` of output instead of
+processing the rest of a large page only for it to be truncated.
+
+Extraction is CPU-bound; async callers run it in a worker thread.
+"""
+
+import logging
+import re
+from html.parser import HTMLParser
+from typing import List, Optional
+
+logger = logging.getLogger("pipeline")
+
+_SKIPPED_TAGS = frozenset({"script", "style", "noscript", "template"})
+_BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "br",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "main",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "title",
+        "tr",
+        "ul",
+    }
+)
+# ASCII control characters are invalid in JSON strings (tab / newline / CR are whitespace anyway)
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_FEED_CHUNK = 64 * 1024
+
+
+class _Enough(Exception):
+    """Raised from a parser callback once ``max_chars`` of text were produced."""
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self, max_chars: Optional[int]) -> None:
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.size = 0
+        self._skip_depth = 0
+        self._breaks = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._breaks += 1
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/> is one break, not a start and an end tag
+        if tag in _BLOCK_TAGS:
+            self._breaks += 1
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._breaks += 1
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        text = " ".join(_CONTROL_CHARS.sub("", data).split())
+        if not text:
+            return
+        if not self.size:
+            sep = ""
+        elif self._breaks:
+            sep = "\n\n" if self._breaks > 1 else "\n"
+        else:
+            sep = " "
+        self._breaks = 0
+        self.parts.append(sep + text)
+        self.size += len(sep) + len(text)
+        if self.max_chars is not None and self.size > self.max_chars:
+            # Keep one character past the limit so the caller sees the text was cut
+            overflow = self.size - self.max_chars - 1
+            if overflow:
+                self.parts[-1] = self.parts[-1][:-overflow]
+            raise _Enough
+
+
+def extract_text(html: str, max_chars: Optional[int] = None) -> str:
+    """Readable text of *html*, with one line per block and at most one blank line between blocks.
+
+    With *max_chars* parsing stops once the text is longer than that; the
+    result is then ``max_chars + 1`` characters long, so callers can tell it
+    was cut.
+    """
+    parser = _TextExtractor(max_chars)
+    try:
+        for start in range(0, len(html), _FEED_CHUNK):
+            parser.feed(html[start : start + _FEED_CHUNK])
+        parser.close()
+    except _Enough:
+        pass
+    except Exception as exc:  # html.parser is lenient, but keep what was extracted on anything odd
+        logger.debug(f"HTML extraction stopped early: {exc}")
+    return "".join(parser.parts)
@@ -0,0 +1,234 @@
+"""Shared outbound HTTP layer for the agent package.
+
+Every outbound request of the agent (page fetches, the jina proxy, Serper,
+Ballotpedia, Wikipedia and image checks) goes through one ``httpx.AsyncClient``
+per event loop, so keep-alive connections are pooled per host and reused
+across calls instead of paying TCP + TLS setup on each one.  HTTP/2 is used
+when the optional ``h2`` package is installed (``pip install httpx[http2]``)
+and ``AGENT_HTTP2`` is not turned off; otherwise requests use HTTP/1.1.
+
+A politeness transport wraps the pool:
+
+* at most ``concurrency`` requests in flight per host (released once the
+  response body is closed), and
+* at least ``min_interval_s`` between request starts to the same host.
+
+Hosts without an entry in ``DEFAULT_HOST_POLICIES`` get
+``HTTP_HOST_CONCURRENCY`` (default 6) and no delay.  ``HTTP_HOST_LIMITS``
+overrides or adds entries, e.g. ``ballotpedia.org=2:1.0,r.jina.ai=4:0.5``.
+A policy for ``example.org`` also covers its subdomains.
+
+``connection_stats()`` (served at ``GET /pipeline/http``) reports per host
+the requests sent, new connections opened, connection reuse rate, HTTP/2
+requests and time spent waiting on politeness limits.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from .cost import record_metric
+
+logger = logging.getLogger("pipeline")
+
+BROWSER_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) " "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+# host -> (max concurrent requests, min seconds between request starts)
+DEFAULT_HOST_POLICIES: Dict[str, Tuple[int, float]] = {
+    "ballotpedia.org": (2, 1.0),
+    "wikipedia.org": (4, 0.2),
+    "r.jina.ai": (4, 0.5),
+}
+DEFAULT_HOST_CONCURRENCY = int(os.getenv("HTTP_HOST_CONCURRENCY", "6"))
+
+try:
+    import h2  # noqa: F401  (presence check: httpx needs it for HTTP/2)
+
+    _H2_AVAILABLE = True
+except ImportError:
+    _H2_AVAILABLE = False
+
+_clients_by_loop: Dict[int, httpx.AsyncClient] = {}
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def _parse_host_limits(value: str) -> Dict[str, Tuple[int, float]]:
+    """Parse ``host=concurrency[:min_interval_s]`` pairs separated by commas."""
+    policies: Dict[str, Tuple[int, float]] = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        host, _, spec = item.partition("=")
+        concurrency, _, interval = spec.partition(":")
+        try:
+            policies[host.strip().lower()] = (max(1, int(concurrency)), float(interval or 0))
+        except ValueError:
+            logger.warning(f"Ignoring malformed HTTP_HOST_LIMITS entry: {item!r}")
+    return policies
+
+
+def host_policies() -> Dict[str, Tuple[int, float]]:
+    """Per-host (concurrency, min interval) limits: defaults plus ``HTTP_HOST_LIMITS``."""
+    return {**DEFAULT_HOST_POLICIES, **_parse_host_limits(os.getenv("HTTP_HOST_LIMITS", ""))}
+
+
+def _bump(host: str, **counts: float) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(host, {"requests": 0, "new_connections": 0, "http2_requests": 0, "politeness_wait_s": 0.0})
+        for key, value in counts.items():
+            entry[key] += value
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees the host slot once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Any) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _HostGate:
+    def __init__(self, concurrency: int, min_interval_s: float) -> None:
+        self.slots = asyncio.Semaphore(concurrency)
+        self.min_interval_s = min_interval_s
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+
+class PoliteTransport(httpx.AsyncBaseTransport):
+    """Per-host concurrency and request spacing in front of a pooled transport, with reuse accounting."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        policies: Optional[Dict[str, Tuple[int, float]]] = None,
+        default_concurrency: int = DEFAULT_HOST_CONCURRENCY,
+    ) -> None:
+        self._transport = transport
+        self._policies = host_policies() if policies is None else policies
+        self._default_concurrency = default_concurrency
+        self._gates: Dict[str, _HostGate] = {}
+
+    def _policy_key(self, host: str) -> Optional[str]:
+        for key in self._policies:
+            if host == key or host.endswith("." + key):
+                return key
+        return None
+
+    def _gate(self, host: str) -> _HostGate:
+        """The gate of *host*; subdomains share the gate of their policy's domain."""
+        key = self._policy_key(host)
+        gate = self._gates.get(key or host)
+        if gate is None:
+            concurrency, interval = self._policies[key] if key else (self._default_concurrency, 0.0)
+            gate = self._gates[key or host] = _HostGate(concurrency, interval)
+        return gate
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host.lower()
+        gate = self._gate(host)
+        t0 = time.monotonic()
+        await gate.slots.acquire()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                gate.slots.release()
+
+        try:
+            if gate.min_interval_s:
+                async with gate.lock:
+                    wait = gate.next_start - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    gate.next_start = time.monotonic() + gate.min_interval_s
+            waited = time.monotonic() - t0
+
+            outer_trace = request.extensions.get("trace")
+            new_connection = False
+
+            async def trace(event: str, info: Dict[str, Any]) -> None:
+                nonlocal new_connection
+                if event == "connection.connect_tcp.complete":
+                    new_connection = True
+                if outer_trace is not None:
+                    await outer_trace(event, info)
+
+            request.extensions["trace"] = trace
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        http2 = response.extensions.get("http_version") == b"HTTP/2"
+        _bump(host, requests=1, new_connections=int(new_connection), http2_requests=int(http2), politeness_wait_s=waited)
+        record_metric("http", "requests")
+        if new_connection:
+            record_metric("http", "new_connections")
+        if waited >= 0.001:
+            record_metric("http", "politeness_wait_ms", round(waited * 1000, 1))
+        if response.is_closed:  # body already read by the transport
+            release()
+        else:
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_enabled() -> bool:
+    return _H2_AVAILABLE and os.getenv("AGENT_HTTP2", "1").strip().lower() not in ("0", "false", "no")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the per-event-loop shared AsyncClient for all outbound agent requests.
+
+    Redirects are followed and requests carry a browser User-Agent unless
+    they set their own.  Pass ``timeout=`` per request to tighten the default.
+    """
+    loop_id = id(asyncio.get_running_loop())
+    client = _clients_by_loop.get(loop_id)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30)
+        transport = PoliteTransport(httpx.AsyncHTTPTransport(http2=_http2_enabled(), limits=limits))
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=20,
+            follow_redirects=True,
+            headers={"User-Agent": BROWSER_UA},
+        )
+        _clients_by_loop[loop_id] = client
+    return client
+
+
+def connection_stats() -> Dict[str, Any]:
+    """Per-host request counts, connection reuse and politeness waits since process start."""
+    with _stats_lock:
+        hosts = {
+            host: {
+                "requests": int(s["requests"]),
+                "new_connections": int(s["new_connections"]),
+                "reuse_rate": round(1 - s["new_connections"] / s["requests"], 3) if s["requests"] else 0.0,
+                "http2_requests": int(s["http2_requests"]),
+                "politeness_wait_s": round(s["politeness_wait_s"], 3),
+            }
+            for host, s in sorted(_stats.items())
+        }
+    return {"http2": _http2_enabled(), "policies": host_policies(), "hosts": hosts}
@@ -3,22 +3,17 @@
 import asyncio
 import logging
 from typing import Any, Callable, Dict, List, Optional, Tuple
-from urllib.parse import urlparse, quote
-
-import httpx
+from urllib.parse import quote, urlparse
 
 from .ballotpedia import lookup_candidate_image as _ballotpedia_lookup
+from .cassette import recorded
+from .http_client import get_http_client
 from .utils import make_logger
 
 logger = logging.getLogger("pipeline")
 
 _IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".svg"})
 
-_BROWSER_UA = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
-)
-
 
 def _is_valid_image_url(url: Any) -> bool:
     """Return True only if the URL looks like a direct image file, not a web page.
@@ -48,9 +43,7 @@ def _is_valid_image_url(url: Any) -> bool:
             return True
 
         # Common image CDNs
-        if any(host in netloc for host in (
-            "cloudfront.net", "githubusercontent.com", "twimg.com", "fbcdn.net"
-        )):
+        if any(host in netloc for host in ("cloudfront.net", "githubusercontent.com", "twimg.com", "fbcdn.net")):
             return True
 
     except Exception:
@@ -58,6 +51,7 @@ def _is_valid_image_url(url: Any) -> bool:
     return False
 
 
+@recorded("image_check", decode=tuple)
 async def _check_url_accessible(url: str) -> Tuple[bool, str]:
     """Check whether a URL is accessible, returning (accessible, final_url).
 
@@ -65,24 +59,24 @@ async def _check_url_accessible(url: str) -> Tuple[bool, str]:
     — useful for resolving Wikimedia Special:FilePath redirects to upload URLs.
 
     Strategy:
-    1. HEAD with browser UA — fast, most servers support it.
+    1. HEAD (the shared client sends a browser UA) — fast, most servers support it.
     2. If HEAD returns 405/501, fall back to byte-range GET.
     """
-    headers = {"User-Agent": _BROWSER_UA}
     try:
-        async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
-            resp = await client.head(url, headers=headers)
-            final_url = str(resp.url)
-            if resp.status_code < 400:
-                return True, final_url
-            if resp.status_code in (405, 501):
-                resp2 = await client.get(url, headers={**headers, "Range": "bytes=0-0"})
-                return resp2.status_code in (200, 206), str(resp2.url)
-            return False, url
+        client = get_http_client()
+        resp = await client.head(url, timeout=10)
+        final_url = str(resp.url)
+        if resp.status_code < 400:
+            return True, final_url
+        if resp.status_code in (405, 501):
+            resp2 = await client.get(url, headers={"Range": "bytes=0-0"}, timeout=10)
+            return resp2.status_code in (200, 206), str(resp2.url)
+        return False, url
     except Exception:
         return False, url
 
 
+@recorded("wikipedia_image")
 async def _lookup_wikipedia_image(candidate_name: str, context: str = "") -> Optional[str]:
     """Query the Wikipedia API to get a candidate's headshot URL.
 
@@ -94,54 +88,54 @@ async def _lookup_wikipedia_image(candidate_name: str, context: str = "") -> Opt
     can be disambiguated when the bare-name search returns no thumbnail.
     """
     try:
-        async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
-
-            async def _search_and_fetch(query: str) -> Optional[str]:
-                search_resp = await client.get(
+        client = get_http_client()
+
+        async def _search_and_fetch(query: str) -> Optional[str]:
+            search_resp = await client.get(
+                "https://en.wikipedia.org/w/api.php",
+                params={
+                    "action": "opensearch",
+                    "search": query,
+                    "limit": "3",
+                    "format": "json",
+                },
+                timeout=10,
+            )
+            search_resp.raise_for_status()
+            search_data = search_resp.json()
+            titles = search_data[1] if len(search_data) > 1 else []
+            for title in titles:
+                img_resp = await client.get(
                     "https://en.wikipedia.org/w/api.php",
                     params={
-                        "action": "opensearch",
-                        "search": query,
-                        "limit": "3",
+                        "action": "query",
+                        "titles": title,
+                        "prop": "pageimages",
+                        "pithumbsize": "400",
                         "format": "json",
+                        "redirects": "1",
                     },
-                    headers={"User-Agent": _BROWSER_UA},
+                    timeout=10,
                 )
-                search_resp.raise_for_status()
-                search_data = search_resp.json()
-                titles = search_data[1] if len(search_data) > 1 else []
-                for title in titles:
-                    img_resp = await client.get(
-                        "https://en.wikipedia.org/w/api.php",
-                        params={
-                            "action": "query",
-                            "titles": title,
-                            "prop": "pageimages",
-                            "pithumbsize": "400",
-                            "format": "json",
-                            "redirects": "1",
-                        },
-                        headers={"User-Agent": _BROWSER_UA},
-                    )
-                    img_resp.raise_for_status()
-                    data = img_resp.json()
-                    for page in data.get("query", {}).get("pages", {}).values():
-                        thumb = page.get("thumbnail", {}).get("source", "")
-                        if thumb and "upload.wikimedia.org" in thumb:
-                            return thumb
-                return None
-
-            # First pass: bare name search
-            result = await _search_and_fetch(candidate_name)
+                img_resp.raise_for_status()
+                data = img_resp.json()
+                for page in data.get("query", {}).get("pages", {}).values():
+                    thumb = page.get("thumbnail", {}).get("source", "")
+                    if thumb and "upload.wikimedia.org" in thumb:
+                        return thumb
+            return None
+
+        # First pass: bare name search
+        result = await _search_and_fetch(candidate_name)
+        if result:
+            return result
+
+        # Second pass: name + context to disambiguate (e.g. common names)
+        if context:
+            result = await _search_and_fetch(f"{candidate_name} {context}")
             if result:
                 return result
 
-            # Second pass: name + context to disambiguate (e.g. common names)
-            if context:
-                result = await _search_and_fetch(f"{candidate_name} {context}")
-                if result:
-                    return result
-
     except Exception:
         pass
     return None
@@ -263,6 +257,7 @@ async def _resolve_single_image(
 
     # Ask the agent to find a working image URL
     from .prompts import IMAGE_SEARCH_SYSTEM, IMAGE_SEARCH_USER
+
     log("info", f"  [{name}] Running agent image search...")
     try:
         result = await agent_loop_fn(
@@ -0,0 +1,226 @@
+"""Tolerant JSON parsing for model output.
+
+Models answering in JSON make a handful of recurring slips that ``json.loads``
+rejects, and each one used to cost an extra "your response was not valid
+JSON" round trip.  ``repair_json`` rewrites the text into valid JSON in one
+left-to-right pass and reports which repairs it applied:
+
+* ``python_literal``   — ``None`` / ``True`` / ``False`` outside strings
+* ``trailing_comma``   — ``,`` right before ``}`` or ``]`` (also doubled commas)
+* ``missing_comma``    — two members or elements with no comma between them
+* ``control_char``     — raw newlines / tabs inside strings
+* ``invalid_escape``   — backslash escapes JSON does not know (``\\'``)
+* ``unescaped_quote``  — a ``"`` inside a string that is not followed by
+  ``,`` ``:`` ``}`` ``]`` or a new line (e.g. ``"He said "no" twice"``)
+* ``truncated``        — output that stops mid-way: the incomplete trailing
+  member (and any container it leaves empty) is dropped and open containers
+  are closed, leaving the longest prefix of complete members
+
+Text before the first ``{`` / ``[`` and after the value closes is ignored,
+except that an array followed by an object (``Based on [1] and [2]: {...}``)
+is taken for prose and the object is returned.  Anything else malformed
+raises ``json.JSONDecodeError``.
+"""
+
+import json
+import re
+from typing import Any, List, Tuple
+
+_WHITESPACE = " \t\r\n"
+_STRING_RUN = re.compile(r'[^"\\\x00-\x1f]+')
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_WORD = re.compile(r"[A-Za-z_]+")
+_LITERALS = {"true": "true", "false": "false", "null": "null", "True": "true", "False": "false", "None": "null"}
+_VALID_ESCAPES = frozenset('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+# After a closing quote the next character (past whitespace) must be one of these
+_AFTER_STRING = frozenset(",:}]")
+
+# Parser states within a container
+_KEY, _COLON, _VALUE, _NEXT = "key", "colon", "value", "next"
+
+
+def _scan_string(text: str, i: int, repairs: List[str]) -> Tuple[str, int, bool]:
+    """Read the string starting at the quote ``text[i]``.
+
+    Returns ``(JSON string literal, index past it, complete)``; *complete* is
+    False when the text ends inside the string.
+    """
+    n = len(text)
+    parts = ['"']
+    j = i + 1
+    while j < n:
+        run = _STRING_RUN.match(text, j)
+        if run:
+            parts.append(run.group())
+            j = run.end()
+            if j >= n:
+                break
+        ch = text[j]
+        if ch == '"':
+            k = j + 1
+            while k < n and text[k] in _WHITESPACE:
+                k += 1
+            # A quote on the next line starts the next member (missing comma), not more string
+            next_member = k < n and text[k] == '"' and "\n" in text[j + 1 : k]
+            if k < n and text[k] not in _AFTER_STRING and not next_member:
+                repairs.append("unescaped_quote")
+                parts.append('\\"')
+                j += 1
+                continue
+            parts.append('"')
+            return "".join(parts), j + 1, True
+        if ch == "\\":
+            if j + 1 >= n:
+                break
+            nxt = text[j + 1]
+            if nxt in _VALID_ESCAPES:
+                parts.append(text[j : j + 2])
+            else:
+                repairs.append("invalid_escape")
+                parts.append(json.dumps(nxt)[1:-1])
+            j += 2
+            continue
+        # Raw control character
+        repairs.append("control_char")
+        parts.append(_CONTROL_ESCAPES.get(ch, f"\\u{ord(ch):04x}"))
+        j += 1
+    return "".join(parts), n, False
+
+
+def repair_json(text: str) -> Tuple[Any, List[str]]:
+    """Parse the first JSON object or array in *text*, repairing common slips.
+
+    Returns ``(value, repairs)`` where *repairs* lists the kinds of repair
+    applied, in order of first use (empty when the value needed none).
+    """
+    starts = [pos for pos in (text.find("{"), text.find("[")) if pos != -1]
+    if not starts:
+        return json.loads(text), []
+    error: json.JSONDecodeError | None = None
+    for start in sorted(starts):
+        try:
+            value, repairs, end = _repair_from(text, start)
+        except json.JSONDecodeError as exc:
+            error = error or exc
+            continue
+        if isinstance(value, list):
+            # Citations like ``[1]`` in the prose before an object are not the answer
+            later = text.find("{", end)
+            if later != -1:
+                try:
+                    return _repair_from(text, later)[:2]
+                except json.JSONDecodeError:
+                    pass
+        return value, repairs
+    raise error
+
+
+def _repair_from(text: str, start: int) -> Tuple[Any, List[str], int]:
+    """Parse the value starting at ``text[start]``; returns ``(value, repairs, index past it)``."""
+    n = len(text)
+    repairs: List[str] = []
+    out: List[str] = []
+    # One frame per open container: [closer, state, safe, opened]; *safe* is
+    # the length of ``out`` after the container's last complete member,
+    # *opened* its length right after the opening bracket.
+    stack: List[List[Any]] = []
+    i = start
+
+    def value_done() -> None:
+        if stack:
+            stack[-1][1] = _NEXT
+            stack[-1][2] = len(out)
+
+    while i < n:
+        ch = text[i]
+        if ch in _WHITESPACE:
+            i += 1
+            continue
+        if not stack and out:
+            break  # the top-level value is complete; ignore trailing text
+        frame = stack[-1] if stack else None
+        state = frame[1] if frame else _VALUE
+
+        if ch in "}]":
+            if frame is None or ch != frame[0] or state == _COLON or (state == _VALUE and ch == "}"):
+                raise json.JSONDecodeError(f"Unexpected {ch!r}", text, i)
+            if out[-1] == ",":
+                repairs.append("trailing_comma")
+                out.pop()
+            out.append(ch)
+            stack.pop()
+            value_done()
+            i += 1
+            continue
+        if ch == ",":
+            if state == _NEXT:
+                out.append(",")
+                frame[1] = _KEY if frame[0] == "}" else _VALUE
+            elif frame is not None and out[-1] == ",":
+                repairs.append("trailing_comma")  # doubled comma
+            else:
+                raise json.JSONDecodeError("Unexpected ','", text, i)
+            i += 1
+            continue
+        if ch == ":":
+            if state != _COLON:
+                raise json.JSONDecodeError("Unexpected ':'", text, i)
+            out.append(":")
+            frame[1] = _VALUE
+            i += 1
+            continue
+
+        # A key or a value starts here
+        if state == _NEXT:
+            repairs.append("missing_comma")
+            out.append(",")
+            state = frame[1] = _KEY if frame[0] == "}" else _VALUE
+        if state == _COLON:
+            raise json.JSONDecodeError("Expected ':'", text, i)
+        if state == _KEY and ch != '"':
+            raise json.JSONDecodeError("Expected a quoted key", text, i)
+
+        if ch == '"':
+            literal, i, complete = _scan_string(text, i, repairs)
+            if not complete:
+                break
+            out.append(literal)
+            if state == _KEY:
+                frame[1] = _COLON
+            else:
+                value_done()
+            continue
+        if ch in "{[":
+            out.append(ch)
+            stack.append(["}" if ch == "{" else "]", _KEY if ch == "{" else _VALUE, len(out), len(out)])
+            i += 1
+            continue
+        match = _NUMBER.match(text, i) or _WORD.match(text, i)
+        if match is None:
+            raise json.JSONDecodeError(f"Unexpected {ch!r}", text, i)
+        if match.end() >= n:
+            i = n  # possibly cut off mid-token
+            break
+        token = match.group()
+        if token[0].isalpha() or token[0] == "_":
+            if token not in _LITERALS:
+                raise json.JSONDecodeError(f"Unexpected word {token!r}", text, i)
+            if token != _LITERALS[token]:
+                repairs.append("python_literal")
+            token = _LITERALS[token]
+        out.append(token)
+        value_done()
+        i = match.end()
+
+    if stack:
+        repairs.append("truncated")
+        # Drop the incomplete trailing member; a nested container left with
+        # no complete member is dropped from its parent as well.
+        while len(stack) > 1 and stack[-1][2] == stack[-1][3]:
+            stack.pop()
+        if len(stack) == 1 and stack[0][2] == stack[0][3]:
+            raise json.JSONDecodeError("Truncated before the first complete member", text, n)
+        del out[stack[-1][2] :]
+        out.extend(frame[0] for frame in reversed(stack))
+    return json.loads("".join(out)), list(dict.fromkeys(repairs)), i
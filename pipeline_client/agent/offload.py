@@ -0,0 +1,123 @@
+"""Shared CPU-offload executor for parsing work.
+
+Page text extraction, Ballotpedia page parsing and JSON extraction from
+large model outputs are pure CPU work.  Run on the asyncio loop they also
+stall the FastAPI backend that shares it (a 2 MB page freezes ``/ws/logs``
+for every connected dashboard).  ``run_cpu(fn, *args)`` runs them on one
+process-wide executor instead:
+
+* ``CPU_OFFLOAD_MODE`` — ``thread`` (default), ``process`` (sidesteps the
+  GIL; *fn* and its arguments must be picklable, i.e. module-level
+  functions) or ``inline`` (no offload, e.g. for debugging).
+* ``CPU_OFFLOAD_WORKERS`` — pool size (default: CPU count, at most 4).
+
+Inputs under ``min_size`` run inline, where handing them to a worker would
+cost more than the work itself.
+
+Every call is timed where it ran, so the process-wide per-function histogram
+(``timing_histograms()``, served at ``GET /pipeline/offload``) shows how
+much work was moved off the loop.  Per run, ``agent_metrics["offload"]``
+adds up the offloaded milliseconds by function.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .cost import record_metric
+
+logger = logging.getLogger("pipeline")
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+# Inputs smaller than this (chars) are parsed inline by callers passing ``min_size``
+OFFLOAD_MIN_CHARS = 32 * 1024
+
+_executor: Optional[Executor] = None
+_executor_mode: Optional[str] = None  # None until the first call reads the environment
+_executor_lock = threading.Lock()
+_histograms: Dict[str, Dict[str, Any]] = {}
+_histograms_lock = threading.Lock()
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Run *fn* in the worker and return its result with the time it took there."""
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def get_cpu_executor() -> Tuple[Optional[Executor], str]:
+    """The shared executor and its mode, created on first use from the environment."""
+    global _executor, _executor_mode
+    with _executor_lock:
+        if _executor_mode is None:
+            mode = os.getenv("CPU_OFFLOAD_MODE", "thread").strip().lower()
+            workers = int(os.getenv("CPU_OFFLOAD_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+            if mode == "process":
+                _executor = ProcessPoolExecutor(max_workers=workers)
+            elif mode != "inline":
+                mode = "thread"
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu-offload")
+            _executor_mode = mode
+            logger.info(f"CPU offload: {mode} ({workers} workers)" if _executor else "CPU offload: inline")
+        return _executor, _executor_mode
+
+
+def shutdown_cpu_executor() -> None:
+    """Shut the executor down; the next ``run_cpu`` re-reads the environment."""
+    global _executor, _executor_mode
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor, _executor_mode = None, None
+
+
+def _observe(name: str, seconds: float, offloaded: bool) -> None:
+    ms = seconds * 1000
+    with _histograms_lock:
+        hist = _histograms.setdefault(
+            name, {"count": 0, "offloaded": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(_BUCKETS_MS) + 1)}
+        )
+        hist["count"] += 1
+        hist["offloaded"] += int(offloaded)
+        hist["total_ms"] += ms
+        hist["max_ms"] = max(hist["max_ms"], ms)
+        hist["buckets"][next((i for i, bound in enumerate(_BUCKETS_MS) if ms <= bound), len(_BUCKETS_MS))] += 1
+    if offloaded:
+        record_metric("offload", f"{name}_ms", round(ms, 2))
+        record_metric("offload", f"{name}_calls")
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any, min_size: Optional[int] = None) -> Any:
+    """``fn(*args)`` on the shared CPU executor (inline when *min_size* < ``OFFLOAD_MIN_CHARS``)."""
+    name = getattr(fn, "__name__", repr(fn))
+    executor, _ = get_cpu_executor()
+    if executor is None or (min_size is not None and min_size < OFFLOAD_MIN_CHARS):
+        result, elapsed = _timed(fn, *args)
+        _observe(name, elapsed, offloaded=False)
+        return result
+    result, elapsed = await asyncio.get_running_loop().run_in_executor(executor, _timed, fn, *args)
+    _observe(name, elapsed, offloaded=True)
+    return result
+
+
+def timing_histograms() -> Dict[str, Any]:
+    """Per-function call counts, time totals and latency buckets since process start."""
+    labels = [f"<={bound}ms" for bound in _BUCKETS_MS] + [f">{_BUCKETS_MS[-1]}ms"]
+    with _histograms_lock:
+        functions = {
+            name: {
+                "count": h["count"],
+                "offloaded": h["offloaded"],
+                "total_ms": round(h["total_ms"], 2),
+                "max_ms": round(h["max_ms"], 2),
+                "buckets": dict(zip(labels, h["buckets"])),
+            }
+            for name, h in _histograms.items()
+        }
+    return {"mode": _executor_mode, "functions": functions}
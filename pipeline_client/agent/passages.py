@@ -0,0 +1,139 @@
+"""Query-relevant passage selection for fetched pages.
+
+A campaign site's page text usually starts with navigation, donation asks
+and sign-up forms; the issue text the model fetched the page for can sit
+past any head-truncation limit.  When ``fetch_page`` is called with a
+``focus`` (e.g. the issue a sub-agent researches), ``select_passages`` splits
+the page into passages, ranks them against the focus with BM25 and returns
+the best ones, in page order, up to a token budget.  ``[...]`` marks where
+text was dropped.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Tuple
+
+# BM25 parameters (the usual defaults)
+_K1 = 1.5
+_B = 0.75
+# Passages are built from the extractor's blocks, split or merged toward this size
+_MAX_PASSAGE_CHARS = 1200
+_MIN_PASSAGE_CHARS = 200
+# A short first passage (usually the page title / heading) is always kept for context
+_LEAD_MAX_CHARS = 300
+_GAP = "[...]"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their this to was were will "
+    "with about his her they them".split()
+)
+
+
+def _terms(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _lines(block: str) -> List[str]:
+    """Lines of *block*, with lines over ``_MAX_PASSAGE_CHARS`` cut at word boundaries."""
+    lines: List[str] = []
+    for line in block.split("\n"):
+        while len(line) > _MAX_PASSAGE_CHARS:
+            cut = line.rfind(" ", 0, _MAX_PASSAGE_CHARS)
+            cut = cut if cut > 0 else _MAX_PASSAGE_CHARS
+            lines.append(line[:cut])
+            line = line[cut:].lstrip()
+        lines.append(line)
+    return lines
+
+
+def split_passages(text: str) -> List[str]:
+    """Split page text into passages: blank-line separated blocks, long ones cut at line breaks, tiny ones merged.
+
+    The first block (usually the page title) is never merged with the next.
+    """
+    passages: List[str] = []
+    for block in re.split(r"\n\s*\n", text):
+        current = ""
+        for line in _lines(block):
+            if current and len(current) + len(line) + 1 > _MAX_PASSAGE_CHARS:
+                passages.append(current)
+                current = ""
+            current = f"{current}\n{line}" if current else line
+        if current.strip():
+            passages.append(current)
+
+    # The first passage (title / heading) stays separate so it can be kept as the lead
+    merged: List[str] = passages[:1]
+    for passage in passages[1:]:
+        if len(merged) > 1 and len(merged[-1]) < _MIN_PASSAGE_CHARS and len(merged[-1]) + len(passage) <= _MAX_PASSAGE_CHARS:
+            merged[-1] = f"{merged[-1]}\n{passage}"
+        else:
+            merged.append(passage)
+    return merged
+
+
+def _bm25_scores(passages: List[str], query: List[str]) -> List[float]:
+    docs = [Counter(_terms(p)) for p in passages]
+    lengths = [sum(d.values()) for d in docs]
+    avg_len = (sum(lengths) / len(lengths)) or 1.0
+    n = len(docs)
+    idf = {}
+    for term in set(query):
+        df = sum(1 for d in docs if term in d)
+        idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    scores = []
+    for doc, length in zip(docs, lengths):
+        score = 0.0
+        for term, weight in idf.items():
+            tf = doc.get(term, 0)
+            if tf:
+                score += weight * tf * (_K1 + 1) / (tf + _K1 * (1 - _B + _B * length / avg_len))
+        scores.append(score)
+    return scores
+
+
+def select_passages(text: str, focus: str, max_tokens: int) -> Tuple[str, int]:
+    """The passages of *text* most relevant to *focus*, in page order, within *max_tokens* (chars / 4).
+
+    Returns ``(selected text, characters dropped)``.  Text that already fits
+    is returned unchanged; when no passage mentions the focus at all, the
+    head of the page is kept instead.
+    """
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text, 0
+    passages = split_passages(text)
+    query = _terms(focus)
+    scores = _bm25_scores(passages, query) if query else [0.0] * len(passages)
+
+    chosen = set()
+    used = 0
+    if passages and len(passages[0]) <= _LEAD_MAX_CHARS:
+        chosen.add(0)
+        used += len(passages[0])
+    relevant = any(scores)
+    ranked = sorted(range(len(passages)), key=lambda i: (-scores[i], i)) if relevant else range(len(passages))
+    for i in ranked:
+        if i in chosen or (relevant and scores[i] <= 0):
+            continue
+        cost = len(passages[i]) + len(_GAP) + 2
+        if used + cost > max_chars:
+            if not relevant:
+                break  # head of the page only
+            continue
+        chosen.add(i)
+        used += cost
+
+    parts: List[str] = []
+    previous = -1
+    for i in sorted(chosen):
+        if i != previous + 1:
+            parts.append(_GAP)
+        parts.append(passages[i])
+        previous = i
+    if previous != len(passages) - 1:
+        parts.append(_GAP)
+    selected = "\n\n".join(parts)
+    return selected, max(0, len(text) - sum(len(passages[i]) for i in chosen))
@@ -0,0 +1,121 @@
+"""Phase dependency graph for research runs.
+
+After discovery the remaining phases only depend on the roster and on each
+other's outputs, not on a fixed order.  Each ``Phase`` declares the parts of
+``race_json`` it reads (*inputs*) and writes (*outputs*); ``run_phase_graph``
+derives the edges from those declarations and starts every phase as soon as
+the phases producing its inputs have finished.  Images, issues and finance
+therefore run concurrently, and refinement waits for all three.
+
+Inputs that no phase in the graph produces (e.g. ``"roster"`` from discovery)
+are treated as already available.  Disabled phases are reported as skipped
+and their outputs are considered available as they stand.  ``step_tracker``
+still sees ``start`` / ``complete`` / ``skip`` for every step.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Set, Tuple
+
+
+@dataclass(frozen=True)
+class Phase:
+    """One schedulable step of a run (``name`` is a ``PipelineStep`` value)."""
+
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    skip_message: str = ""
+
+
+def phase_dependencies(phases: Sequence[Phase]) -> Dict[str, Set[str]]:
+    """Map each phase name to the names of the phases producing its inputs.
+
+    Raises ``ValueError`` on duplicate names, on an output declared by two
+    phases, or on a dependency cycle.
+    """
+    producers: Dict[str, str] = {}
+    names: Set[str] = set()
+    for phase in phases:
+        if phase.name in names:
+            raise ValueError(f"Duplicate phase {phase.name!r}")
+        names.add(phase.name)
+        for output in phase.outputs:
+            if output in producers:
+                raise ValueError(f"Output {output!r} produced by both {producers[output]!r} and {phase.name!r}")
+            producers[output] = phase.name
+
+    deps = {
+        phase.name: {producers[i] for i in phase.inputs if i in producers and producers[i] != phase.name} for phase in phases
+    }
+
+    # Kahn's algorithm — only to reject cycles up front.
+    remaining = {name: set(d) for name, d in deps.items()}
+    while remaining:
+        ready = [name for name, d in remaining.items() if not d]
+        if not ready:
+            raise ValueError(f"Phase dependency cycle among: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for d in remaining.values():
+            d.difference_update(ready)
+    return deps
+
+
+async def run_phase_graph(
+    phases: Sequence[Phase],
+    *,
+    step_enabled: Callable[[str], bool],
+    track: Callable[..., None],
+    log: Callable[[str, str], None],
+) -> None:
+    """Run *phases*, starting each one once its dependencies are done.
+
+    The first phase to raise cancels the phases still running and the
+    exception propagates (phases that should tolerate failure catch their own
+    errors, as the finance phase does).
+    """
+    deps = phase_dependencies(phases)
+    pending: Dict[str, Phase] = {phase.name: phase for phase in phases}
+    done: Set[str] = set()
+    running: Dict[asyncio.Task, Tuple[str, float]] = {}
+
+    while pending or running:
+        # Start (or skip) everything that is ready; skipping can unblock more phases.
+        progressed = True
+        while progressed:
+            progressed = False
+            for name, phase in list(pending.items()):
+                if not deps[name] <= done:
+                    continue
+                del pending[name]
+                progressed = True
+                if not step_enabled(name):
+                    if phase.skip_message:
+                        log("info", phase.skip_message)
+                    track("skip", name)
+                    done.add(name)
+                    continue
+                track("start", name)
+                running[asyncio.ensure_future(phase.run())] = (name, time.perf_counter())
+
+        if not running:
+            break
+
+        finished, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+        failed: List[BaseException] = []
+        for task in finished:
+            name, t0 = running.pop(task)
+            if task.cancelled() or task.exception() is not None:
+                failed.append(task.exception() if not task.cancelled() else asyncio.CancelledError())
+                continue
+            track("complete", name, duration_ms=int((time.perf_counter() - t0) * 1000))
+            done.add(name)
+
+        if failed:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise failed[0]
@@ -0,0 +1,162 @@
+"""Speculative prefetch of top search results into the page cache.
+
+The model almost always follows a ``web_search`` with ``fetch_page`` on one
+of the first few results, but that fetch only starts after another LLM round
+trip.  With prefetching enabled (``run_agent(prefetch=True)`` or
+``PAGE_PREFETCH=1``), the top ``PAGE_PREFETCH_TOP_N`` eligible result URLs of
+every search start downloading in the background as soon as the search
+returns.  A later ``fetch_page`` then hits the warm page cache, or joins the
+still-running download through the single-flight group.
+
+Prefetches are bounded (``PAGE_PREFETCH_CONCURRENCY`` at once, one request
+per host at a time and at most one every ``per_host_interval_s`` seconds) and
+skip hosts that never yield page text (social networks) and binary
+documents.  Per run the ``agent_metrics["prefetch"]`` block reports how many
+URLs were prefetched, how many the model then asked for (``hits`` /
+``hit_rate``) and the bytes downloaded for pages it never read
+(``wasted_bytes``).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+from .cost import record_metric
+
+logger = logging.getLogger("pipeline")
+
+# Login walls / video hosts: fetching them never yields useful page text.
+DEFAULT_SKIPPED_HOSTS = (
+    "facebook.com",
+    "instagram.com",
+    "twitter.com",
+    "x.com",
+    "linkedin.com",
+    "youtube.com",
+    "tiktok.com",
+)
+_SKIPPED_EXTENSIONS = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".zip", ".mp4", ".mp3")
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+class Prefetcher:
+    """Background page prefetches for one run.
+
+    *fetch* downloads a URL into the page cache and returns the page text, or
+    None when nothing was downloaded (e.g. the page was already cached).
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Optional[str]]],
+        *,
+        top_n: int = 3,
+        concurrency: int = 4,
+        per_host_interval_s: float = 1.0,
+        skipped_hosts: Iterable[str] = DEFAULT_SKIPPED_HOSTS,
+    ) -> None:
+        self._fetch = fetch
+        self.top_n = top_n
+        self.per_host_interval_s = per_host_interval_s
+        self.skipped_hosts = tuple(skipped_hosts)
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_last_start: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._bytes: Dict[str, int] = {}
+        self._claimed: Set[str] = set()
+
+    @classmethod
+    def from_env(cls, fetch: Callable[[str], Awaitable[Optional[str]]]) -> "Prefetcher":
+        return cls(
+            fetch,
+            top_n=int(os.getenv("PAGE_PREFETCH_TOP_N", "3")),
+            concurrency=int(os.getenv("PAGE_PREFETCH_CONCURRENCY", "4")),
+        )
+
+    def eligible(self, url: str) -> bool:
+        if not url.startswith(("http://", "https://")):
+            return False
+        host = _host(url)
+        if not host or any(host == h or host.endswith("." + h) for h in self.skipped_hosts):
+            return False
+        return not urlparse(url).path.lower().endswith(_SKIPPED_EXTENSIONS)
+
+    def schedule(self, results: List[Dict[str, Any]]) -> List[str]:
+        """Start prefetching the top eligible URLs of a search's *results*; returns the URLs scheduled."""
+        urls: List[str] = []
+        for result in results:
+            if len(urls) >= self.top_n:
+                break
+            url = result.get("url") if isinstance(result, dict) else None
+            if url and url not in urls and self.eligible(url):
+                urls.append(url)
+        scheduled = [url for url in urls if url not in self._tasks]
+        for url in scheduled:
+            self._tasks[url] = asyncio.ensure_future(self._prefetch(url))
+        if scheduled:
+            record_metric("prefetch", "scheduled", len(scheduled))
+        return scheduled
+
+    def claim(self, url: str) -> bool:
+        """Note that the model fetched *url*; True when a prefetch downloaded it or is still downloading it.
+
+        Prefetches that failed or found the page already cached are not hits.
+        """
+        task = self._tasks.get(url)
+        if task is None or url in self._claimed or (task.done() and url not in self._bytes):
+            return False
+        self._claimed.add(url)
+        record_metric("prefetch", "hits")
+        return True
+
+    async def _prefetch(self, url: str) -> None:
+        host = _host(url)
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        try:
+            async with self._slots, lock:
+                wait = self._host_last_start.get(host, float("-inf")) + self.per_host_interval_s - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._host_last_start[host] = time.monotonic()
+                text = await self._fetch(url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.debug(f"Prefetch failed for {url[:80]}: {exc}")
+            return
+        if text is None:
+            record_metric("prefetch", "already_cached")
+        elif not text.startswith("[Failed to fetch"):
+            self._bytes[url] = len(text.encode("utf-8"))
+            record_metric("prefetch", "fetched")
+            record_metric("prefetch", "fetched_bytes", self._bytes[url])
+
+    async def close(self) -> Dict[str, Any]:
+        """Cancel outstanding prefetches and record the run's hit rate and wasted bytes."""
+        pending = [t for t in self._tasks.values() if not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        wasted = sum(size for url, size in self._bytes.items() if url not in self._claimed)
+        hit_rate = round(len(self._claimed) / len(self._tasks), 3) if self._tasks else 0.0
+        record_metric("prefetch", "wasted_bytes", wasted)
+        record_metric("prefetch", "cancelled", len(pending))
+        record_metric("prefetch", "hit_rate", hit_rate)
+        return {"scheduled": len(self._tasks), "hits": len(self._claimed), "hit_rate": hit_rate, "wasted_bytes": wasted}
+
+
+_prefetch_ctx: ContextVar[Optional[Prefetcher]] = ContextVar("_prefetch_ctx", default=None)
+
+
+def get_prefetcher() -> Optional[Prefetcher]:
+    """The active run's prefetcher, or None when prefetching is off."""
+    return _prefetch_ctx.get()
@@ -547,17 +547,20 @@ for each candidate. Include whichever of these you found:
 Aim for 4-8 high-quality links per candidate. Do NOT include low-quality
 or duplicate links.
 
-Return JSON keyed by candidate name:
+Return JSON with one entry per candidate, using the exact names listed above:
 {{
-  "<Candidate Name>": {{
-    "donor_summary": "<2-3 sentence summary of campaign finance>",
-    "donor_source_url": "<best URL for full donor data, e.g. OpenSecrets page or state portal>",
-    "voting_summary": "<2-3 sentence summary of voting patterns>",
-    "voting_source_url": "<best URL for full voting record — prefer VoteSmart > GovTrack > legislature>",
-    "links": [
-      {{"url": "<url>", "title": "<page title>", "type": "ballotpedia|wiki|finance|official|legislature|votesmart|govtrack|news|other"}}
-    ]
-  }}
+  "candidates": [
+    {{
+      "name": "<Candidate Name>",
+      "donor_summary": "<2-3 sentence summary of campaign finance>",
+      "donor_source_url": "<best URL for full donor data, e.g. OpenSecrets page or state portal>",
+      "voting_summary": "<2-3 sentence summary of voting patterns>",
+      "voting_source_url": "<best URL for full voting record — prefer VoteSmart > GovTrack > legislature>",
+      "links": [
+        {{"url": "<url>", "title": "<page title>", "type": "ballotpedia|wiki|finance|official|legislature|votesmart|govtrack|news|other"}}
+      ]
+    }}
+  ]
 }}"""
 
 # ------------------------------------------------------------------
@@ -761,6 +764,7 @@ Source prioritization:
 - Start with official campaign pages when available (especially issue/policy URLs above).
 - If a known issue URL appears relevant, fetch it directly before broader web searches.
 - Prefer sources that directly substantiate the stance for this issue.
+- Call fetch_page with focus="{issue}" so long pages return the passages about this issue.
 
 Then use the set_issue_stance tool to record:
 - stance: 1-2 sentence factual description of their position
@@ -803,6 +807,7 @@ since {last_updated}. Focus on:
 Source prioritization:
 - Start with official campaign pages when available (especially issue/policy URLs above).
 - If a known issue URL appears relevant, fetch it directly before broader web searches.
+- Call fetch_page with focus="{issue}" so long pages return the passages about this issue.
 
 Use set_issue_stance ONLY if you find genuinely new or better data.
 If the existing stance is already accurate and well-sourced, reply with
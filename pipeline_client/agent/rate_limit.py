@@ -0,0 +1,248 @@
+"""Shared OpenAI rate limiter (requests-per-minute + tokens-per-minute).
+
+One ``ModelRateLimiter`` exists per (event loop, model); the registry holds
+loops weakly, so limiters go away with their loop.  Every
+``_call_openai`` invocation for that model acquires from it before sending a
+request, so concurrent sub-agents share a single view of the account limits
+instead of discovering them independently through 429s.
+
+Two token buckets are kept per model:
+
+* **requests** – capacity = RPM, refilled at RPM / 60 per second.
+* **tokens** – capacity = TPM, refilled at TPM / 60 per second.  A request
+  is charged an *estimate* (prompt chars / 4 + ``max_tokens``) up front;
+  the difference is refunded or charged once real usage is known.
+
+Limits start from ``OPENAI_RPM_LIMIT`` / ``OPENAI_TPM_LIMIT`` (or the
+defaults below) and are corrected from the ``x-ratelimit-*`` response
+headers.  A 429 pauses *every* caller of that model until the
+``Retry-After`` / reset time has passed.
+
+Per run, ``agent_metrics["rate_limit"]`` counts the requests that had to
+wait (``waits``, ``wait_s``) and the 429s that paused the model
+(``rate_limited``).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Optional
+
+from .cost import record_metric
+
+logger = logging.getLogger("pipeline")
+
+DEFAULT_RPM = 500
+DEFAULT_TPM = 500_000
+
+# Fallback pause after a 429 that carries no usable header, doubled per
+# consecutive 429 and capped at _MAX_PAUSE_S.
+_BASE_PAUSE_S = 5.0
+_MAX_PAUSE_S = 600.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse an OpenAI reset duration (``"1s"``, ``"6m0s"``, ``"20ms"``) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(num) * _UNIT_SECONDS[unit] for num, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    raw = headers.get(name)
+    if raw is None:
+        return None
+    try:
+        return int(float(raw))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_request_tokens(messages: List[Dict[str, Any]], max_tokens: int) -> int:
+    """Rough token charge for a chat request (~4 chars per token plus the completion budget)."""
+    try:
+        chars = len(json.dumps(messages, default=str))
+    except (TypeError, ValueError):
+        chars = sum(len(str(m.get("content") or "")) for m in messages)
+    return chars // 4 + max_tokens
+
+
+class ModelRateLimiter:
+    """Adaptive RPM/TPM token-bucket limiter for a single model."""
+
+    def __init__(self, model: str, *, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.model = model
+        self.rpm = rpm or int(os.getenv("OPENAI_RPM_LIMIT", DEFAULT_RPM))
+        self.tpm = tpm or int(os.getenv("OPENAI_TPM_LIMIT", DEFAULT_TPM))
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._consecutive_429 = 0
+        # FIFO lock made of one future per waiter (asyncio.Lock keeps a
+        # reference to its loop, which would keep the loop's registry entry alive).
+        self._busy = False
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.stats: Dict[str, float] = {"acquired": 0, "waits": 0, "wait_s": 0.0, "rate_limited": 0}
+
+    # -- FIFO lock -----------------------------------------------------------
+
+    async def _enter(self) -> None:
+        if not self._busy:
+            self._busy = True
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter  # the slot is handed over with _busy left set
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._leave()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _leave(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._busy = False
+
+    # -- bucket bookkeeping -------------------------------------------------
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60.0)
+
+    def _wait_needed(self, tokens: int) -> float:
+        """Seconds until one request and *tokens* tokens are available (0 = now)."""
+        now = time.monotonic()
+        if self._paused_until > now:
+            return self._paused_until - now
+        wait = 0.0
+        if self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60.0 / self.rpm)
+        if self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60.0 / self.tpm)
+        return wait
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until the request fits both budgets, then charge it.  Returns seconds waited.
+
+        Callers queue on a lock, so once the budget is exhausted they are
+        released in arrival order rather than racing each other.
+        """
+        tokens = max(0, min(int(tokens), self.tpm))
+        waited = 0.0
+        await self._enter()
+        try:
+            while True:
+                self._refill()
+                wait = self._wait_needed(tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+                waited += wait
+            self._requests -= 1
+            self._tokens -= tokens
+        finally:
+            self._leave()
+        self.stats["acquired"] += 1
+        if waited:
+            self.stats["waits"] += 1
+            self.stats["wait_s"] += waited
+            record_metric("rate_limit", "waits")
+            record_metric("rate_limit", "wait_s", round(waited, 3))
+            logger.debug(f"Rate limiter [{self.model}] waited {waited:.1f}s")
+        return waited
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Refund (or charge) the difference between the estimated and real token usage."""
+        self._refill()
+        self._tokens = min(float(self.tpm), self._tokens + (estimated - actual))
+
+    # -- server feedback ----------------------------------------------------
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Adopt the limits and remaining budget reported by ``x-ratelimit-*`` headers."""
+        if not headers:
+            return
+        self._refill()
+        limit_req = _header_int(headers, "x-ratelimit-limit-requests")
+        limit_tok = _header_int(headers, "x-ratelimit-limit-tokens")
+        if limit_req and limit_req != self.rpm:
+            self.rpm = limit_req
+            self._requests = min(self._requests, float(limit_req))
+        if limit_tok and limit_tok != self.tpm:
+            self.tpm = limit_tok
+            self._tokens = min(self._tokens, float(limit_tok))
+
+        remaining_req = _header_int(headers, "x-ratelimit-remaining-requests")
+        remaining_tok = _header_int(headers, "x-ratelimit-remaining-tokens")
+        if remaining_req is not None:
+            self._requests = min(self._requests, float(remaining_req))
+        if remaining_tok is not None:
+            self._tokens = min(self._tokens, float(remaining_tok))
+        self._consecutive_429 = 0
+
+    def on_rate_limited(self, headers: Optional[Mapping[str, str]] = None) -> float:
+        """Pause every caller of this model after a 429.  Returns the pause length in seconds."""
+        headers = headers or {}
+        self._consecutive_429 += 1
+        self.stats["rate_limited"] += 1
+        record_metric("rate_limit", "rate_limited")
+
+        candidates: List[Optional[float]] = [_parse_reset(headers.get("retry-after"))]
+        retry_after_ms = _parse_reset(headers.get("retry-after-ms"))
+        if retry_after_ms:
+            candidates.append(retry_after_ms / 1000.0)
+        if headers.get("x-ratelimit-remaining-requests") == "0":
+            candidates.append(_parse_reset(headers.get("x-ratelimit-reset-requests")))
+        if headers.get("x-ratelimit-remaining-tokens") == "0":
+            candidates.append(_parse_reset(headers.get("x-ratelimit-reset-tokens")))
+        known = [c for c in candidates if c]
+        if known:
+            pause = min(_MAX_PAUSE_S, max(known))
+        else:
+            pause = min(_MAX_PAUSE_S, _BASE_PAUSE_S * (2 ** (self._consecutive_429 - 1)))
+
+        self._refill()
+        self._requests = min(self._requests, 0.0)
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        return pause
+
+
+_limiters_by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, ModelRateLimiter]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_rate_limiter(model: str) -> ModelRateLimiter:
+    """Return the shared limiter for *model* on the running event loop."""
+    limiters = _limiters_by_loop.setdefault(asyncio.get_running_loop(), {})
+    limiter = limiters.get(model)
+    if limiter is None:
+        limiter = ModelRateLimiter(model)
+        limiters[model] = limiter
+    return limiter
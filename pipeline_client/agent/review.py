@@ -7,7 +7,9 @@ import os
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, List, Optional
 
+from .cassette import env_flag, recorded
 from .cost import accumulate
+from .offload import run_cpu
 from .prompts import REVIEW_SYSTEM, REVIEW_USER
 from .utils import _extract_json, make_logger
 
@@ -30,6 +32,7 @@ _REVIEW_PROVIDERS = {
 }
 
 
+@recorded("claude")
 async def _call_anthropic(system: str, user: str, *, model: str = DEFAULT_CLAUDE_MODEL) -> str:
     """Call the Anthropic Messages API and return the text response."""
     from anthropic import AsyncAnthropic
@@ -53,6 +56,7 @@ async def _call_anthropic(system: str, user: str, *, model: str = DEFAULT_CLAUDE
     return ""
 
 
+@recorded("gemini")
 async def _call_gemini(system: str, user: str, *, model: str = DEFAULT_GEMINI_MODEL) -> str:
     """Call the Google Gemini API via the google-genai client and return the text response."""
     api_key = os.environ.get("GEMINI_API_KEY", "")
@@ -78,6 +82,7 @@ async def _call_gemini(system: str, user: str, *, model: str = DEFAULT_GEMINI_MO
     return response.text or ""
 
 
+@recorded("grok")
 async def _call_grok(system: str, user: str, *, model: str = DEFAULT_GROK_MODEL) -> str:
     """Call the xAI Grok API (OpenAI-compatible) and return the text response."""
     from openai import AsyncOpenAI
@@ -129,7 +134,7 @@ async def _run_single_review(
             return None
 
         try:
-            review_data = _extract_json(raw)
+            review_data = await run_cpu(_extract_json, raw, min_size=len(raw))
         except (json.JSONDecodeError, ValueError):
             log("warning", f"  {provider} review returned malformed JSON — skipping")
             return None
@@ -166,18 +171,19 @@ async def run_reviews(
 
     tasks = []
     for provider, (env_key, full_model, cheap_model_name) in _REVIEW_PROVIDERS.items():
-        if not os.environ.get(env_key):
+        if not env_flag(env_key):
             log("info", f"  Skipping {provider} review ({env_key} not set)")
             continue
-        effective_model = model_overrides.get(provider) or (
-            cheap_model_name if cheap_mode else full_model
+        effective_model = model_overrides.get(provider) or (cheap_model_name if cheap_mode else full_model)
+        tasks.append(
+            _run_single_review(
+                race_id,
+                profile_json,
+                provider=provider,
+                model_override=effective_model,
+                on_log=on_log,
+            )
         )
-        tasks.append(_run_single_review(
-            race_id, profile_json,
-            provider=provider,
-            model_override=effective_model,
-            on_log=on_log,
-        ))
 
     results = await asyncio.gather(*tasks)
     return [r for r in results if r is not None]
@@ -257,10 +263,7 @@ async def run_post_run_analysis(
     effective_model = model or DEFAULT_GEMINI_MODEL
 
     # Format logs as plain text, newest-last, truncated if necessary
-    log_lines = [
-        f"[{e.get('timestamp', '')}] {e.get('level', 'info').upper():7s} {e.get('message', '')}"
-        for e in logs
-    ]
+    log_lines = [f"[{e.get('timestamp', '')}] {e.get('level', 'info').upper():7s} {e.get('message', '')}" for e in logs]
     logs_text = "\n".join(log_lines)
     if len(logs_text) > _MAX_LOG_CHARS:
         logs_text = "... (truncated — showing last portion) ...\n" + logs_text[-_MAX_LOG_CHARS:]
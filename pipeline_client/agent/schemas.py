@@ -0,0 +1,119 @@
+"""Response schemas for the JSON-returning agent phases.
+
+Discovery and finance/voting answer with one large JSON object.  Without a
+schema the model occasionally returns something ``_extract_json`` cannot
+parse (or wraps it in prose), and ``_agent_loop`` pays a whole extra round
+trip to ask again.  Each phase therefore declares the shape of its answer,
+derived from ``shared.models``, and sends it with OpenAI's structured-output
+mode (``response_format={"type": "json_schema", "strict": true, ...}``), which
+constrains decoding to the schema.
+
+Strict mode needs every property listed as required and
+``additionalProperties: false`` on every object, so free-form maps
+(``Candidate.issues``, ``social_media``) are left out of the phase models, and
+the finance/voting answer is a list of per-candidate entries instead of an
+object keyed by name.
+"""
+
+from copy import copy
+from typing import Any, Dict, List, Type
+
+from pydantic import BaseModel, create_model
+
+from shared.models import Candidate, RaceJSON
+
+# JSON-schema keywords strict mode rejects (``uri`` is not a supported format)
+_DROPPED_KEYWORDS = frozenset({"default", "format", "minLength", "maxLength"})
+
+
+def _subset(model: Type[BaseModel], name: str, fields: List[str], **overrides: Any) -> Type[BaseModel]:
+    """A model with *fields* of *model* (descriptions kept), with annotations replaced from *overrides*."""
+    definitions: Dict[str, Any] = {}
+    for field in fields:
+        info = copy(model.model_fields[field])
+        definitions[field] = (overrides.get(field, info.annotation), info)
+    return create_model(name, **definitions)
+
+
+def _strict(node: Any) -> Any:
+    if isinstance(node, list):
+        return [_strict(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    out: Dict[str, Any] = {}
+    for key, value in node.items():
+        if key in _DROPPED_KEYWORDS:
+            continue
+        if key in ("properties", "$defs"):
+            out[key] = {name: _strict(sub) for name, sub in value.items()}
+        else:
+            out[key] = _strict(value)
+    if isinstance(out.get("additionalProperties"), dict):
+        raise ValueError(f"free-form object is not allowed in a strict schema: {node.get('title', node)}")
+    if out.get("type") == "object":
+        # Optional fields stay nullable through their ``anyOf [..., null]``; all are required
+        out["required"] = list(out.get("properties", {}))
+        out["additionalProperties"] = False
+    return out
+
+
+def strict_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """The JSON schema of *model* in the form OpenAI's strict structured-output mode accepts."""
+    return _strict(model.model_json_schema())
+
+
+def response_format(model: Type[BaseModel], name: str) -> Dict[str, Any]:
+    """``response_format`` for the Chat Completions API constraining the answer to *model*."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": strict_json_schema(model)},
+    }
+
+
+DiscoveryCandidate = _subset(
+    Candidate,
+    "DiscoveryCandidate",
+    [
+        "name",
+        "party",
+        "incumbent",
+        "summary",
+        "summary_sources",
+        "image_url",
+        "website",
+        "career_history",
+        "education",
+        "donor_summary",
+        "donor_source_url",
+        "voting_summary",
+        "voting_source_url",
+        "links",
+    ],
+)
+DiscoveryRace = _subset(
+    RaceJSON,
+    "DiscoveryRace",
+    [
+        "id",
+        "title",
+        "office",
+        "jurisdiction",
+        "state",
+        "district",
+        "election_date",
+        "description",
+        "polling",
+        "polling_note",
+        "candidates",
+    ],
+    candidates=List[DiscoveryCandidate],
+)
+FinanceVotingEntry = _subset(
+    Candidate,
+    "FinanceVotingEntry",
+    ["name", "donor_summary", "donor_source_url", "voting_summary", "voting_source_url", "links"],
+)
+FinanceVotingResult = create_model("FinanceVotingResult", candidates=(List[FinanceVotingEntry], ...))
+
+DISCOVERY_FORMAT = response_format(DiscoveryRace, "race_discovery")
+FINANCE_VOTING_FORMAT = response_format(FinanceVotingResult, "finance_voting")
@@ -7,29 +7,173 @@ Significantly reduces API costs by caching search results for extended periods.
 Search queries are relatively stable for election research - the same query
 will return similar results for days or weeks, making caching highly effective.
 
+The cache keeps a small pool of long-lived connections to a WAL-mode database,
+so readers never block on the single writer and no call pays for opening a
+connection.  Reads do not write: hit counts are collected in memory and
+flushed in one batch every ``hit_flush_every`` hits or ``hit_flush_interval_s``
+seconds (and on ``get_stats`` / ``close``).
+
+The ``a*`` methods (``aget``, ``aset``, ``aget_page``, ``aset_page``,
+``alist_cached_for_race``, ``achanges_since``) run the same SQLite work in a
+worker thread, so concurrent sub-agents never stall the event loop on disk I/O.
+
+Page bodies are stored zlib-compressed (``content_length`` is the text
+length, ``compressed_size`` the stored size).  The cache payload is bounded
+by ``max_db_bytes`` (``SEARCH_CACHE_MAX_MB``): ``maintain()`` drops expired
+entries, evicts least-recently-used pages and searches until the payload is
+back under the limit, and vacuums the file.  ``start_maintenance()`` runs it
+periodically in a worker thread from the backend's event loop.
+
+Search results are keyed by ``search_key(query_text, num_results)``, which
+does not depend on the race: the query is Unicode-normalized, case-folded and
+whitespace-collapsed, and plain keyword queries have their tokens sorted, so
+"Jane Doe healthcare" and "healthcare  jane doe" share one entry whichever
+race asked first.
+
+Which races used a search or a page is recorded in the ``race_index`` table;
+``list_cached_for_race`` and ``clear_for_race`` go through it.  Every entry
+gets a growing sequence number, so ``changes_since(race_id, cursor)`` returns
+only what a race gained since an earlier call (pages carry the race's search
+that listed them, via the ``search_url`` index of result URLs).
+
+Pages also keep their ``ETag`` / ``Last-Modified`` validators and a content
+hash.  An expired page with validators stays around for a grace period so
+``_fetch_page`` can revalidate it with a conditional GET and ``refresh_page``
+it on a 304; ``pages_changed_since`` reports whether the content behind a
+set of URLs changed after a given time.
+
+Page fetches that failed are remembered for a short TTL (``fetch_failure``),
+and ``fetch_strategy`` keeps per-host outcomes of each fetch strategy
+(direct, alternate headers, text proxy) so ``_fetch_page`` can skip the ones
+a host keeps blocking.
+
 Usage:
     cache = SearchCache()
 
     # Check cache
-    cached = cache.get(query_text, race_id)
+    cached = await cache.aget(query_text, race_id, num_results=8)
     if cached:
         return cached['results']
 
     # Store in cache after API call
-    cache.set(query_text, race_id, results, provider="serper")
+    await cache.aset(query_text, results, race_id=race_id, provider="serper", num_results=8)
 """
 
+import asyncio
+import atexit
 import hashlib
 import json
 import logging
 import os
+import queue
+import re
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+import time
+import unicodedata
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .cache_tiers import TieredCache
 
 logger = logging.getLogger(__name__)
 
+# Primary-key column of each cached table (for batched hit-count updates)
+_KEY_COLUMNS = {"search_cache": "query_hash", "page_cache": "url_hash"}
+# Columns added after the first schema version: (table, column, type)
+_ADDED_COLUMNS = [
+    ("search_cache", "last_accessed", "TEXT"),
+    ("page_cache", "compressed_size", "INTEGER"),
+    ("page_cache", "last_accessed", "TEXT"),
+    ("page_cache", "etag", "TEXT"),
+    ("page_cache", "last_modified", "TEXT"),
+    ("page_cache", "content_hash", "TEXT"),
+    ("page_cache", "content_changed_at", "TEXT"),
+]
+_COMPRESSION_LEVEL = 6
+# Eviction frees down to this fraction of the limit so it does not run on every pass.
+_EVICT_TARGET_RATIO = 0.9
+_DEFAULT_MAX_DB_MB = 512
+# Expired pages with an ETag / Last-Modified are kept this much longer for conditional revalidation.
+_REVALIDATE_GRACE_HOURS = 168
+# Learned per-host fetch strategies older than this are forgotten (sites change their bot protection).
+_FETCH_STRATEGY_MAX_AGE_HOURS = 168
+# PRAGMA user_version: 2 = search rows keyed by search_key(), 3 = race_index / search_url
+_SCHEMA_VERSION = 3
+# race_index.kind of each cached table
+_INDEX_KINDS = {"search_cache": "search", "page_cache": "page"}
+# Result count assumed for rows written before num_results was part of the key
+DEFAULT_NUM_RESULTS = 8
+# Phrases, site:/intitle: style operators, exclusions and boolean operators make token order matter.
+_ORDER_SENSITIVE = re.compile(r"[\"“”]|\b(?:OR|AND)\b|\w:\S|(?:^|\s)[-+]\S|[()|]")
+_TOKEN_PUNCTUATION = ",;!?."
+
+
+def normalize_query(query_text: str) -> str:
+    """Canonical form of a search query for cache keys.
+
+    NFKC + casefold + collapsed whitespace.  Plain keyword queries (no quotes,
+    operators or exclusions) also have trailing punctuation stripped from each
+    token and their tokens sorted, since the search engine ignores keyword order.
+    """
+    text = unicodedata.normalize("NFKC", query_text)
+    reorder = not _ORDER_SENSITIVE.search(text)
+    tokens = text.casefold().split()
+    if reorder:
+        tokens = sorted(t for t in (tok.rstrip(_TOKEN_PUNCTUATION) for tok in tokens) if t)
+    return " ".join(tokens)
+
+
+def search_key(query_text: str, num_results: int = DEFAULT_NUM_RESULTS) -> str:
+    """Race-independent cache key for a search of *query_text* returning *num_results* results."""
+    return hashlib.sha256(f"{normalize_query(query_text)}\x1f{num_results}".encode()).hexdigest()
+
+
+class _ConnectionPool:
+    """A bounded pool of SQLite connections shared across threads."""
+
+    def __init__(self, db_path: Path, size: int):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            conn = self._open() if create else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+
 
 class SearchCache:
     """Persistent SQLite-based cache for search API results."""
@@ -38,6 +182,10 @@ class SearchCache:
         self,
         cache_dir: Optional[str] = None,
         default_ttl_hours: int = 168,  # 7 days default - searches are stable
+        pool_size: int = 4,
+        hit_flush_every: int = 64,
+        hit_flush_interval_s: float = 30.0,
+        max_db_bytes: Optional[int] = None,
     ):
         """
         Initialize the search cache.
@@ -45,8 +193,18 @@ class SearchCache:
         Args:
             cache_dir: Directory for cache database. Defaults to ./data/cache
             default_ttl_hours: Default time-to-live for cache entries in hours (default 7 days)
+            pool_size: Max open SQLite connections (one per concurrent worker thread)
+            hit_flush_every: Flush buffered hit counts after this many hits
+            hit_flush_interval_s: ...or when this many seconds passed since the last flush
+            max_db_bytes: Cache payload limit enforced by ``maintain()`` (0 = unbounded).
+                Defaults to ``SEARCH_CACHE_MAX_MB`` (512 MB)
         """
         self.default_ttl_hours = default_ttl_hours
+        if max_db_bytes is None:
+            max_db_bytes = int(float(os.getenv("SEARCH_CACHE_MAX_MB", str(_DEFAULT_MAX_DB_MB))) * 1024 * 1024)
+        self.max_db_bytes = max_db_bytes
+        self.hit_flush_every = hit_flush_every
+        self.hit_flush_interval_s = hit_flush_interval_s
 
         # Set up cache directory
         if cache_dir:
@@ -57,6 +215,18 @@ class SearchCache:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = self.cache_dir / "search_cache.db"
 
+        self._pool = _ConnectionPool(self.db_path, pool_size)
+        # SQLite allows one writer; serialising our own writes avoids busy-waiting on the file lock.
+        self._write_lock = threading.Lock()
+        self._hits_lock = threading.Lock()
+        # (table, key hash) -> [hits, last access ISO time]
+        self._pending_hits: Dict[Tuple[str, str], List[Any]] = {}
+        # (kind, key hash, race id) race_index entries seen on reads, written with the hit batch
+        self._pending_races: Set[Tuple[str, str, str]] = set()
+        self._n_pending_hits = 0
+        self._last_hit_flush = time.monotonic()
+        self._maintenance_task: Optional[asyncio.Task] = None
+
         # Initialize database
         self._init_db()
 
@@ -64,7 +234,9 @@ class SearchCache:
 
     def _init_db(self):
         """Initialize SQLite database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write_lock, self._pool.connection() as conn:
+            # Only takes effect on a new file; older files are converted by the first VACUUM.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS search_cache (
@@ -76,7 +248,8 @@ class SearchCache:
                     result_count INTEGER,
                     searched_at TEXT NOT NULL,
                     expires_at TEXT NOT NULL,
-                    hit_count INTEGER DEFAULT 0
+                    hit_count INTEGER DEFAULT 0,
+                    last_accessed TEXT
                 )
             """
             )
@@ -95,11 +268,17 @@ class SearchCache:
                 CREATE TABLE IF NOT EXISTS page_cache (
                     url_hash TEXT PRIMARY KEY,
                     url TEXT NOT NULL,
-                    content TEXT NOT NULL,
+                    content BLOB NOT NULL,
                     content_length INTEGER,
                     fetched_at TEXT NOT NULL,
                     expires_at TEXT NOT NULL,
-                    hit_count INTEGER DEFAULT 0
+                    hit_count INTEGER DEFAULT 0,
+                    compressed_size INTEGER,
+                    last_accessed TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    content_changed_at TEXT
                 )
             """
             )
@@ -108,55 +287,275 @@ class SearchCache:
                 CREATE INDEX IF NOT EXISTS idx_page_expires ON page_cache(expires_at)
             """
             )
+            # Databases created before compression / LRU tracking
+            for table, column, col_type in _ADDED_COLUMNS:
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS race_index (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    race_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    key_hash TEXT NOT NULL,
+                    query_hash TEXT,
+                    UNIQUE (race_id, kind, key_hash)
+                )
+            """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_race_index_seq ON race_index(race_id, seq)
+            """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_race_index_key ON race_index(kind, key_hash)
+            """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_url (
+                    query_hash TEXT NOT NULL,
+                    url_hash TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    PRIMARY KEY (query_hash, url_hash)
+                )
+            """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_search_url_url ON search_url(url_hash)
+            """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fetch_failure (
+                    url_hash TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    failed_at TEXT NOT NULL,
+                    expires_at TEXT NOT NULL
+                )
+            """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fetch_strategy (
+                    host TEXT NOT NULL,
+                    strategy TEXT NOT NULL,
+                    successes INTEGER NOT NULL DEFAULT 0,
+                    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                    last_success TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (host, strategy)
+                )
+            """
+            )
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 2:
+                self._rekey_searches(conn)
+            if version < 3:
+                self._build_race_index(conn)
+            if version < _SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
             conn.commit()
 
-    def _query_hash(self, query_text: str, race_id: Optional[str] = None) -> str:
-        """Generate consistent hash for a search query."""
-        key = f"{query_text}:{race_id or ''}"
-        return hashlib.sha256(key.encode()).hexdigest()
+    @staticmethod
+    def _rekey_searches(conn: sqlite3.Connection) -> None:
+        """Move rows keyed by (raw query, race) to ``search_key`` and record their races in ``race_index``.
+
+        Rows that collapse onto one key keep the most recent results.
+        """
+        rows = conn.execute("SELECT * FROM search_cache ORDER BY searched_at").fetchall()
+        if not rows:
+            return
+        newest: Dict[str, sqlite3.Row] = {}
+        races: Set[Tuple[str, str]] = set()
+        hits: Dict[str, int] = {}
+        for row in rows:
+            key = search_key(row["query_text"], DEFAULT_NUM_RESULTS)
+            newest[key] = row
+            hits[key] = hits.get(key, 0) + (row["hit_count"] or 0)
+            if row["race_id"]:
+                races.add((key, row["race_id"]))
+        conn.execute("DELETE FROM search_cache")
+        conn.executemany(
+            """
+            INSERT INTO search_cache
+            (query_hash, query_text, race_id, provider, results, result_count, searched_at, expires_at,
+             hit_count, last_accessed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    key,
+                    r["query_text"],
+                    r["race_id"],
+                    r["provider"],
+                    r["results"],
+                    r["result_count"],
+                    r["searched_at"],
+                    r["expires_at"],
+                    hits[key],
+                    r["last_accessed"],
+                )
+                for key, r in newest.items()
+            ],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO race_index (race_id, kind, key_hash) VALUES (?, 'search', ?)",
+            sorted((race, key) for key, race in races),
+        )
+        logger.info(f"Re-keyed {len(rows)} cached searches to {len(newest)} race-independent entries")
+
+    @staticmethod
+    def _build_race_index(conn: sqlite3.Connection) -> None:
+        """Carry ``search_race`` associations over to ``race_index`` and index cached result URLs."""
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_race'").fetchone():
+            conn.execute(
+                "INSERT OR IGNORE INTO race_index (race_id, kind, key_hash) "
+                "SELECT race_id, 'search', query_hash FROM search_race ORDER BY rowid"
+            )
+            conn.execute("DROP TABLE search_race")
+        for query_hash, results_json in conn.execute("SELECT query_hash, results FROM search_cache").fetchall():
+            SearchCache._index_urls(conn, query_hash, results_json)
+
+    @staticmethod
+    def _index_urls(conn: sqlite3.Connection, query_hash: str, results: Any) -> None:
+        """Replace the ``search_url`` rows of one search with the URLs of *results* (a list or its JSON)."""
+        if isinstance(results, str):
+            try:
+                results = json.loads(results)
+            except (json.JSONDecodeError, TypeError):
+                results = []
+        rows: Dict[str, Tuple[str, str, str, int]] = {}
+        for position, result in enumerate(results or []):
+            url = result.get("url") if isinstance(result, dict) else None
+            if url:
+                url_hash = hashlib.sha256(url.encode()).hexdigest()
+                rows.setdefault(url_hash, (query_hash, url_hash, url, position))
+        conn.execute("DELETE FROM search_url WHERE query_hash = ?", (query_hash,))
+        conn.executemany("INSERT INTO search_url (query_hash, url_hash, url, position) VALUES (?, ?, ?, ?)", rows.values())
+
+    @staticmethod
+    def _link_pages(conn: sqlite3.Connection, links: List[Tuple[str, str]]) -> None:
+        """Add (url hash, race id) page entries to ``race_index``, noting the race's search that listed each URL."""
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO race_index (race_id, kind, key_hash, query_hash)
+            VALUES (?2, 'page', ?1, (
+                SELECT su.query_hash FROM search_url su
+                JOIN race_index ri ON ri.kind = 'search' AND ri.key_hash = su.query_hash AND ri.race_id = ?2
+                WHERE su.url_hash = ?1
+                ORDER BY ri.seq LIMIT 1
+            ))
+            """,
+            links,
+        )
+
+    def _query_hash(self, query_text: str, num_results: int = DEFAULT_NUM_RESULTS) -> str:
+        """Cache key of a search (see ``search_key``)."""
+        return search_key(query_text, num_results)
+
+    # -- hit counters ------------------------------------------------------
 
-    def get(self, query_text: str, race_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def _record_hit(self, table: str, key_hash: str, race_id: Optional[str] = None) -> None:
+        """Buffer one hit (and its access time for LRU eviction); flush the batch once it is big or old enough.
+
+        A hit from *race_id* also buffers the race's ``race_index`` entry.
+        """
+        now = datetime.utcnow().isoformat()
+        with self._hits_lock:
+            pending = self._pending_hits.setdefault((table, key_hash), [0, now])
+            pending[0] += 1
+            pending[1] = now
+            if race_id:
+                self._pending_races.add((_INDEX_KINDS[table], key_hash, race_id))
+            self._n_pending_hits += 1
+            due = (
+                self._n_pending_hits >= self.hit_flush_every
+                or time.monotonic() - self._last_hit_flush >= self.hit_flush_interval_s
+            )
+        if due:
+            self.flush_hits()
+
+    def flush_hits(self) -> int:
+        """Write buffered hit counts to the database; returns the number of hits flushed."""
+        with self._hits_lock:
+            pending, self._pending_hits = self._pending_hits, {}
+            races, self._pending_races = self._pending_races, set()
+            n, self._n_pending_hits = self._n_pending_hits, 0
+            self._last_hit_flush = time.monotonic()
+        if not pending and not races:
+            return 0
+        try:
+            with self._write_lock, self._pool.connection() as conn:
+                for table, column in _KEY_COLUMNS.items():
+                    rows = [(count, last, key) for (t, key), (count, last) in pending.items() if t == table]
+                    if rows:
+                        conn.executemany(
+                            f"UPDATE {table} SET hit_count = hit_count + ?, last_accessed = ? WHERE {column} = ?", rows
+                        )
+                searches = [(race, key) for kind, key, race in races if kind == "search"]
+                if searches:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO race_index (race_id, kind, key_hash) VALUES (?, 'search', ?)", searches
+                    )
+                # After the searches, so a page can be traced to a search of the same batch
+                self._link_pages(conn, [(key, race) for kind, key, race in races if kind == "page"])
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to flush {n} cache hit counts: {e}")
+        return n
+
+    # -- searches ------------------------------------------------------------
+
+    def tag(self, query_text: str, race_id: str, num_results: int = DEFAULT_NUM_RESULTS) -> None:
+        """Add a cached search to *race_id*'s index without counting a hit (buffered like hits)."""
+        with self._hits_lock:
+            self._pending_races.add(("search", self._query_hash(query_text, num_results), race_id))
+
+    def get(
+        self, query_text: str, race_id: Optional[str] = None, num_results: int = DEFAULT_NUM_RESULTS
+    ) -> Optional[Dict[str, Any]]:
         """
         Retrieve cached search results.
 
         Args:
             query_text: The search query text
-            race_id: Optional race identifier for context
+            race_id: Optional race to associate the query with on a hit (not part of the key)
+            num_results: Number of results the search asked for
 
         Returns:
             Cached results dict or None if not found/expired
         """
-        query_hash = self._query_hash(query_text, race_id)
+        query_hash = self._query_hash(query_text, num_results)
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._pool.connection() as conn:
+            row = conn.execute(
                 """
                 SELECT * FROM search_cache
                 WHERE query_hash = ? AND expires_at > ?
                 """,
                 (query_hash, datetime.utcnow().isoformat()),
-            )
-            row = cursor.fetchone()
-
-            if row:
-                # Update hit count
-                conn.execute(
-                    "UPDATE search_cache SET hit_count = hit_count + 1 WHERE query_hash = ?",
-                    (query_hash,),
-                )
-                conn.commit()
+            ).fetchone()
 
-                logger.debug(f"Search cache HIT for '{query_text[:50]}...' (hits: {row['hit_count'] + 1})")
-                return {
-                    "query_text": row["query_text"],
-                    "race_id": row["race_id"],
-                    "provider": row["provider"],
-                    "results": json.loads(row["results"]),
-                    "result_count": row["result_count"],
-                    "searched_at": row["searched_at"],
-                    "from_cache": True,
-                }
+        if row:
+            self._record_hit("search_cache", query_hash, race_id)
+            logger.debug(f"Search cache HIT for '{query_text[:50]}...'")
+            return {
+                "query_text": row["query_text"],
+                "race_id": race_id or row["race_id"],
+                "provider": row["provider"],
+                "results": json.loads(row["results"]),
+                "result_count": row["result_count"],
+                "searched_at": row["searched_at"],
+                "expires_at": row["expires_at"],
+                "from_cache": True,
+            }
 
         logger.debug(f"Search cache MISS for '{query_text[:50]}...'")
         return None
@@ -167,7 +566,8 @@ class SearchCache:
         results: List[Dict[str, Any]],
         race_id: Optional[str] = None,
         provider: str = "unknown",
-        ttl_hours: Optional[int] = None,
+        ttl_hours: Optional[float] = None,
+        num_results: int = DEFAULT_NUM_RESULTS,
     ) -> bool:
         """
         Store search results in cache.
@@ -175,14 +575,15 @@ class SearchCache:
         Args:
             query_text: The search query text
             results: List of search result dicts (serializable)
-            race_id: Optional race identifier
+            race_id: Optional race to associate the query with
             provider: Search provider name (serper, google_cse, etc.)
             ttl_hours: Custom TTL, defaults to instance default
+            num_results: Number of results the search asked for
 
         Returns:
             True if cached successfully
         """
-        query_hash = self._query_hash(query_text, race_id)
+        query_hash = self._query_hash(query_text, num_results)
         ttl = ttl_hours or self.default_ttl_hours
         now = datetime.utcnow()
         expires_at = now + timedelta(hours=ttl)
@@ -194,12 +595,13 @@ class SearchCache:
             return False
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_lock, self._pool.connection() as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO search_cache
-                    (query_hash, query_text, race_id, provider, results, result_count, searched_at, expires_at, hit_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                    (query_hash, query_text, race_id, provider, results, result_count, searched_at, expires_at,
+                     hit_count, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?)
                     """,
                     (
                         query_hash,
@@ -210,8 +612,15 @@ class SearchCache:
                         len(results),
                         now.isoformat(),
                         expires_at.isoformat(),
+                        now.isoformat(),
                     ),
                 )
+                self._index_urls(conn, query_hash, results)
+                if race_id:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO race_index (race_id, kind, key_hash) VALUES (?, 'search', ?)",
+                        (race_id, query_hash),
+                    )
                 conn.commit()
 
             logger.debug(f"Search cached: '{query_text[:50]}...' ({len(results)} results, TTL: {ttl}h)")
@@ -221,51 +630,326 @@ class SearchCache:
             logger.error(f"Failed to cache search results: {e}")
             return False
 
-    def get_page(self, url: str) -> Optional[str]:
-        """Return cached page text content, or None if not found/expired."""
+    # -- pages ---------------------------------------------------------------
+
+    def tag_page(self, url: str, race_id: str) -> None:
+        """Add a cached page to *race_id*'s index without counting a hit (buffered like hits)."""
+        with self._hits_lock:
+            self._pending_races.add(("page", hashlib.sha256(url.encode()).hexdigest(), race_id))
+
+    def get_page(self, url: str, race_id: Optional[str] = None) -> Optional[str]:
+        """Return cached page text content, or None if not found/expired.
+
+        A hit from *race_id* adds the page to the race's index.
+        """
+        entry = self.get_page_entry(url, race_id)
+        return entry["content"] if entry else None
+
+    def has_page(self, url: str) -> bool:
+        """Whether an unexpired copy of *url* is cached, without counting a hit or touching its recency."""
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM page_cache WHERE url_hash = ? AND expires_at > ?",
+                (hashlib.sha256(url.encode()).hexdigest(), datetime.utcnow().isoformat()),
+            ).fetchone()
+        return row is not None
+
+    def get_page_entry(self, url: str, race_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Like ``get_page`` but returns ``{"content", "fetched_at", "expires_at"}``."""
         url_hash = hashlib.sha256(url.encode()).hexdigest()
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._pool.connection() as conn:
             row = conn.execute(
-                "SELECT content FROM page_cache WHERE url_hash = ? AND expires_at > ?",
+                "SELECT content, fetched_at, expires_at FROM page_cache WHERE url_hash = ? AND expires_at > ?",
                 (url_hash, datetime.utcnow().isoformat()),
             ).fetchone()
-            if row:
-                conn.execute(
-                    "UPDATE page_cache SET hit_count = hit_count + 1 WHERE url_hash = ?",
-                    (url_hash,),
-                )
-                conn.commit()
-                logger.debug(f"Page cache HIT: {url[:60]}")
-                return row["content"]
+        if row:
+            self._record_hit("page_cache", url_hash, race_id)
+            logger.debug(f"Page cache HIT: {url[:60]}")
+            content = row["content"]
+            # Rows written before compression hold plain text
+            if isinstance(content, bytes):
+                content = zlib.decompress(content).decode("utf-8")
+            return {"content": content, "fetched_at": row["fetched_at"], "expires_at": row["expires_at"]}
         logger.debug(f"Page cache MISS: {url[:60]}")
         return None
 
-    def set_page(self, url: str, content: str, ttl_hours: int = 24) -> bool:
-        """Cache stripped page text content. TTL defaults to 24h (pages change faster than searches)."""
+    def set_page(
+        self,
+        url: str,
+        content: str,
+        ttl_hours: float = 24,
+        race_id: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        """Cache stripped page text content. TTL defaults to 24h (pages change faster than searches).
+
+        With *race_id* the page is added to the race's index.  *etag* /
+        *last_modified* are the response validators used to revalidate the
+        entry once it expires.  ``content_changed_at`` only moves when the
+        content hash differs from the previously cached copy; a first copy
+        leaves it NULL, since there is nothing to have changed from.
+        """
         url_hash = hashlib.sha256(url.encode()).hexdigest()
         now = datetime.utcnow()
         expires_at = now + timedelta(hours=ttl_hours)
+        blob = zlib.compress(content.encode("utf-8"), _COMPRESSION_LEVEL)
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_lock, self._pool.connection() as conn:
+                previous = conn.execute(
+                    "SELECT content_hash, content_changed_at FROM page_cache WHERE url_hash = ?", (url_hash,)
+                ).fetchone()
+                if not previous or previous["content_hash"] is None:
+                    changed_at = None
+                elif previous["content_hash"] == content_hash:
+                    changed_at = previous["content_changed_at"]
+                else:
+                    changed_at = now.isoformat()
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO page_cache
-                    (url_hash, url, content, content_length, fetched_at, expires_at, hit_count)
-                    VALUES (?, ?, ?, ?, ?, ?, 0)
+                    (url_hash, url, content, content_length, fetched_at, expires_at, hit_count,
+                     compressed_size, last_accessed, etag, last_modified, content_hash, content_changed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?, ?, ?)
                     """,
-                    (url_hash, url, content, len(content), now.isoformat(), expires_at.isoformat()),
+                    (
+                        url_hash,
+                        url,
+                        blob,
+                        len(content),
+                        now.isoformat(),
+                        expires_at.isoformat(),
+                        len(blob),
+                        now.isoformat(),
+                        etag,
+                        last_modified,
+                        content_hash,
+                        changed_at,
+                    ),
                 )
+                conn.execute("DELETE FROM fetch_failure WHERE url_hash = ?", (url_hash,))
+                if race_id:
+                    self._link_pages(conn, [(url_hash, race_id)])
                 conn.commit()
-            logger.debug(f"Page cached: {url[:60]} ({len(content)} chars, TTL: {ttl_hours}h)")
+            logger.debug(f"Page cached: {url[:60]} ({len(content)} chars, {len(blob)} bytes stored, TTL: {ttl_hours}h)")
             return True
         except sqlite3.Error as e:
             logger.error(f"Failed to cache page {url[:60]}: {e}")
             return False
 
+    def get_page_validators(self, url: str) -> Optional[Dict[str, Any]]:
+        """Validators of a cached page for a conditional GET, fresh or expired.
+
+        Returns ``{"content", "etag", "last_modified", "content_hash"}``, or
+        None when the page is not cached or has neither an ETag nor a
+        Last-Modified date.
+        """
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT content, etag, last_modified, content_hash FROM page_cache "
+                "WHERE url_hash = ? AND (etag IS NOT NULL OR last_modified IS NOT NULL)",
+                (url_hash,),
+            ).fetchone()
+        if not row:
+            return None
+        content = row["content"]
+        if isinstance(content, bytes):
+            content = zlib.decompress(content).decode("utf-8")
+        return {
+            "content": content,
+            "etag": row["etag"],
+            "last_modified": row["last_modified"],
+            "content_hash": row["content_hash"],
+        }
+
+    def refresh_page(self, url: str, ttl_hours: float = 24) -> bool:
+        """Extend a cached page by *ttl_hours* after the origin confirmed it unchanged (HTTP 304)."""
+        now = datetime.utcnow()
+        try:
+            with self._write_lock, self._pool.connection() as conn:
+                cursor = conn.execute(
+                    "UPDATE page_cache SET expires_at = ?, last_accessed = ? WHERE url_hash = ?",
+                    (
+                        (now + timedelta(hours=ttl_hours)).isoformat(),
+                        now.isoformat(),
+                        hashlib.sha256(url.encode()).hexdigest(),
+                    ),
+                )
+                conn.commit()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f"Failed to refresh cached page {url[:60]}: {e}")
+            return False
+
+    def pages_changed_since(self, urls: List[str], since: str) -> Dict[str, bool]:
+        """For each cached page in *urls*, whether its content hash changed after *since* (ISO time).
+
+        URLs that are not cached, or whose content has not changed since it was first cached, are
+        left out, so an empty result means "unknown", not "unchanged".
+        """
+        since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
+        if since_dt.tzinfo is not None:
+            since_dt = since_dt.astimezone(timezone.utc).replace(tzinfo=None)
+        hashes = {hashlib.sha256(u.encode()).hexdigest(): u for u in urls}
+        if not hashes:
+            return {}
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT url_hash, content_changed_at FROM page_cache "
+                f"WHERE content_changed_at IS NOT NULL AND url_hash IN ({','.join('?' * len(hashes))})",
+                list(hashes),
+            ).fetchall()
+        return {hashes[row["url_hash"]]: row["content_changed_at"] > since_dt.isoformat() for row in rows}
+
+    # -- fetch failures & per-host fetch strategies ---------------------------
+
+    def get_fetch_failure(self, url: str) -> Optional[str]:
+        """Return the cached failure message for *url* while its (short) TTL lasts."""
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT message FROM fetch_failure WHERE url_hash = ? AND expires_at > ?",
+                (url_hash, datetime.utcnow().isoformat()),
+            ).fetchone()
+        return row["message"] if row else None
+
+    def set_fetch_failure(self, url: str, message: str, ttl_hours: float = 0.5) -> bool:
+        """Remember that fetching *url* failed (blocked, unusable or unreachable) for *ttl_hours*."""
+        now = datetime.utcnow()
+        try:
+            with self._write_lock, self._pool.connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO fetch_failure (url_hash, url, message, failed_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        hashlib.sha256(url.encode()).hexdigest(),
+                        url,
+                        message,
+                        now.isoformat(),
+                        (now + timedelta(hours=ttl_hours)).isoformat(),
+                    ),
+                )
+                conn.commit()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Failed to cache fetch failure for {url[:60]}: {e}")
+            return False
+
+    def fetch_strategy_stats(self, host: str) -> Dict[str, Dict[str, Any]]:
+        """Learned outcomes per fetch strategy for *host*.
+
+        Returns ``{strategy: {"successes", "consecutive_failures", "last_success"}}``
+        for strategies tried within the last week.
+        """
+        cutoff = (datetime.utcnow() - timedelta(hours=_FETCH_STRATEGY_MAX_AGE_HOURS)).isoformat()
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT strategy, successes, consecutive_failures, last_success FROM fetch_strategy "
+                "WHERE host = ? AND updated_at > ?",
+                (host, cutoff),
+            ).fetchall()
+        return {
+            row["strategy"]: {
+                "successes": row["successes"],
+                "consecutive_failures": row["consecutive_failures"],
+                "last_success": row["last_success"],
+            }
+            for row in rows
+        }
+
+    def record_fetch_outcomes(self, host: str, outcomes: List[Tuple[str, bool]]) -> None:
+        """Record ``(strategy, succeeded)`` attempts for *host*; a success resets the failure streak."""
+        if not outcomes:
+            return
+        now = datetime.utcnow().isoformat()
+        try:
+            with self._write_lock, self._pool.connection() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO fetch_strategy (host, strategy, successes, consecutive_failures, last_success, updated_at)
+                    VALUES (?1, ?2, ?3, 1 - ?3, CASE WHEN ?3 THEN ?4 END, ?4)
+                    ON CONFLICT (host, strategy) DO UPDATE SET
+                        successes = successes + ?3,
+                        consecutive_failures = CASE WHEN ?3 THEN 0 ELSE consecutive_failures + 1 END,
+                        last_success = CASE WHEN ?3 THEN ?4 ELSE last_success END,
+                        updated_at = ?4
+                    """,
+                    [(host, strategy, int(ok), now) for strategy, ok in outcomes],
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record fetch outcomes for {host}: {e}")
+
+    # -- async API (SQLite work runs off the event loop) ---------------------
+
+    async def aget(
+        self, query_text: str, race_id: Optional[str] = None, num_results: int = DEFAULT_NUM_RESULTS
+    ) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, query_text, race_id, num_results)
+
+    async def aset(
+        self,
+        query_text: str,
+        results: List[Dict[str, Any]],
+        race_id: Optional[str] = None,
+        provider: str = "unknown",
+        ttl_hours: Optional[float] = None,
+        num_results: int = DEFAULT_NUM_RESULTS,
+    ) -> bool:
+        return await asyncio.to_thread(self.set, query_text, results, race_id, provider, ttl_hours, num_results)
+
+    async def aget_page(self, url: str, race_id: Optional[str] = None) -> Optional[str]:
+        return await asyncio.to_thread(self.get_page, url, race_id)
+
+    async def aset_page(
+        self,
+        url: str,
+        content: str,
+        ttl_hours: float = 24,
+        race_id: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        return await asyncio.to_thread(self.set_page, url, content, ttl_hours, race_id, etag, last_modified)
+
+    async def ahas_page(self, url: str) -> bool:
+        return await asyncio.to_thread(self.has_page, url)
+
+    async def aget_page_validators(self, url: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_page_validators, url)
+
+    async def arefresh_page(self, url: str, ttl_hours: float = 24) -> bool:
+        return await asyncio.to_thread(self.refresh_page, url, ttl_hours)
+
+    async def apages_changed_since(self, urls: List[str], since: str) -> Dict[str, bool]:
+        return await asyncio.to_thread(self.pages_changed_since, urls, since)
+
+    async def alist_cached_for_race(self, race_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.list_cached_for_race, race_id)
+
+    async def aget_fetch_failure(self, url: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get_fetch_failure, url)
+
+    async def aset_fetch_failure(self, url: str, message: str, ttl_hours: float = 0.5) -> bool:
+        return await asyncio.to_thread(self.set_fetch_failure, url, message, ttl_hours)
+
+    async def afetch_strategy_stats(self, host: str) -> Dict[str, Dict[str, Any]]:
+        return await asyncio.to_thread(self.fetch_strategy_stats, host)
+
+    async def arecord_fetch_outcomes(self, host: str, outcomes: List[Tuple[str, bool]]) -> None:
+        await asyncio.to_thread(self.record_fetch_outcomes, host, outcomes)
+
+    async def achanges_since(self, race_id: str, cursor: int = 0) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.changes_since, race_id, cursor)
+
+    # -- maintenance ---------------------------------------------------------
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        with sqlite3.connect(self.db_path) as conn:
+        self.flush_hits()
+        with self._pool.connection() as conn:
             # Total entries
             total = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
 
@@ -285,6 +969,10 @@ class SearchCache:
 
             # Cache size
             db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
+            payload = self._payload_bytes(conn)
+            page_text, page_stored = conn.execute(
+                "SELECT SUM(content_length), SUM(COALESCE(compressed_size, content_length)) FROM page_cache"
+            ).fetchone()
 
         return {
             "total_entries": total,
@@ -294,20 +982,30 @@ class SearchCache:
             "by_provider": provider_stats,
             "db_size_bytes": db_size,
             "db_size_mb": round(db_size / (1024 * 1024), 2),
+            "payload_bytes": payload,
+            "max_db_bytes": self.max_db_bytes,
+            "page_text_bytes": page_text or 0,
+            "page_stored_bytes": page_stored or 0,
         }
 
     def cleanup_expired(self) -> int:
         """Remove expired cache entries from both search and page caches."""
         now = datetime.utcnow().isoformat()
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write_lock, self._pool.connection() as conn:
             search_cursor = conn.execute(
                 "DELETE FROM search_cache WHERE expires_at <= ?",
                 (now,),
             )
+            grace = (datetime.utcnow() - timedelta(hours=_REVALIDATE_GRACE_HOURS)).isoformat()
             page_cursor = conn.execute(
-                "DELETE FROM page_cache WHERE expires_at <= ?",
-                (now,),
+                "DELETE FROM page_cache WHERE expires_at <= ? "
+                "AND ((etag IS NULL AND last_modified IS NULL) OR expires_at <= ?)",
+                (now, grace),
             )
+            self._drop_orphans(conn)
+            conn.execute("DELETE FROM fetch_failure WHERE expires_at <= ?", (now,))
+            stale = (datetime.utcnow() - timedelta(hours=_FETCH_STRATEGY_MAX_AGE_HOURS)).isoformat()
+            conn.execute("DELETE FROM fetch_strategy WHERE updated_at <= ?", (stale,))
             conn.commit()
             removed_search = search_cursor.rowcount
             removed_pages = page_cursor.rowcount
@@ -323,12 +1021,152 @@ class SearchCache:
 
         return removed
 
+    @staticmethod
+    def _drop_orphans(conn: sqlite3.Connection) -> None:
+        """Delete index rows of searches and pages that expired or were evicted."""
+        conn.execute(
+            "DELETE FROM race_index WHERE kind = 'search' "
+            "AND NOT EXISTS (SELECT 1 FROM search_cache s WHERE s.query_hash = race_index.key_hash)"
+        )
+        conn.execute(
+            "DELETE FROM race_index WHERE kind = 'page' "
+            "AND NOT EXISTS (SELECT 1 FROM page_cache p WHERE p.url_hash = race_index.key_hash)"
+        )
+        conn.execute(
+            "DELETE FROM search_url "
+            "WHERE NOT EXISTS (SELECT 1 FROM search_cache s WHERE s.query_hash = search_url.query_hash)"
+        )
+
+    # -- size bound & maintenance -------------------------------------------
+
+    @staticmethod
+    def _payload_bytes(conn: sqlite3.Connection) -> int:
+        pages = conn.execute("SELECT SUM(COALESCE(compressed_size, content_length)) FROM page_cache").fetchone()[0]
+        searches = conn.execute("SELECT SUM(length(results)) FROM search_cache").fetchone()[0]
+        return (pages or 0) + (searches or 0)
+
+    def evict_to_size(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least-recently-used pages and searches while the payload exceeds *max_bytes*.
+
+        Returns the number of entries evicted.  Frees down to 90% of the limit.
+        """
+        limit = self.max_db_bytes if max_bytes is None else max_bytes
+        if not limit:
+            return 0
+        self.flush_hits()  # so last_accessed reflects buffered hits
+        with self._write_lock, self._pool.connection() as conn:
+            payload = self._payload_bytes(conn)
+            if payload <= limit:
+                return 0
+            excess = payload - int(limit * _EVICT_TARGET_RATIO)
+            rows = conn.execute(
+                """
+                SELECT 'page_cache', url_hash, COALESCE(compressed_size, content_length),
+                       COALESCE(last_accessed, fetched_at) AS used
+                FROM page_cache
+                UNION ALL
+                SELECT 'search_cache', query_hash, length(results), COALESCE(last_accessed, searched_at) AS used
+                FROM search_cache
+                ORDER BY used
+                """
+            )
+            victims: Dict[str, List[Tuple[str]]] = {table: [] for table in _KEY_COLUMNS}
+            for table, key, size, _ in rows:
+                if excess <= 0:
+                    break
+                victims[table].append((key,))
+                excess -= size or 0
+            for table, column in _KEY_COLUMNS.items():
+                if victims[table]:
+                    conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", victims[table])
+            conn.commit()
+        evicted = sum(len(v) for v in victims.values())
+        logger.info(
+            "Evicted %s cache entries (%s pages, %s searches) to stay under %s bytes",
+            evicted,
+            len(victims["page_cache"]),
+            len(victims["search_cache"]),
+            limit,
+        )
+        return evicted
+
+    def vacuum(self) -> str:
+        """Return free pages to the filesystem.
+
+        Files in incremental auto-vacuum mode run ``incremental_vacuum``; older
+        files get a full ``VACUUM`` (which also switches them to incremental
+        mode) once a quarter of their pages are free.  Returns what was run.
+        """
+        with self._write_lock, self._pool.connection() as conn:
+            mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            total = conn.execute("PRAGMA page_count").fetchone()[0]
+            if not free:
+                return "none"
+            if mode == 2:
+                conn.execute("PRAGMA incremental_vacuum").fetchall()
+                conn.commit()
+                return "incremental"
+            if free * 4 >= total:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+                return "full"
+        return "none"
+
+    def maintain(self) -> Dict[str, Any]:
+        """One maintenance pass: expiry, LRU eviction to the size bound, vacuum."""
+        t0 = time.perf_counter()
+        expired = self.cleanup_expired()
+        evicted = self.evict_to_size()
+        vacuumed = self.vacuum()
+        result = {
+            "expired": expired,
+            "evicted": evicted,
+            "vacuum": vacuumed,
+            "duration_ms": int((time.perf_counter() - t0) * 1000),
+        }
+        logger.debug(f"Search cache maintenance: {result}")
+        return result
+
+    def start_maintenance(self, interval_s: float = 900.0) -> asyncio.Task:
+        """Run ``maintain()`` every *interval_s* seconds in a worker thread (idempotent per cache)."""
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.get_running_loop().create_task(self._maintenance_loop(interval_s))
+        return self._maintenance_task
+
+    async def _maintenance_loop(self, interval_s: float) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.maintain)
+            except Exception as e:
+                logger.warning(f"Search cache maintenance failed: {e}")
+            await asyncio.sleep(interval_s)
+
     def clear_for_race(self, race_id: str) -> int:
-        """Clear all cached searches for a specific race."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("DELETE FROM search_cache WHERE race_id = ?", (race_id,))
+        """Forget a race's cached searches.
+
+        Drops the race's index entries and every search no other race uses;
+        shared searches and cached pages stay.  Returns the number of searches removed.
+        """
+        self.flush_hits()  # so buffered index entries are cleared too
+        with self._write_lock, self._pool.connection() as conn:
+            hashes = [
+                (h,)
+                for (h,) in conn.execute("SELECT key_hash FROM race_index WHERE race_id = ? AND kind = 'search'", (race_id,))
+            ]
+            conn.execute("DELETE FROM race_index WHERE race_id = ?", (race_id,))
+            cursor = conn.executemany(
+                "DELETE FROM search_cache WHERE query_hash = ? AND NOT EXISTS "
+                "(SELECT 1 FROM race_index r WHERE r.kind = 'search' AND r.key_hash = search_cache.query_hash)",
+                hashes,
+            )
+            removed = max(cursor.rowcount, 0)
+            conn.executemany(
+                "DELETE FROM search_url WHERE query_hash = ? "
+                "AND NOT EXISTS (SELECT 1 FROM search_cache s WHERE s.query_hash = search_url.query_hash)",
+                hashes,
+            )
             conn.commit()
-            removed = cursor.rowcount
 
         logger.info(f"Cleared {removed} search cache entries for race {race_id}")
         return removed
@@ -336,54 +1174,91 @@ class SearchCache:
     def list_cached_for_race(self, race_id: str) -> Dict[str, Any]:
         """Return cached search queries and their result URLs for a race.
 
-        Returns ``{"searches": [{"query": ..., "urls": [...]}], "page_urls": [...]}``
-        containing only non-expired entries.
+        Returns ``{"searches": [{"query": ..., "urls": [...]}], "page_urls": [...], "cursor": n}``
+        containing only non-expired entries; *cursor* can be passed to ``changes_since``.
+        """
+        return self.changes_since(race_id, 0)
+
+    def changes_since(self, race_id: str, cursor: int = 0) -> Dict[str, Any]:
+        """Searches and pages added to *race_id*'s index after *cursor*, oldest first.
+
+        Same shape as ``list_cached_for_race``; the returned ``cursor`` is the
+        one to pass next time.  Only reads index entries past *cursor*, so
+        refreshing costs O(new entries).
         """
+        self.flush_hits()  # include index entries buffered by recent hits
         now = datetime.utcnow().isoformat()
-        searches: List[Dict[str, Any]] = []
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute(
-                "SELECT query_text, results FROM search_cache "
-                "WHERE race_id = ? AND expires_at > ?",
-                (race_id, now),
-            )
-            all_urls: set = set()
-            for query_text, results_json in rows:
-                try:
-                    results = json.loads(results_json)
-                except (json.JSONDecodeError, TypeError):
-                    results = []
-                urls = [r.get("url", "") for r in results if r.get("url")]
-                searches.append({"query": query_text, "urls": urls})
-                all_urls.update(urls)
-
-            # Also list page-cache URLs that are still valid
-            page_rows = conn.execute(
-                "SELECT url FROM page_cache WHERE expires_at > ?", (now,)
-            )
-            page_urls = [r[0] for r in page_rows if r[0] in all_urls or True]
+        with self._pool.connection() as conn:
+            # Bound the window first so entries added meanwhile are left for the next call.
+            latest = conn.execute("SELECT MAX(seq) FROM race_index WHERE race_id = ?", (race_id,)).fetchone()[0]
+            latest = max(latest or 0, cursor)
+            window = (race_id, cursor, latest)
+            searches: Dict[str, Dict[str, Any]] = {}
+            for query_hash, query_text in conn.execute(
+                "SELECT s.query_hash, s.query_text FROM race_index r "
+                "JOIN search_cache s ON s.query_hash = r.key_hash "
+                "WHERE r.race_id = ? AND r.kind = 'search' AND r.seq > ? AND r.seq <= ? AND s.expires_at > ? "
+                "ORDER BY r.seq",
+                (*window, now),
+            ):
+                searches[query_hash] = {"query": query_text, "urls": []}
+            for query_hash, url in conn.execute(
+                "SELECT u.query_hash, u.url FROM race_index r "
+                "JOIN search_url u ON u.query_hash = r.key_hash "
+                "WHERE r.race_id = ? AND r.kind = 'search' AND r.seq > ? AND r.seq <= ? "
+                "ORDER BY r.seq, u.position",
+                window,
+            ):
+                if query_hash in searches:
+                    searches[query_hash]["urls"].append(url)
+            page_urls = [
+                url
+                for (url,) in conn.execute(
+                    "SELECT p.url FROM race_index r "
+                    "JOIN page_cache p ON p.url_hash = r.key_hash "
+                    "WHERE r.race_id = ? AND r.kind = 'page' AND r.seq > ? AND r.seq <= ? AND p.expires_at > ? "
+                    "ORDER BY r.seq",
+                    (*window, now),
+                )
+            ]
 
-        return {"searches": searches, "page_urls": page_urls}
+        return {"searches": list(searches.values()), "page_urls": page_urls, "cursor": latest}
 
     def clear_all(self) -> int:
         """Clear all cache entries across search and page caches."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write_lock, self._pool.connection() as conn:
             search_cursor = conn.execute("DELETE FROM search_cache")
             page_cursor = conn.execute("DELETE FROM page_cache")
+            conn.execute("DELETE FROM race_index")
+            conn.execute("DELETE FROM search_url")
+            conn.execute("DELETE FROM fetch_failure")
             conn.commit()
             removed = search_cursor.rowcount + page_cursor.rowcount
 
         logger.info(f"Cleared all {removed} cache entries")
         return removed
 
+    def close(self) -> None:
+        """Flush buffered hit counts and close the pooled connections."""
+        self.flush_hits()
+        self._pool.close()
+
 
 # Singleton instance for easy access
-_search_cache_instance: Optional[SearchCache] = None
+_search_cache_instance: Optional["TieredCache"] = None
+
 
+def get_search_cache() -> "TieredCache":
+    """Get or create the global search cache instance.
 
-def get_search_cache() -> SearchCache:
-    """Get or create the global search cache instance."""
+    The local SQLite cache is fronted by an in-process LRU and, when
+    ``SEARCH_CACHE_SHARED`` is set, backed by a shared tier (see
+    ``pipeline_client.agent.cache_tiers``).
+    """
     global _search_cache_instance
     if _search_cache_instance is None:
-        _search_cache_instance = SearchCache()
+        from .cache_tiers import TieredCache
+
+        _search_cache_instance = TieredCache.from_env(SearchCache())
+        atexit.register(_search_cache_instance.close)
     return _search_cache_instance
@@ -0,0 +1,56 @@
+"""Single-flight coalescing for duplicate in-flight network requests.
+
+Concurrent sub-agents often ask for the same search query or page at the same
+moment: both miss ``SearchCache`` and both would pay for the request.
+``SingleFlight.do(key, fn)`` runs ``fn`` once per key while it is in flight
+and hands its result (or exception) to every caller that arrives meanwhile.
+Once the call finishes the key is released, so later callers go back to the
+cache.
+
+The shared call runs in its own task and callers await it through
+``asyncio.shield``: cancelling one caller (e.g. a phase cancelled by the phase
+graph) does not cancel the request the others are waiting on.  Tasks belong
+to one event loop, so there is one ``SingleFlight`` per running loop.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one underlying call."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)`` — *shared* is True when another caller's call was reused."""
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        return await asyncio.shield(task), shared
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every caller was cancelled meanwhile.
+        if not task.cancelled():
+            task.exception()
+
+
+_single_flights_by_loop: Dict[int, SingleFlight] = {}
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the SingleFlight for the running event loop."""
+    loop_id = id(asyncio.get_running_loop())
+    flight = _single_flights_by_loop.get(loop_id)
+    if flight is None:
+        flight = _single_flights_by_loop[loop_id] = SingleFlight()
+    return flight
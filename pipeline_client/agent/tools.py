@@ -41,7 +41,9 @@ FETCH_TOOL: Dict = {
             "result URL looks promising but you need more detail than the snippet "
             "provides — e.g. to read a full article, find an image URL embedded "
             "in a page, or extract specific data from a government site. "
-            "Returns the page's readable text (HTML stripped), truncated to ~8000 characters."
+            "Returns the page's readable text (HTML stripped), truncated to ~16000 characters. "
+            "Pass `focus` to get the passages most relevant to it from anywhere on the page "
+            "instead of just the start of the page."
         ),
         "parameters": {
             "type": "object",
@@ -49,7 +51,14 @@ FETCH_TOOL: Dict = {
                 "url": {
                     "type": "string",
                     "description": "The full URL to fetch.",
-                }
+                },
+                "focus": {
+                    "type": "string",
+                    "description": (
+                        "Optional topic to focus on, e.g. the issue you are researching "
+                        '("Healthcare", "property taxes"). Omit to read the page from the top.'
+                    ),
+                },
             },
             "required": ["url"],
         },
@@ -145,16 +154,16 @@ SET_CANDIDATE_FIELD_TOOL: Dict = {
     "type": "function",
     "function": {
         "name": "set_candidate_field",
-        "description": (
-            "Update a scalar field on a candidate. Allowed fields: party, incumbent, "
-            "website, image_url."
-        ),
+        "description": ("Update a scalar field on a candidate. Allowed fields: party, incumbent, " "website, image_url."),
         "parameters": {
             "type": "object",
             "properties": {
                 "candidate_name": {"type": "string", "description": "Exact candidate name."},
-                "field": {"type": "string", "enum": ["party", "incumbent", "website", "image_url"],
-                          "description": "Field to update."},
+                "field": {
+                    "type": "string",
+                    "enum": ["party", "incumbent", "website", "image_url"],
+                    "description": "Field to update.",
+                },
                 "value": {"description": "New value for the field."},
             },
             "required": ["candidate_name", "field", "value"],
@@ -265,7 +274,10 @@ REMOVE_CAREER_ENTRY_TOOL: Dict = {
             "type": "object",
             "properties": {
                 "candidate_name": {"type": "string", "description": "Exact candidate name."},
-                "organization": {"type": "string", "description": "Organization name to match (case-insensitive, partial match ok)."},
+                "organization": {
+                    "type": "string",
+                    "description": "Organization name to match (case-insensitive, partial match ok).",
+                },
             },
             "required": ["candidate_name", "organization"],
         },
@@ -285,7 +297,10 @@ UPDATE_CAREER_ENTRY_TOOL: Dict = {
             "type": "object",
             "properties": {
                 "candidate_name": {"type": "string", "description": "Exact candidate name."},
-                "organization": {"type": "string", "description": "Organization name to match (case-insensitive, partial match ok)."},
+                "organization": {
+                    "type": "string",
+                    "description": "Organization name to match (case-insensitive, partial match ok).",
+                },
                 "title": {"type": "string", "description": "Corrected role title (omit if unchanged)."},
                 "start_year": {"type": "integer", "description": "Corrected start year (omit if unchanged)."},
                 "end_year": {"type": "integer", "description": "Corrected end year (omit if unchanged)."},
@@ -309,7 +324,10 @@ UPDATE_EDUCATION_ENTRY_TOOL: Dict = {
             "type": "object",
             "properties": {
                 "candidate_name": {"type": "string", "description": "Exact candidate name."},
-                "institution": {"type": "string", "description": "Institution name to match (case-insensitive, partial match ok)."},
+                "institution": {
+                    "type": "string",
+                    "description": "Institution name to match (case-insensitive, partial match ok).",
+                },
                 "degree": {"type": "string", "description": "Corrected degree type (omit if unchanged)."},
                 "field": {"type": "string", "description": "Corrected field of study (omit if unchanged)."},
                 "year": {"type": "integer", "description": "Corrected graduation year (omit if unchanged)."},
@@ -350,9 +368,14 @@ CLEAR_EDUCATION_TOOL: Dict = {
 }
 
 BACKGROUND_TOOLS: List[Dict] = [
-    ADD_CAREER_ENTRY_TOOL, REMOVE_CAREER_ENTRY_TOOL, UPDATE_CAREER_ENTRY_TOOL,
-    ADD_EDUCATION_ENTRY_TOOL, UPDATE_EDUCATION_ENTRY_TOOL,
-    SET_SOCIAL_MEDIA_TOOL, CLEAR_CAREER_TOOL, CLEAR_EDUCATION_TOOL,
+    ADD_CAREER_ENTRY_TOOL,
+    REMOVE_CAREER_ENTRY_TOOL,
+    UPDATE_CAREER_ENTRY_TOOL,
+    ADD_EDUCATION_ENTRY_TOOL,
+    UPDATE_EDUCATION_ENTRY_TOOL,
+    SET_SOCIAL_MEDIA_TOOL,
+    CLEAR_CAREER_TOOL,
+    CLEAR_EDUCATION_TOOL,
 ]
 
 # ---------------------------------------------------------------------------
@@ -370,8 +393,7 @@ SET_ISSUE_STANCE_TOOL: Dict = {
                 "candidate_name": {"type": "string", "description": "Exact candidate name."},
                 "issue": {"type": "string", "description": "Canonical issue name (e.g. 'Healthcare')."},
                 "stance": {"type": "string", "description": "1-2 sentence position description."},
-                "confidence": {"type": "string", "enum": ["high", "medium", "low"],
-                               "description": "Confidence level."},
+                "confidence": {"type": "string", "enum": ["high", "medium", "low"], "description": "Confidence level."},
                 "sources": {
                     "type": "array",
                     "description": "Source URLs supporting this stance.",
@@ -406,7 +428,10 @@ SET_DONOR_SUMMARY_TOOL: Dict = {
             "properties": {
                 "candidate_name": {"type": "string", "description": "Exact candidate name."},
                 "summary": {"type": "string", "description": "2-3 sentence summary of who funds the candidate."},
-                "source_url": {"type": "string", "description": "URL to full donor data (OpenSecrets, FEC, state portal, etc.)."},
+                "source_url": {
+                    "type": "string",
+                    "description": "URL to full donor data (OpenSecrets, FEC, state portal, etc.).",
+                },
             },
             "required": ["candidate_name", "summary"],
         },
@@ -423,7 +448,10 @@ SET_VOTING_SUMMARY_TOOL: Dict = {
             "properties": {
                 "candidate_name": {"type": "string", "description": "Exact candidate name."},
                 "summary": {"type": "string", "description": "2-3 sentence summary of the candidate's voting patterns."},
-                "source_url": {"type": "string", "description": "URL to full voting record (VoteSmart, GovTrack, legislature, etc.)."},
+                "source_url": {
+                    "type": "string",
+                    "description": "URL to full voting record (VoteSmart, GovTrack, legislature, etc.).",
+                },
             },
             "required": ["candidate_name", "summary"],
         },
@@ -443,7 +471,17 @@ ADD_LINK_TOOL: Dict = {
                 "title": {"type": "string", "description": "Human-readable page title."},
                 "type": {
                     "type": "string",
-                    "enum": ["finance", "ballotpedia", "wiki", "official", "legislature", "votesmart", "govtrack", "news", "other"],
+                    "enum": [
+                        "finance",
+                        "ballotpedia",
+                        "wiki",
+                        "official",
+                        "legislature",
+                        "votesmart",
+                        "govtrack",
+                        "news",
+                        "other",
+                    ],
                     "description": "Link category.",
                 },
             },
@@ -494,8 +532,11 @@ UPDATE_RACE_FIELD_TOOL: Dict = {
         "parameters": {
             "type": "object",
             "properties": {
-                "field": {"type": "string", "enum": ["description", "office", "election_date", "polling_note"],
-                          "description": "Field to update."},
+                "field": {
+                    "type": "string",
+                    "enum": ["description", "office", "election_date", "polling_note"],
+                    "description": "Field to update.",
+                },
                 "value": {"type": "string", "description": "New value."},
             },
             "required": ["field", "value"],
@@ -61,10 +61,8 @@ class AgentHandler:
         Creates all pipeline sub-steps upfront so progress is always visible,
         then passes a step_tracker to the agent so phases report back directly.
         """
-        from pipeline_client.agent.agent import run_agent
-        from pipeline_client.backend.models import (
-            ALL_STEPS, PipelineStep, RunStatus, STEP_LABELS, STEP_WEIGHTS,
-        )
+        from pipeline_client.agent.agent import DEFAULT_ISSUE_CONCURRENCY, run_agent
+        from pipeline_client.backend.models import ALL_STEPS, STEP_LABELS, STEP_WEIGHTS, PipelineStep, RunStatus
 
         logger = logging.getLogger("pipeline")
         race_id = payload.get("race_id")
@@ -98,6 +96,7 @@ class AgentHandler:
         try:
             from pipeline_client.backend.pipeline_runner import _safe_broadcast
             from pipeline_client.backend.run_manager import run_manager as _run_manager
+
             # Use explicit run_id passed via options (set by pipeline_runner)
             run_id = options.get("run_id")
             if not run_id:
@@ -208,14 +207,26 @@ class AgentHandler:
             max_candidates=options.get("max_candidates"),
             target_no_info=options.get("target_no_info", False),
             candidate_names=options.get("candidate_names"),
+            issue_concurrency=options.get("issue_concurrency") or DEFAULT_ISSUE_CONCURRENCY,
+            parallel_issues=options.get("parallel_issues", False),
+            checkpoint_store=self.storage_backend,
+            resume=options.get("resume", False),
         )
 
         # Save as draft (not published) — admin must explicitly publish
         draft_path = await self._save_draft(race_id, race_json)
 
+        # The run is safely in drafts/ — its checkpoint is no longer needed
+        if self.storage_backend is not None:
+            try:
+                self.storage_backend.delete_checkpoint(race_id)
+            except Exception:
+                logger.warning("Failed to delete run checkpoint", exc_info=True)
+
         # Update race record metadata from the new draft data
         try:
             from pipeline_client.backend.race_manager import race_manager
+
             race_manager.update_race_metadata(race_id, race_json)
         except Exception:
             logger.warning("Failed to update race metadata after draft save", exc_info=True)
@@ -226,12 +237,16 @@ class AgentHandler:
         # Record pipeline metrics (fire-and-forget)
         try:
             from pipeline_client.backend.pipeline_metrics import get_pipeline_metrics_store
+
             agent_metrics = race_json.get("agent_metrics")
             rid = run_id or f"{race_id}-{int(t0)}"
             candidate_count = len(race_json.get("candidates") or [])
             _cheap_mode = bool(options.get("cheap_mode", True))
             await get_pipeline_metrics_store().record_run(
-                rid, race_id, agent_metrics, "completed",
+                rid,
+                race_id,
+                agent_metrics,
+                "completed",
                 candidate_count=candidate_count,
                 cheap_mode=_cheap_mode,
             )
@@ -373,8 +388,7 @@ class AgentHandler:
                 data = json.loads(blob.download_as_text())
                 if not isinstance(data.get("candidates"), list) or len(data["candidates"]) == 0:
                     logger.warning(
-                        f"Existing GCS file {prefix}/{race_id} has no candidates "
-                        f"(keys: {list(data.keys())}) — skipping"
+                        f"Existing GCS file {prefix}/{race_id} has no candidates " f"(keys: {list(data.keys())}) — skipping"
                     )
                     continue
                 logger.info(f"Loaded existing {race_id} from GCS {prefix}/ for update mode")
@@ -18,6 +18,7 @@ def _validate_race_id(race_id: str) -> None:
     if not _RACE_ID_RE.match(race_id):
         raise HTTPException(status_code=400, detail="Invalid race_id format")
 
+
 from dotenv import load_dotenv
 
 # Load .env from project root so agent can read API keys via os.environ
@@ -65,7 +66,18 @@ async def lifespan(app: FastAPI):
     # Resume queue processing if there are pending items from before restart
     if queue_manager.get_next_pending():
         asyncio.create_task(queue_manager.process_next())
+
+    # Keep the search/page cache bounded: expiry, LRU eviction and vacuum in a worker thread
+    cache_maintenance = None
+    try:
+        from pipeline_client.agent.search_cache import get_search_cache
+
+        cache_maintenance = get_search_cache().start_maintenance()
+    except Exception:
+        logging.exception("Search cache maintenance not started")
     yield
+    if cache_maintenance is not None:
+        cache_maintenance.cancel()
 
 
 app = FastAPI(title=settings.app_name, description="SmarterVote Pipeline API", lifespan=lifespan)
@@ -148,10 +160,7 @@ def _race_summary(data: Dict[str, Any], fallback_id: str) -> Dict[str, Any]:
         "jurisdiction": data.get("jurisdiction"),
         "election_date": data.get("election_date", ""),
         "updated_utc": data.get("updated_utc", ""),
-        "candidates": [
-            {"name": c.get("name", ""), "party": c.get("party")}
-            for c in data.get("candidates", [])
-        ],
+        "candidates": [{"name": c.get("name", ""), "party": c.get("party")} for c in data.get("candidates", [])],
         "agent_metrics": (
             {
                 "estimated_usd": am.get("estimated_usd"),
@@ -718,10 +727,7 @@ async def list_race_runs(race_id: str, limit: int = 20) -> Dict[str, Any]:
     _validate_race_id(race_id)
     runs = race_manager.list_runs(race_id, limit)
     # Also include active runs from run_manager
-    active_runs = [
-        r for r in run_manager.list_active_runs()
-        if r.payload.get("race_id") == race_id
-    ]
+    active_runs = [r for r in run_manager.list_active_runs() if r.payload.get("race_id") == race_id]
     active_ids = {r.run_id for r in active_runs}
     combined = active_runs + [r for r in runs if r.run_id not in active_ids]
     combined.sort(key=lambda r: r.started_at or datetime.min, reverse=True)
@@ -1203,3 +1209,19 @@ async def get_pipeline_metrics_summary() -> Dict[str, Any]:
         return await get_pipeline_metrics_store().get_summary()
     except Exception as exc:
         raise HTTPException(status_code=503, detail=f"Pipeline metrics unavailable: {exc}") from exc
+
+
+@app.get("/pipeline/offload", dependencies=[Depends(verify_token)])
+async def get_pipeline_offload() -> Dict[str, Any]:
+    """Return per-function timing histograms of parsing work run on the CPU-offload executor."""
+    from pipeline_client.agent.offload import timing_histograms
+
+    return timing_histograms()
+
+
+@app.get("/pipeline/http", dependencies=[Depends(verify_token)])
+async def get_pipeline_http() -> Dict[str, Any]:
+    """Return per-host request counts, connection reuse and politeness waits of the agent's HTTP client."""
+    from pipeline_client.agent.http_client import connection_stats
+
+    return connection_stats()
@@ -21,6 +21,7 @@ class PipelineStep(str, Enum):
     Update runs execute the same steps in the same order: 'discovery' maps to roster sync +
     meta update, and 'images' runs right after discovery (same position as fresh runs).
     """
+
     DISCOVERY = "discovery"
     IMAGES = "images"
     ISSUES = "issues"
@@ -62,10 +63,10 @@ class RunOptions(BaseModel):
     note: Optional[str] = None
     force_fresh: bool = False  # Ignore existing data and start from scratch
     # Model overrides (None = use default based on cheap_mode)
-    research_model: Optional[str] = None   # OpenAI model for research phases
-    claude_model: Optional[str] = None     # Claude model for review
-    gemini_model: Optional[str] = None     # Gemini model for review
-    grok_model: Optional[str] = None       # Grok model for review
+    research_model: Optional[str] = None  # OpenAI model for research phases
+    claude_model: Optional[str] = None  # Claude model for review
+    gemini_model: Optional[str] = None  # Gemini model for review
+    grok_model: Optional[str] = None  # Grok model for review
     # Step-level configuration: list of step names to run.
     # None/empty = all steps (backward compatible). Steps not listed are SKIPPED.
     enabled_steps: Optional[List[str]] = None
@@ -73,6 +74,17 @@ class RunOptions(BaseModel):
     max_candidates: Optional[int] = None  # Max candidates to research (None = all)
     target_no_info: bool = False  # Prioritise candidates with least existing info
     candidate_names: Optional[List[str]] = None  # Restrict update/research to named candidates
+    # Issue-phase concurrency (None = agent default)
+    issue_concurrency: Optional[int] = None  # Max issue sub-agents running at once
+    parallel_issues: bool = False  # Also run a candidate's issues concurrently
+    resume: bool = False  # Continue from the last checkpoint instead of starting over
+
+    @field_validator("issue_concurrency")
+    @classmethod
+    def validate_issue_concurrency(cls, value: Optional[int]) -> Optional[int]:
+        if value is not None and value < 1:
+            raise ValueError("issue_concurrency must be at least 1")
+        return value
 
     @field_validator("enabled_steps")
     @classmethod
@@ -101,6 +113,7 @@ class RunOptions(BaseModel):
         if self.enabled_steps and "iteration" in self.enabled_steps and "review" not in self.enabled_steps:
             raise ValueError("'iteration' requires 'review' in enabled_steps")
         return self
+
     candidate_names: Optional[List[str]] = None  # Exact candidate names to target
 
 
@@ -31,6 +31,9 @@ class QueueItemOptions(BaseModel):
     target_no_info: bool = False
     candidate_names: Optional[List[str]] = None
     candidate_names: Optional[List[str]] = None
+    issue_concurrency: Optional[int] = None
+    parallel_issues: bool = False
+    resume: bool = False
 
 
 class QueueItem(BaseModel):
@@ -83,12 +86,15 @@ class QueueManager:
 
         try:
             from google.cloud import firestore  # type: ignore
+
             self._db = firestore.Client(project=project)
             self._use_firestore = True
             logging.getLogger(__name__).info(f"QueueManager: using Firestore project={project} collection=pipeline_queue")
         except ImportError:
             if is_cloud_run:
-                raise RuntimeError("Cloud Run detected but google-cloud-firestore not installed. Install with: pip install google-cloud-firestore")
+                raise RuntimeError(
+                    "Cloud Run detected but google-cloud-firestore not installed. Install with: pip install google-cloud-firestore"
+                )
             logging.getLogger(__name__).warning("google-cloud-firestore not installed; using local JSON file")
         except Exception as e:
             if is_cloud_run:
@@ -237,6 +243,7 @@ class QueueManager:
                 if was_running and run_id:
                     try:
                         from .run_manager import run_manager
+
                         run_manager.cancel_run(run_id)
                         logger = logging.getLogger(__name__)
                         logger.info(f"Queue: cancelled queue item {item_id}, also cancelled run {run_id}")
@@ -2,20 +2,24 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Protocol, runtime_checkable
+from typing import Any, Dict, Optional, Protocol, runtime_checkable
 
 
 @runtime_checkable
 class StorageBackend(Protocol):
     """Protocol for storage backends."""
 
-    def save_artifact(self, artifact_id: str, data: Dict[str, Any]) -> str: ...
+    def save_artifact(self, artifact_id: str, data: Dict[str, Any]) -> str:
+        ...
 
-    def load_artifact(self, artifact_id: str) -> Dict[str, Any]: ...
+    def load_artifact(self, artifact_id: str) -> Dict[str, Any]:
+        ...
 
-    def list_artifacts(self) -> Dict[str, Any]: ...
+    def list_artifacts(self) -> Dict[str, Any]:
+        ...
 
-    def save_race_json(self, race_id: str, data: Dict[str, Any]) -> str: ...
+    def save_race_json(self, race_id: str, data: Dict[str, Any]) -> str:
+        ...
 
     def save_web_content(
         self,
@@ -24,7 +28,17 @@ class StorageBackend(Protocol):
         content: bytes | str,
         content_type: str | None = None,
         kind: str = "raw",
-    ) -> str: ...
+    ) -> str:
+        ...
+
+    def save_checkpoint(self, race_id: str, data: Dict[str, Any]) -> str:
+        ...
+
+    def load_checkpoint(self, race_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def delete_checkpoint(self, race_id: str) -> None:
+        ...
 
 
 class LocalStorageBackend:
@@ -41,6 +55,8 @@ class LocalStorageBackend:
         self.extracted_dir.mkdir(parents=True, exist_ok=True)
         self.relevant_dir = self.artifacts_dir / "relevant"
         self.relevant_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoints_dir = self.artifacts_dir / "checkpoints"
+        self.checkpoints_dir.mkdir(parents=True, exist_ok=True)
 
     def _artifact_path(self, artifact_id: str) -> Path:
         return self.artifacts_dir / f"{artifact_id}.json"
@@ -97,6 +113,23 @@ class LocalStorageBackend:
             path.write_text(content, encoding="utf-8")
         return str(path)
 
+    def save_checkpoint(self, race_id: str, data: Dict[str, Any]) -> str:
+        path = self.checkpoints_dir / f"{race_id}.json"
+        # Write-then-rename so a crash mid-write never leaves a torn checkpoint
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+        return str(path)
+
+    def load_checkpoint(self, race_id: str) -> Optional[Dict[str, Any]]:
+        path = self.checkpoints_dir / f"{race_id}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def delete_checkpoint(self, race_id: str) -> None:
+        (self.checkpoints_dir / f"{race_id}.json").unlink(missing_ok=True)
+
 
 class GCPStorageBackend:
     """GCP storage using GCS for all data (artifacts, race JSON, and web content)."""
@@ -154,3 +187,19 @@ class GCPStorageBackend:
         else:
             blob.upload_from_string(content, content_type=content_type or "text/plain")
         return f"gs://{self.bucket.name}/{race_id}/{kind}/{filename}"
+
+    def save_checkpoint(self, race_id: str, data: Dict[str, Any]) -> str:
+        blob = self.bucket.blob(f"checkpoints/{race_id}.json")
+        blob.upload_from_string(json.dumps(data), content_type="application/json")
+        return f"gs://{self.bucket.name}/checkpoints/{race_id}.json"
+
+    def load_checkpoint(self, race_id: str) -> Optional[Dict[str, Any]]:
+        blob = self.bucket.blob(f"checkpoints/{race_id}.json")
+        if not blob.exists():
+            return None
+        return json.loads(blob.download_as_text())
+
+    def delete_checkpoint(self, race_id: str) -> None:
+        blob = self.bucket.blob(f"checkpoints/{race_id}.json")
+        if blob.exists():
+            blob.delete()
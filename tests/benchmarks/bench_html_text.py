@@ -0,0 +1,153 @@
+"""Microbenchmark for page text extraction: ``extract_text`` vs the regex stripper it replaced.
+
+Runs both extractors over a set of HTML pages and reports, per variant,
+MB/s of HTML processed and ms per page; ``extract_text`` is measured both
+unbounded and with the production ``_PAGE_STORE_MAX_CHARS`` limit (where it
+stops early).  Parity is the word-level similarity of the first
+``_PARITY_WORDS`` words of both outputs, about what the model sees of a page
+(1.0 = the same words in the same order); the new extractor also decodes
+every HTML entity, so pages with ``&rsquo;`` and the like score a bit lower.
+
+Point ``--pages`` at a directory of saved campaign pages (``*.html``)::
+
+    python -m tests.benchmarks.bench_html_text --pages data/pages --out report.json
+
+Without it two synthetic pages are used: a ~1 MB campaign-site page (nav,
+inline scripts, a large JSON blob in a script tag, paragraphs of issue text)
+and a page whose scripts close with ``</script >``, which the regex's
+lazy ``.*?</script>`` cannot match, so it rescans the rest of the page for
+every script.  On that page the regex also leaks script source into the text,
+hence its low parity.
+"""
+
+import argparse
+import json
+import re
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from pipeline_client.agent.agent import _PAGE_STORE_MAX_CHARS
+from pipeline_client.agent.html_text import extract_text
+
+_PARITY_WORDS = 3000
+
+
+def regex_strip_html(html: str) -> str:
+    """The multi-pass regex stripper ``extract_text`` replaced (kept for comparison)."""
+    text = re.sub(r"<(script|style|noscript)[^>]*>.*?</\1>", "", html, flags=re.DOTALL | re.IGNORECASE)
+    text = re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
+    text = re.sub(r"</(p|div|li|h[1-6]|tr|br)[^>]*>", "\n", text, flags=re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", " ", text)
+    for entity, char in [
+        ("&amp;", "&"),
+        ("&lt;", "<"),
+        ("&gt;", ">"),
+        ("&nbsp;", " "),
+        ("&quot;", '"'),
+        ("&#39;", "'"),
+    ]:
+        text = text.replace(entity, char)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text)
+    return text.strip()
+
+
+def synthetic_page(paragraphs: int = 4000) -> str:
+    """A campaign-site-like page: heavy head, nav, inline scripts and many paragraphs of text."""
+    state = json.dumps({"props": {"items": [{"id": i, "body": "<p>hidden</p>" * 3} for i in range(500)]}})
+    nav = "".join(f'<li><a href="/p{i}">Page {i}</a></li>' for i in range(40))
+    body = "".join(
+        f'<div class="issue"><h2>Issue {i}</h2><p>Jane Doe &amp; her team will <b>fight</b> for '
+        f"lower costs in district {i}.&nbsp;She said &quot;we can do it&quot;.</p>"
+        f"<script>track({i});</script><p>Second paragraph about policy {i}<br/>with a break.</p></div>\n"
+        for i in range(paragraphs)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Jane Doe for Senate</title>"
+        "<style>.issue{margin:0}</style>"
+        + "<script>var x = 1;</script>" * 20
+        + f"</head><body><nav><ul>{nav}</ul></nav><!-- main -->{body}"
+        f'<script id="__NEXT_DATA__" type="application/json">{state}</script></body></html>'
+    )
+
+
+def spaced_closer_page(scripts: int = 2000) -> str:
+    """Valid HTML whose end tags carry a space (``</script >``), the regex stripper's worst case."""
+    return (
+        "<html><body><p>Jane Doe for Senate</p>"
+        + "<script>track(1);</script >" * scripts
+        + ("<p>Jane supports lower costs.</p>" * scripts + "</body></html>")
+    )
+
+
+def _parity(a: str, b: str) -> float:
+    a_words, b_words = a.split()[:_PARITY_WORDS], b.split()[:_PARITY_WORDS]
+    return round(SequenceMatcher(None, a_words, b_words, autojunk=False).ratio(), 4)
+
+
+def _time(fn: Callable[[str], str], pages: List[str], repeat: int) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            fn(page)
+    elapsed = time.perf_counter() - t0
+    mb = sum(len(p) for p in pages) * repeat / 1e6
+    return {
+        "mb_per_s": round(mb / elapsed, 2),
+        "ms_per_page": round(1000 * elapsed / (len(pages) * repeat), 3),
+    }
+
+
+def run_benchmark(pages_dir: Optional[str] = None, *, repeat: int = 3) -> Dict[str, Any]:
+    """Time both extractors over the pages in *pages_dir* (or synthetic pages) and measure output parity."""
+    if pages_dir:
+        paths = sorted(Path(pages_dir).glob("*.htm*"))
+        named = {p.name: p.read_text(encoding="utf-8", errors="replace") for p in paths}
+        source = f"{len(named)} pages from {pages_dir}"
+    else:
+        named = {"campaign": synthetic_page(), "spaced_closers": spaced_closer_page()}
+        source = "synthetic pages"
+    if not named:
+        raise SystemExit(f"No .html pages in {pages_dir}")
+    pages = list(named.values())
+
+    parity = {name: _parity(regex_strip_html(html), extract_text(html)) for name, html in named.items()}
+    return {
+        "config": {"source": source, "pages": len(pages), "html_mb": round(sum(map(len, pages)) / 1e6, 2), "repeat": repeat},
+        "variants": {
+            "regex": _time(regex_strip_html, pages, repeat),
+            "extract_text": _time(extract_text, pages, repeat),
+            "extract_text (limit)": _time(lambda p: extract_text(p, _PAGE_STORE_MAX_CHARS), pages, repeat),
+        },
+        "parity": {
+            "mean": round(sum(parity.values()) / len(parity), 4),
+            "min": min(parity.values()),
+            "pages": parity,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Page text extraction microbenchmark")
+    parser.add_argument("--pages", help="Directory of saved .html pages (default: synthetic pages)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the page set")
+    parser.add_argument("--out", help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.pages, repeat=args.repeat)
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"{report['config']['source']} ({report['config']['html_mb']} MB)")
+    for name, result in report["variants"].items():
+        print(f"{name:>22}: {result['mb_per_s']:>8} MB/s, {result['ms_per_page']} ms/page")
+    for name, parity in report["parity"]["pages"].items():
+        print(f"{'parity ' + name[:15]:>22}: {parity}")
+
+
+if __name__ == "__main__":
+    main()
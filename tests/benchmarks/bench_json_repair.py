@@ -0,0 +1,147 @@
+"""Benchmark and regression set for JSON extraction from model answers: repair parser vs the old extractor.
+
+The corpus is a directory of raw model answers (``*.txt``) that failed to
+parse, in the format ``_agent_loop`` writes to ``AGENT_JSON_FAILURES_DIR``.
+An optional ``expected.json`` in it maps file names to the value each
+answer should parse to (``null`` = must still fail, so the model is asked
+again).  The checked-in ``json_failures/`` corpus covers the slips seen in
+phase answers: Python literals, trailing / doubled / missing commas, raw
+newlines and tabs in strings, stray escapes and quotes, surrounding prose
+and truncation.
+
+For each variant the report gives how many answers parse (each one a
+"not valid JSON" re-prompt avoided) and µs per answer; for the repair parser
+also how often each repair was applied.  With ``expected.json`` answers
+only count when they parse to the expected value (the old extractor often
+"succeeds" on an inner list of the answer), and ``mismatches`` lists the
+answers where the repair parser gets it wrong::
+
+    python -m tests.benchmarks.bench_json_repair --corpus data/json_failures --out report.json
+"""
+
+import argparse
+import json
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from pipeline_client.agent.utils import _extract_json_with_repairs
+
+DEFAULT_CORPUS = Path(__file__).parent / "json_failures"
+
+
+def legacy_extract_json(text: str) -> Any:
+    """The fence-strip + balanced-block extractor the repair parser replaced (kept for comparison)."""
+    cleaned = text.strip()
+    cleaned = re.sub(r"^```(?:json)?\s*", "", cleaned)
+    cleaned = re.sub(r"\s*```\s*$", "", cleaned)
+    cleaned = cleaned.strip()
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        pass
+    for open_ch, close_ch in [("{", "}"), ("[", "]")]:
+        start = cleaned.find(open_ch)
+        if start == -1:
+            continue
+        depth = 0
+        in_string = False
+        escape_next = False
+        for i, ch in enumerate(cleaned[start:], start):
+            if escape_next:
+                escape_next = False
+            elif ch == "\\" and in_string:
+                escape_next = True
+            elif ch == '"':
+                in_string = not in_string
+            elif not in_string and ch == open_ch:
+                depth += 1
+            elif not in_string and ch == close_ch:
+                depth -= 1
+                if depth == 0:
+                    try:
+                        return json.loads(cleaned[start : i + 1])
+                    except json.JSONDecodeError:
+                        break
+    return json.loads(cleaned)
+
+
+def _parse(fn: Callable[[str], Any], text: str) -> Any:
+    try:
+        return fn(text)
+    except (json.JSONDecodeError, ValueError):
+        return None
+
+
+def _run(fn: Callable[[str], Any], named: Dict[str, str], expected: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for text in named.values():
+            _parse(fn, text)
+    elapsed = time.perf_counter() - t0
+    results = {name: _parse(fn, text) for name, text in named.items()}
+    return {
+        "parsed": sum(value is not None for value in results.values()),
+        # Parsed to the expected value (a wrong parse is worse than a re-prompt)
+        "correct": sum(results[name] == value for name, value in expected.items() if name in results),
+        "us_per_answer": round(1e6 * elapsed / (len(named) * repeat), 1),
+        "mismatches": [name for name, value in expected.items() if name in results and results[name] != value],
+    }
+
+
+def run_benchmark(corpus_dir: Optional[str] = None, *, repeat: int = 20) -> Dict[str, Any]:
+    """Parse every answer in *corpus_dir* (default: the checked-in corpus) with both extractors."""
+    corpus = Path(corpus_dir) if corpus_dir else DEFAULT_CORPUS
+    named = {p.name: p.read_text(encoding="utf-8") for p in sorted(corpus.glob("*.txt"))}
+    if not named:
+        raise SystemExit(f"No .txt answers in {corpus}")
+    expected_path = corpus / "expected.json"
+    expected = json.loads(expected_path.read_text(encoding="utf-8")) if expected_path.exists() else {}
+
+    repairs: Counter = Counter()
+    for text in named.values():
+        try:
+            repairs.update(_extract_json_with_repairs(text)[1])
+        except (json.JSONDecodeError, ValueError):
+            pass
+
+    variants = {
+        "legacy": _run(legacy_extract_json, named, expected, repeat),
+        "repair": _run(lambda text: _extract_json_with_repairs(text)[0], named, expected, repeat),
+    }
+    key = "correct" if expected else "parsed"
+    return {
+        "config": {"corpus": str(corpus), "answers": len(named), "with_expected": len(expected), "repeat": repeat},
+        "variants": {name: {k: v for k, v in result.items() if k != "mismatches"} for name, result in variants.items()},
+        "retries_avoided": variants["repair"][key] - variants["legacy"][key],
+        "repairs": dict(repairs.most_common()),
+        "mismatches": variants["repair"]["mismatches"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON repair benchmark over a corpus of failed model answers")
+    parser.add_argument("--corpus", help=f"Directory of failed answers (*.txt); default {DEFAULT_CORPUS}")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the corpus for timing")
+    parser.add_argument("--out", help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.corpus, repeat=args.repeat)
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"{report['config']['answers']} answers from {report['config']['corpus']}")
+    for name, result in report["variants"].items():
+        print(f"{name:>8}: {result['parsed']} parsed, {result['correct']} as expected, {result['us_per_answer']} µs/answer")
+    print(f"re-prompts avoided: {report['retries_avoided']}")
+    for name, count in report["repairs"].items():
+        print(f"{name:>16}: {count}")
+    if report["mismatches"]:
+        print(f"MISMATCHES: {', '.join(report['mismatches'])}")
+
+
+if __name__ == "__main__":
+    main()
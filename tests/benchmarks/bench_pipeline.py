@@ -0,0 +1,238 @@
+"""Offline end-to-end benchmark for ``run_agent`` (fresh and update modes).
+
+Runs the full pipeline against the local stand-ins in ``standins.py`` and
+reports, per mode:
+
+* wall time per ``PipelineStep`` (from the step tracker) and in total
+* LLM calls and prompt/completion tokens per step
+* search / page cache hit ratios (tool calls vs. requests that reached the stand-ins)
+* peak RSS of the process
+
+Usage::
+
+    python -m tests.benchmarks.bench_pipeline --candidates 3 --llm-latency 0.05 \\
+        --out data/benchmarks/latest.json
+
+The JSON output carries the git commit so runs can be compared across commits.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+from unittest.mock import patch
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from pipeline_client.agent.agent import run_agent
+from pipeline_client.agent.search_cache import SearchCache
+from pipeline_client.backend.models import ALL_STEPS
+
+from .standins import StandIns
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_RACE_ID = "bench-senate-2026"
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+@contextmanager
+def _patched_env(values: Dict[str, Optional[str]]) -> Iterator[None]:
+    saved = {k: os.environ.get(k) for k in values}
+    try:
+        for key, value in values.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _ratio(hits: int, total: int) -> Optional[float]:
+    return round(hits / total, 3) if total else None
+
+
+def _delta(after: Dict[str, Any], before: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-run difference of two ``StandIns.snapshot()`` dicts."""
+    out: Dict[str, Any] = {}
+    for key, value in after.items():
+        prev = before.get(key, {})
+        if key == "tokens":
+            out[key] = {
+                phase: {t: n - prev.get(phase, {}).get(t, 0) for t, n in counts.items()} for phase, counts in value.items()
+            }
+        else:
+            out[key] = {k: v - prev.get(k, 0) for k, v in value.items()}
+    return out
+
+
+async def _run_mode(
+    standins: StandIns,
+    race_id: str,
+    *,
+    existing_data: Dict[str, Any],
+    issue_concurrency: int,
+) -> Dict[str, Any]:
+    step_times: Dict[str, Dict[str, Any]] = {}
+    started: Dict[str, float] = {}
+
+    def _start(step: str, **_: Any) -> None:
+        started[step] = time.perf_counter()
+
+    def _complete(step: str, **_: Any) -> None:
+        t0 = started.get(step)
+        step_times[step] = {"status": "completed", "wall_s": round(time.perf_counter() - t0, 3) if t0 else None}
+
+    def _skip(step: str, **_: Any) -> None:
+        step_times.setdefault(step, {"status": "skipped", "wall_s": 0.0})
+
+    before = standins.snapshot()
+    t0 = time.perf_counter()
+    result = await run_agent(
+        race_id,
+        existing_data=existing_data,
+        step_tracker={"start": _start, "complete": _complete, "skip": _skip},
+        issue_concurrency=issue_concurrency,
+    )
+    wall_s = time.perf_counter() - t0
+    delta = _delta(standins.snapshot(), before)
+
+    searches = delta["tool_calls"].get("web_search", 0)
+    fetches = delta["tool_calls"].get("fetch_page", 0)
+    serper_requests = delta["counters"].get("serper_requests", 0)
+    page_requests = delta["counters"].get("page_requests", 0)
+    metrics = result.get("agent_metrics", {})
+    return {
+        "wall_s": round(wall_s, 3),
+        "steps": {step: step_times.get(step, {"status": "not_run", "wall_s": None}) for step in ALL_STEPS},
+        "llm_calls": delta["calls"],
+        "llm_calls_total": sum(delta["calls"].values()),
+        "tokens_by_step": delta["tokens"],
+        "prompt_tokens": metrics.get("prompt_tokens"),
+        "completion_tokens": metrics.get("completion_tokens"),
+        "search_cache_hit_ratio": _ratio(max(searches - serper_requests, 0), searches),
+        "page_cache_hit_ratio": _ratio(max(fetches - page_requests, 0), fetches),
+        "tool_calls": delta["tool_calls"],
+        "requests": delta["counters"],
+        "candidates": len(result.get("candidates", [])),
+        "peak_rss_mb": _peak_rss_mb(),
+    }, result
+
+
+async def run_benchmark(
+    *,
+    race_id: str = DEFAULT_RACE_ID,
+    n_candidates: int = 2,
+    llm_latency_s: float = 0.0,
+    search_latency_s: float = 0.0,
+    page_latency_s: float = 0.0,
+    issue_concurrency: int = 3,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run a fresh and then an update pass for *race_id*; return the report dict."""
+    report: Dict[str, Any] = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "race_id": race_id,
+            "candidates": n_candidates,
+            "llm_latency_s": llm_latency_s,
+            "search_latency_s": search_latency_s,
+            "page_latency_s": page_latency_s,
+            "issue_concurrency": issue_concurrency,
+        },
+        "runs": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SearchCache(cache_dir=cache_dir or tmp)
+        with (
+            StandIns(
+                race_id,
+                n_candidates=n_candidates,
+                llm_latency_s=llm_latency_s,
+                search_latency_s=search_latency_s,
+                page_latency_s=page_latency_s,
+            ) as standins,
+            _patched_env(standins.env()),
+            patch("pipeline_client.agent.agent._get_search_cache", return_value=cache),
+        ):
+            report["runs"]["fresh"], fresh = await _run_mode(
+                standins, race_id, existing_data={}, issue_concurrency=issue_concurrency
+            )
+            report["runs"]["update"], _ = await _run_mode(
+                standins, race_id, existing_data=fresh, issue_concurrency=issue_concurrency
+            )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark for run_agent")
+    parser.add_argument("--race-id", default=DEFAULT_RACE_ID)
+    parser.add_argument("--candidates", type=int, default=2)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds added to each LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.0, help="Seconds added to each search")
+    parser.add_argument("--page-latency", type=float, default=0.0, help="Seconds added to each page fetch")
+    parser.add_argument("--issue-concurrency", type=int, default=3)
+    parser.add_argument("--out", help="Write the JSON report here (default: data/benchmarks/<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_benchmark(
+            race_id=args.race_id,
+            n_candidates=args.candidates,
+            llm_latency_s=args.llm_latency,
+            search_latency_s=args.search_latency,
+            page_latency_s=args.page_latency,
+            issue_concurrency=args.issue_concurrency,
+        )
+    )
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out = Path(args.out) if args.out else ROOT / "data" / "benchmarks" / f"{report['commit'] or 'nogit'}-{stamp}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for mode, run in report["runs"].items():
+        steps = ", ".join(f"{s}={v['wall_s']}s" for s, v in run["steps"].items() if v["status"] == "completed")
+        print(
+            f"{mode:>6}: {run['wall_s']}s, {run['llm_calls_total']} LLM calls, "
+            f"{run['prompt_tokens']}→{run['completion_tokens']} tokens, "
+            f"search hit {run['search_cache_hit_ratio']}, page hit {run['page_cache_hit_ratio']} | {steps}"
+        )
+    print(f"Report written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Microbenchmark for ``SearchCache`` under concurrent sub-agents.
+
+Each simulated sub-agent issues a mix of cache operations (mostly search hits,
+some page hits, misses and writes) and yields to the event loop between them,
+the way issue sub-agents interleave tool calls.  Reported per variant:
+
+* ops/sec across all sub-agents
+* the longest event-loop stall seen by a 1 ms ticker (how long other
+  sub-agents were frozen behind SQLite work)
+
+``--baseline REF`` loads ``search_cache.py`` as it was at git ref *REF* and
+runs the same workload against it with its synchronous API, for a before /
+after comparison::
+
+    python -m tests.benchmarks.bench_search_cache --agents 12 --ops 400 --baseline HEAD~1
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+import pipeline_client.agent.search_cache as current_search_cache
+
+ROOT = Path(__file__).resolve().parents[2]
+_MODULE_PATH = "pipeline_client/agent/search_cache.py"
+_N_QUERIES = 200
+_N_PAGES = 100
+
+
+def _load_module_at(ref: str) -> ModuleType:
+    """Import ``search_cache.py`` from git ref *ref* as a standalone module."""
+    source = subprocess.run(
+        ["git", "show", f"{ref}:{_MODULE_PATH}"], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    spec = importlib.util.spec_from_loader(f"_search_cache_at_{ref}", loader=None)
+    module = importlib.util.module_from_spec(spec)
+    exec(compile(source, f"{ref}:{_MODULE_PATH}", "exec"), module.__dict__)
+    return module
+
+
+def _seed(cache: Any) -> None:
+    for i in range(_N_QUERIES):
+        cache.set(
+            f"query {i}",
+            [{"title": f"T{i}", "snippet": "s" * 200, "url": f"https://e.example/{i}"}] * 8,
+            race_id="bench-race",
+            provider="serper",
+        )
+    for i in range(_N_PAGES):
+        cache.set_page(f"https://e.example/{i}", f"page {i} " + "x" * 8000)
+
+
+async def _run_workload(cache: Any, *, agents: int, ops: int, use_async: bool) -> Dict[str, Any]:
+    stalls: List[float] = []
+    done = asyncio.Event()
+
+    async def _ticker() -> None:
+        while not done.is_set():
+            t = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append(time.perf_counter() - t - 0.001)
+
+    async def _agent(agent_id: int) -> None:
+        rng = random.Random(agent_id)
+        for n in range(ops):
+            r = rng.random()
+            i = rng.randrange(int(_N_QUERIES * 1.1))  # ~10% misses
+            if r < 0.70:
+                await cache.aget(f"query {i}", "bench-race") if use_async else cache.get(f"query {i}", "bench-race")
+            elif r < 0.85:
+                url = f"https://e.example/{i % (_N_PAGES + 10)}"
+                await cache.aget_page(url) if use_async else cache.get_page(url)
+            elif r < 0.95:
+                results = [{"title": "new", "url": f"https://n.example/{agent_id}/{n}"}]
+                if use_async:
+                    await cache.aset(f"new {agent_id} {n}", results, race_id="bench-race", provider="serper")
+                else:
+                    cache.set(f"new {agent_id} {n}", results, race_id="bench-race", provider="serper")
+            else:
+                url, text = f"https://n.example/{agent_id}/{n}", "y" * 4000
+                await cache.aset_page(url, text) if use_async else cache.set_page(url, text)
+            await asyncio.sleep(0)
+
+    ticker = asyncio.ensure_future(_ticker())
+    t0 = time.perf_counter()
+    await asyncio.gather(*[_agent(a) for a in range(agents)])
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await ticker
+    return {
+        "ops": agents * ops,
+        "wall_s": round(elapsed, 3),
+        "ops_per_s": round(agents * ops / elapsed, 1),
+        "max_loop_stall_ms": round(max(stalls, default=0.0) * 1000, 2),
+    }
+
+
+async def run_benchmark(*, agents: int = 8, ops: int = 200, baseline: Optional[str] = None) -> Dict[str, Any]:
+    """Run the workload against the current cache (and *baseline*, if given)."""
+    variants = [("current", current_search_cache, True)]
+    if baseline:
+        variants.insert(0, (f"baseline@{baseline}", _load_module_at(baseline), False))
+
+    report: Dict[str, Any] = {"config": {"agents": agents, "ops_per_agent": ops}, "variants": {}}
+    for name, module, use_async in variants:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = module.SearchCache(cache_dir=tmp)
+            _seed(cache)
+            report["variants"][name] = await _run_workload(cache, agents=agents, ops=ops, use_async=use_async)
+            if hasattr(cache, "close"):
+                cache.close()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SearchCache microbenchmark under concurrent sub-agents")
+    parser.add_argument("--agents", type=int, default=8, help="Concurrent simulated sub-agents")
+    parser.add_argument("--ops", type=int, default=200, help="Cache operations per sub-agent")
+    parser.add_argument("--baseline", help="Git ref whose search_cache.py to compare against (e.g. HEAD~1)")
+    parser.add_argument("--out", help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(agents=args.agents, ops=args.ops, baseline=args.baseline))
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    for name, result in report["variants"].items():
+        print(
+            f"{name:>20}: {result['ops_per_s']:>9} ops/s, max loop stall {result['max_loop_stall_ms']} ms "
+            f"({result['ops']} ops in {result['wall_s']}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
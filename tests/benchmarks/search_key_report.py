@@ -0,0 +1,100 @@
+"""How many Serper calls race-independent search keys save on a cache database.
+
+Before ``search_key`` every search was cached under its raw text plus its
+race, so each distinct (query, race) pair in the cache cost one Serper call.
+With normalized, race-shared keys it costs one call per distinct key.  This
+report reads a ``search_cache.db`` and compares the two:
+
+* a database from before the re-keying (``PRAGMA user_version`` < 2) is read
+  as the query log it is — one row per (raw query, race) — and every row is
+  re-keyed with ``search_key``;
+* an already re-keyed database only has race associations left (``search_race``,
+  or ``race_index`` search entries from schema version 3 on), so
+  the old call count is estimated as one call per (key, race) pair, a lower
+  bound (it misses variants of one query within a race).
+
+Run it against a copy of the production cache before deploying, e.g. for the
+53-race corpus::
+
+    python -m tests.benchmarks.search_key_report data/cache/search_cache.db --out report.json
+
+Rows are read without opening the file through ``SearchCache``, so the
+database is not migrated.
+"""
+
+import argparse
+import json
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict
+
+from pipeline_client.agent.search_cache import DEFAULT_NUM_RESULTS, search_key
+
+
+def _drop(old: int, new: int) -> Dict[str, Any]:
+    return {
+        "serper_calls_before": old,
+        "serper_calls_after": new,
+        "calls_saved": old - new,
+        "drop_pct": round(100 * (old - new) / old, 1) if old else 0.0,
+    }
+
+
+def key_report(db_path: str | Path) -> Dict[str, Any]:
+    """Compare per-(query, race) keys with ``search_key`` over the searches cached in *db_path*."""
+    conn = sqlite3.connect(db_path)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 2:
+            rows = conn.execute("SELECT query_text, race_id FROM search_cache").fetchall()
+            old_keys = {(query, race or "") for query, race in rows}
+            new_keys = {search_key(query, DEFAULT_NUM_RESULTS) for query, _ in old_keys}
+            # What normalization alone saves, keeping the race in the key
+            within_race = {(search_key(query, DEFAULT_NUM_RESULTS), race) for query, race in old_keys}
+            races_per_key = Counter(key for key, race in within_race if race)
+            report = {"source": "legacy", **_drop(len(old_keys), len(new_keys))}
+            report["normalization_only"] = _drop(len(old_keys), len(within_race))
+        else:
+            races = (
+                "(SELECT race_id, query_hash FROM search_race)"
+                if version == 2
+                else "(SELECT race_id, key_hash AS query_hash FROM race_index WHERE kind = 'search')"
+            )
+            pairs = conn.execute(
+                f"SELECT r.query_hash FROM {races} r JOIN search_cache s ON s.query_hash = r.query_hash"
+            ).fetchall()
+            n_keys = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+            races_per_key = Counter(h for (h,) in pairs)
+            report = {"source": "rekeyed (lower bound)", **_drop(len(pairs), n_keys)}
+        report["races"] = conn.execute(
+            f"SELECT COUNT(DISTINCT race_id) FROM {races}"
+            if version >= 2
+            else "SELECT COUNT(DISTINCT race_id) FROM search_cache WHERE race_id IS NOT NULL"
+        ).fetchone()[0]
+        report["keys_shared_by_several_races"] = sum(1 for n in races_per_key.values() if n > 1)
+        return report
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serper call volume under race-independent search keys")
+    parser.add_argument("db", help="Path to a search_cache.db")
+    parser.add_argument("--out", help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    report = key_report(args.db)
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(
+        f"{report['races']} races, {report['source']}: {report['serper_calls_before']} -> "
+        f"{report['serper_calls_after']} Serper calls ({report['drop_pct']}% fewer); "
+        f"{report['keys_shared_by_several_races']} queries shared by several races"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Local stand-in servers for offline pipeline benchmarks.
+
+* **LLM** – an OpenAI-compatible ``/v1/chat/completions`` endpoint driven by
+  ``ScriptedLLM``: every agent loop searches once, fetches the top result,
+  records an issue stance where the tool is offered, then answers with a
+  phase-appropriate payload.  Calls and token usage are counted per
+  ``PipelineStep``.
+* **Serper** – ``POST /search`` returning deterministic organic results that
+  link to the page host.
+* **Pages** – ``GET /pages/{slug}`` (HTML long enough to skip the proxy
+  fallback) and ``/img/{name}.jpg`` headshots for image verification.
+
+Each server runs uvicorn on its own thread and an ephemeral localhost port, and
+can inject a fixed latency per request.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import socket
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse, JSONResponse
+
+from pipeline_client.agent.prompts import (
+    CANONICAL_ISSUES,
+    DISCOVERY_SYSTEM,
+    FINANCE_VOTING_SYSTEM,
+    IMAGE_SEARCH_SYSTEM,
+    ISSUE_SUBAGENT_SYSTEM,
+    ITERATE_SYSTEM,
+    REFINE_SYSTEM,
+    ROSTER_SYNC_SYSTEM,
+    UPDATE_ISSUE_SUBAGENT_SYSTEM,
+    UPDATE_META_SYSTEM,
+)
+
+# System prompt → PipelineStep the call is attributed to.
+_PHASE_BY_SYSTEM = {
+    DISCOVERY_SYSTEM: "discovery",
+    ROSTER_SYNC_SYSTEM: "discovery",
+    UPDATE_META_SYSTEM: "discovery",
+    IMAGE_SEARCH_SYSTEM: "images",
+    ISSUE_SUBAGENT_SYSTEM: "issues",
+    UPDATE_ISSUE_SUBAGENT_SYSTEM: "issues",
+    FINANCE_VOTING_SYSTEM: "finance",
+    REFINE_SYSTEM: "refinement",
+    ITERATE_SYSTEM: "iteration",
+}
+
+_PARTIES = ["Democratic", "Republican", "Libertarian", "Green", "Independent"]
+_ISSUE_LINE = re.compile(r"^Issue to (?:research|update): (.+)$", re.MULTILINE)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _estimate_tokens(value: Any) -> int:
+    return max(1, len(json.dumps(value, default=str)) // 4)
+
+
+class ScriptedLLM:
+    """Deterministic agent behaviour for one benchmark race."""
+
+    def __init__(self, race_id: str, n_candidates: int, page_host: str):
+        self.race_id = race_id
+        self.page_host = page_host
+        self.candidates = [f"Bench Candidate {chr(ord('A') + i)}" for i in range(n_candidates)]
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.tokens: Dict[str, Dict[str, int]] = defaultdict(lambda: {"prompt_tokens": 0, "completion_tokens": 0})
+        self.tool_calls: Dict[str, int] = defaultdict(int)
+        self._ids = 0
+
+    # -- payloads ------------------------------------------------------------
+
+    def _race_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.race_id,
+            "title": f"Benchmark race {self.race_id}",
+            "office": "U.S. Senate",
+            "jurisdiction": "Benchmark State",
+            "state": "Georgia",
+            "district": None,
+            "election_date": "2026-11-03",
+            "description": "A synthetic race used to benchmark the research pipeline offline.",
+            "polling": [],
+            "polling_note": "No public polling in the benchmark fixture.",
+            "candidates": [
+                {
+                    "name": name,
+                    "party": _PARTIES[i % len(_PARTIES)],
+                    "incumbent": i == 0,
+                    "summary": f"{name} is a synthetic candidate used for offline benchmarks.",
+                    "summary_sources": [{"url": f"{self.page_host}/pages/{_slug(name)}", "type": "website"}],
+                    "image_url": f"{self.page_host}/img/{_slug(name)}.jpg",
+                    "website": f"{self.page_host}/pages/{_slug(name)}",
+                    "social_media": {},
+                    "career_history": [],
+                    "education": [],
+                    "links": [],
+                    "issues": {},
+                }
+                for i, name in enumerate(self.candidates)
+            ],
+            "generator": ["pipeline-agent"],
+        }
+
+    def _finance_patch(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "donor_summary": f"{name} is funded by synthetic benchmark donors.",
+                "donor_source_url": f"{self.page_host}/pages/{_slug(name)}-finance",
+                "voting_summary": f"{name} has no legislative voting record in the fixture.",
+                "links": [{"url": f"{self.page_host}/pages/{_slug(name)}", "title": name, "type": "official"}],
+            }
+            for name in self.candidates
+        }
+
+    def _tool_call(self, name: str, args: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        self._ids += 1
+        self.tool_calls[name] += 1
+        call = {"id": f"call_{self._ids}", "type": "function", "function": {"name": name, "arguments": json.dumps(args)}}
+        return {"role": "assistant", "content": None, "tool_calls": [call]}, "tool_calls"
+
+    # -- script --------------------------------------------------------------
+
+    def respond(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a full ``chat.completion`` response for a request body."""
+        messages = body.get("messages", [])
+        system = messages[0].get("content", "") if messages else ""
+        user = messages[1].get("content", "") if len(messages) > 1 else ""
+        phase = _PHASE_BY_SYSTEM.get(system, "other")
+        offered = {t["function"]["name"] for t in body.get("tools") or []}
+        used = {tc["function"]["name"] for m in messages if m.get("role") == "assistant" for tc in m.get("tool_calls") or []}
+        candidate = next((c for c in self.candidates if c in user), None)
+        issue_match = _ISSUE_LINE.search(user)
+        issue = issue_match.group(1).strip() if issue_match else None
+
+        if "web_search" in offered and "web_search" not in used:
+            query = " ".join(p for p in (self.race_id, candidate, issue, phase) if p)
+            message, finish = self._tool_call("web_search", {"query": query})
+        elif "fetch_page" in offered and "fetch_page" not in used:
+            message, finish = self._tool_call("fetch_page", {"url": self._first_result_url(messages)})
+        elif "set_issue_stance" in offered and "set_issue_stance" not in used and candidate and issue in CANONICAL_ISSUES:
+            message, finish = self._tool_call(
+                "set_issue_stance",
+                {
+                    "candidate_name": candidate,
+                    "issue": issue,
+                    "stance": f"{candidate} has a synthetic position on {issue}.",
+                    "confidence": "medium",
+                    "sources": [{"url": f"{self.page_host}/pages/{_slug(candidate)}-{_slug(issue)}", "type": "website"}],
+                },
+            )
+        else:
+            if system == DISCOVERY_SYSTEM:
+                content = json.dumps(self._race_json())
+            elif system == FINANCE_VOTING_SYSTEM:
+                content = json.dumps(self._finance_patch())
+            elif system == IMAGE_SEARCH_SYSTEM:
+                content = json.dumps({"image_url": None})
+            else:
+                content = "Done."
+            message, finish = {"role": "assistant", "content": content}, "stop"
+
+        prompt_tokens = _estimate_tokens(messages)
+        completion_tokens = _estimate_tokens(message)
+        self.calls[phase] += 1
+        self.tokens[phase]["prompt_tokens"] += prompt_tokens
+        self.tokens[phase]["completion_tokens"] += completion_tokens
+        return {
+            "id": f"chatcmpl-bench-{self._ids}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "bench"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _first_result_url(self, messages: List[Dict[str, Any]]) -> str:
+        for msg in reversed(messages):
+            if msg.get("role") != "tool":
+                continue
+            try:
+                results = json.loads(msg.get("content") or "[]")
+            except ValueError:
+                continue
+            for r in results if isinstance(results, list) else []:
+                if isinstance(r, dict) and r.get("url"):
+                    return r["url"]
+        return f"{self.page_host}/pages/{_slug(self.race_id)}"
+
+
+def make_llm_app(llm: ScriptedLLM, *, latency_s: float = 0.0) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> JSONResponse:
+        body = await request.json()
+        if latency_s:
+            await asyncio.sleep(latency_s)
+        return JSONResponse(llm.respond(body))
+
+    return app
+
+
+def make_serper_app(page_host: str, counters: Dict[str, int], *, latency_s: float = 0.0) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/search")
+    async def search(request: Request) -> JSONResponse:
+        body = await request.json()
+        counters["serper_requests"] += 1
+        if latency_s:
+            await asyncio.sleep(latency_s)
+        query = str(body.get("q", ""))
+        digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+        organic = [
+            {
+                "title": f"{query} — result {i + 1}",
+                "link": f"{page_host}/pages/{_slug(query)[:60]}-{digest}-{i}",
+                "snippet": f"Synthetic snippet {i + 1} for {query}.",
+            }
+            for i in range(int(body.get("num", 8)))
+        ]
+        return JSONResponse({"organic": organic})
+
+    return app
+
+
+def make_pages_app(counters: Dict[str, int], *, latency_s: float = 0.0) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/pages/{slug}")
+    async def page(slug: str) -> HTMLResponse:
+        counters["page_requests"] += 1
+        if latency_s:
+            await asyncio.sleep(latency_s)
+        paragraphs = "".join(
+            f"<p>Paragraph {i} about {slug.replace('-', ' ')}: positions, record and statements.</p>" for i in range(60)
+        )
+        return HTMLResponse(f"<html><head><title>{slug}</title></head><body><h1>{slug}</h1>{paragraphs}</body></html>")
+
+    @app.api_route("/img/{name}", methods=["GET", "HEAD"])
+    async def image(name: str) -> Response:
+        counters["image_requests"] += 1
+        return Response(content=b"\xff\xd8\xff\xe0" + b"\x00" * 64, media_type="image/jpeg")
+
+    return app
+
+
+class StandInServer:
+    """Run an ASGI app with uvicorn on a background thread and an ephemeral port."""
+
+    def __init__(self, app: FastAPI):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._sock.getsockname()[1]}"
+        self._server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off", ws="none", access_log=False))
+        self._thread = threading.Thread(target=self._server.run, kwargs={"sockets": [self._sock]}, daemon=True)
+
+    def start(self, timeout: float = 10.0) -> "StandInServer":
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Stand-in server at {self.url} did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+        self._sock.close()
+
+
+class StandIns:
+    """The three stand-in servers for one benchmark race (context manager)."""
+
+    def __init__(
+        self,
+        race_id: str,
+        *,
+        n_candidates: int = 2,
+        llm_latency_s: float = 0.0,
+        search_latency_s: float = 0.0,
+        page_latency_s: float = 0.0,
+    ):
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.pages = StandInServer(make_pages_app(self.counters, latency_s=page_latency_s))
+        self.llm = ScriptedLLM(race_id, n_candidates, self.pages.url)
+        self.serper = StandInServer(make_serper_app(self.pages.url, self.counters, latency_s=search_latency_s))
+        self.openai = StandInServer(make_llm_app(self.llm, latency_s=llm_latency_s))
+
+    def __enter__(self) -> "StandIns":
+        for server in (self.pages, self.serper, self.openai):
+            server.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        for server in (self.openai, self.serper, self.pages):
+            server.stop()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the request/tool counters (for per-run deltas)."""
+        return {
+            "counters": dict(self.counters),
+            "tool_calls": dict(self.llm.tool_calls),
+            "calls": dict(self.llm.calls),
+            "tokens": {k: dict(v) for k, v in self.llm.tokens.items()},
+        }
+
+    def env(self) -> Dict[str, Optional[str]]:
+        """Environment that points the pipeline at the stand-ins (None = unset)."""
+        return {
+            "OPENAI_API_KEY": f"bench-{self.openai.url.rsplit(':', 1)[1]}",
+            "OPENAI_BASE_URL": f"{self.openai.url}/v1",
+            "SERPER_API_KEY": "bench",
+            "SERPER_API_URL": f"{self.serper.url}/search",
+            "ANTHROPIC_API_KEY": None,
+            "GEMINI_API_KEY": None,
+            "XAI_API_KEY": None,
+            "AGENT_CASSETTE": None,
+        }
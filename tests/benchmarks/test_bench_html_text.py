@@ -0,0 +1,15 @@
+"""Smoke test for the page text extraction microbenchmark."""
+
+from tests.benchmarks.bench_html_text import run_benchmark
+
+
+def test_html_text_benchmark_reports_throughput_and_parity(tmp_path):
+    (tmp_path / "a.html").write_text("<html><body><h1>Jane Doe</h1><p>Lower costs.</p></body></html>")
+    (tmp_path / "b.html").write_text("<p>Housing<script>x()</script></p><p>Schools</p>")
+
+    report = run_benchmark(str(tmp_path), repeat=1)
+
+    assert report["config"]["pages"] == 2
+    assert set(report["variants"]) == {"regex", "extract_text", "extract_text (limit)"}
+    assert all(v["mb_per_s"] > 0 for v in report["variants"].values())
+    assert report["parity"]["pages"] == {"a.html": 1.0, "b.html": 1.0}
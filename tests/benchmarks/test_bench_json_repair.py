@@ -0,0 +1,13 @@
+"""Regression run of the JSON repair benchmark over the checked-in corpus of failed answers."""
+
+from tests.benchmarks.bench_json_repair import run_benchmark
+
+
+def test_json_repair_corpus_parses_as_expected():
+    report = run_benchmark(repeat=1)
+
+    assert report["mismatches"] == []
+    assert report["variants"]["repair"]["correct"] == report["config"]["with_expected"]
+    assert report["variants"]["repair"]["parsed"] == report["config"]["answers"] - 2  # two need a re-prompt
+    assert report["retries_avoided"] > 0
+    assert {"python_literal", "trailing_comma", "control_char", "truncated"} <= set(report["repairs"])
@@ -0,0 +1,63 @@
+"""Smoke test for the offline pipeline benchmark harness."""
+
+import json
+
+import pytest
+
+from pipeline_client.backend.models import ALL_STEPS
+from tests.benchmarks.bench_pipeline import run_benchmark
+
+
+@pytest.mark.asyncio
+async def test_benchmark_runs_fresh_and_update_offline():
+    """Both modes complete against the stand-ins and report per-step timings and cache ratios."""
+    report = await run_benchmark(n_candidates=1, issue_concurrency=2)
+
+    fresh, update = report["runs"]["fresh"], report["runs"]["update"]
+    assert set(fresh["steps"]) == set(ALL_STEPS)
+    assert fresh["steps"]["discovery"]["status"] == "completed"
+    assert fresh["candidates"] == update["candidates"] == 1
+    assert fresh["llm_calls"]["issues"] > 0
+    assert fresh["prompt_tokens"] > 0
+    # The update pass repeats the fresh pass's searches, so the shared cache serves most of them.
+    assert update["search_cache_hit_ratio"] > fresh["search_cache_hit_ratio"]
+
+
+@pytest.mark.asyncio
+async def test_recorded_run_replays_offline_without_misses(tmp_path):
+    """A run recorded against the stand-ins replays from its cassette alone, with an empty cache."""
+    from unittest.mock import patch
+
+    from pipeline_client.agent.agent import run_agent
+    from pipeline_client.agent.cassette import _ISO_TIMESTAMP
+    from pipeline_client.agent.search_cache import SearchCache
+    from tests.benchmarks.bench_pipeline import DEFAULT_RACE_ID, _patched_env
+    from tests.benchmarks.standins import StandIns
+
+    def _mask_timestamps(value):
+        return _ISO_TIMESTAMP.sub("<ts>", json.dumps(value, sort_keys=True))
+
+    cassette = str(tmp_path / "run.json")
+    recording_cache = SearchCache(cache_dir=str(tmp_path / "recording"))
+    with (
+        StandIns(DEFAULT_RACE_ID, n_candidates=1) as standins,
+        _patched_env(standins.env()),
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=recording_cache),
+    ):
+        recorded = await run_agent(
+            DEFAULT_RACE_ID, existing_data={}, issue_concurrency=1, cassette_path=cassette, cassette_mode="record"
+        )
+
+    # Stand-ins are gone and the cache is empty: everything must come from the cassette.
+    replay_cache = SearchCache(cache_dir=str(tmp_path / "replay"))
+    with patch("pipeline_client.agent.agent._get_search_cache", return_value=replay_cache):
+        replayed = await run_agent(DEFAULT_RACE_ID, issue_concurrency=1, cassette_path=cassette, cassette_mode="replay")
+
+    stats = replayed["agent_metrics"]["cassette"]
+    assert stats["misses"] == 0
+    assert stats["replayed"] == recorded["agent_metrics"]["cassette"]["recorded"]
+    # Identical up to wall-clock timestamps (e.g. sources' last_accessed)
+    assert _mask_timestamps(replayed["candidates"]) == _mask_timestamps(recorded["candidates"])
+    assert replayed["candidates"][0]["issues"]
+    recording_cache.close()
+    replay_cache.close()
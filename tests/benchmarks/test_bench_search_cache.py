@@ -0,0 +1,15 @@
+"""Smoke test for the SearchCache microbenchmark."""
+
+import pytest
+
+from tests.benchmarks.bench_search_cache import run_benchmark
+
+
+@pytest.mark.asyncio
+async def test_search_cache_benchmark_reports_throughput():
+    report = await run_benchmark(agents=3, ops=20)
+
+    current = report["variants"]["current"]
+    assert current["ops"] == 60
+    assert current["ops_per_s"] > 0
+    assert current["max_loop_stall_ms"] >= 0
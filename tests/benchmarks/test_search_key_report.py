@@ -0,0 +1,48 @@
+"""Smoke test for the search key report."""
+
+import sqlite3
+
+from tests.benchmarks.search_key_report import key_report
+
+
+def test_search_key_report_counts_saved_calls(tmp_path):
+    db_path = tmp_path / "search_cache.db"
+    db = sqlite3.connect(db_path)
+    db.execute("CREATE TABLE search_cache (query_hash TEXT PRIMARY KEY, query_text TEXT, race_id TEXT)")
+    rows = [
+        ("Jane Doe taxes", "race-a"),
+        ("jane doe  taxes", "race-a"),
+        ("taxes Jane Doe", "race-b"),
+        ("John Roe housing", "race-b"),
+    ]
+    db.executemany("INSERT INTO search_cache VALUES (?, ?, ?)", [(str(i), q, r) for i, (q, r) in enumerate(rows)])
+    db.commit()
+    db.close()
+
+    report = key_report(db_path)
+
+    assert report["serper_calls_before"] == 4
+    assert report["serper_calls_after"] == 2
+    assert report["drop_pct"] == 50.0
+    assert report["normalization_only"]["serper_calls_after"] == 3
+    assert report["races"] == 2
+    assert report["keys_shared_by_several_races"] == 1
+
+
+def test_search_key_report_reads_race_index(tmp_path):
+    from pipeline_client.agent.search_cache import SearchCache
+
+    cache = SearchCache(cache_dir=str(tmp_path))
+    cache.set("Jane Doe taxes", [{"url": "https://a.example"}], race_id="race-a")
+    cache.set("taxes Jane Doe", [{"url": "https://a.example"}], race_id="race-b")
+    cache.set("John Roe housing", [{"url": "https://b.example"}], race_id="race-b")
+    cache.flush_hits()
+    cache.close()
+
+    report = key_report(cache.db_path)
+
+    assert report["source"] == "rekeyed (lower bound)"
+    assert report["serper_calls_before"] == 3
+    assert report["serper_calls_after"] == 2
+    assert report["races"] == 2
+    assert report["keys_shared_by_several_races"] == 1
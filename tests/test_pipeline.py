@@ -17,6 +17,7 @@ Covers:
 import json
 import os
 import tempfile
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -26,7 +27,6 @@ import pytest
 from pipeline_client.agent.agent import (
     SEARCH_TOOL,
     _agent_loop,
-    _extract_json,
     _fetch_page,
     _is_unusable_page_text,
     _load_existing,
@@ -54,6 +54,7 @@ from pipeline_client.agent.prompts import (
     UPDATE_META_SYSTEM,
     UPDATE_META_USER,
 )
+from pipeline_client.agent.utils import _extract_json
 
 # ---------------------------------------------------------------------------
 # Prompt tests
@@ -241,12 +242,56 @@ def test_extract_json_nested():
     assert data["a"]["b"]["c"] == [1, 2, 3]
 
 
+def test_extract_json_skips_citations_before_object():
+    """Bracketed citations in the prose before the answer do not replace the object."""
+    data = _extract_json('Based on [1] and [2], here is the answer: {"a": 1}')
+    assert data == {"a": 1}
+    assert _extract_json('Reviews:\n[{"a": 1},]') == [{"a": 1}]
+
+
 def test_extract_json_invalid():
     """Invalid JSON raises an error."""
     with pytest.raises(json.JSONDecodeError):
         _extract_json("not json at all")
 
 
+@pytest.mark.asyncio
+async def test_agent_loop_repairs_json_instead_of_reprompting(tmp_path):
+    """Common JSON slips are repaired in place (and counted); a truncated answer keeps its complete members."""
+    from pipeline_client.agent.cost import _cost_ctx
+    from pipeline_client.agent.utils import _extract_json_with_repairs
+
+    assert _extract_json_with_repairs('{"a": "x"}') == ({"a": "x"}, [])
+    assert _extract_json_with_repairs('Sure:\n{"a": None, "b": "two\nlines", "c": [1, 2,],}') == (
+        {"a": None, "b": "two\nlines", "c": [1, 2]},
+        ["python_literal", "control_char", "trailing_comma"],
+    )
+    assert _extract_json_with_repairs('{"candidates": [{"name": "Jane"}, {"name": "Jo') == (
+        {"candidates": [{"name": "Jane"}]},
+        ["truncated"],
+    )
+
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _cost_ctx.set(acc)
+    try:
+        with (
+            patch("pipeline_client.agent.agent._call_openai", new_callable=AsyncMock) as mock,
+            patch("pipeline_client.agent.agent._JSON_FAILURES_DIR", str(tmp_path)),
+        ):
+            mock.return_value = _mock_openai_response(content='{"ok": True,}')
+            assert await _agent_loop("system", "user", model="gpt-5.4-mini", phase_name="test") == {"ok": True}
+            assert mock.call_count == 1
+
+            mock.reset_mock(return_value=True)
+            mock.side_effect = [_mock_openai_response(content="{'ok': 1}"), _mock_openai_response(content='{"ok": 1}')]
+            await _agent_loop("system", "user", model="gpt-5.4-mini", phase_name="test")
+    finally:
+        _cost_ctx.reset(token)
+
+    assert acc["metrics"]["json_repair"] == {"retries_avoided": 1, "python_literal": 1, "trailing_comma": 1}
+    assert [p.read_text() for p in tmp_path.glob("test-*.txt")] == ["{'ok': 1}"]
+
+
 # ---------------------------------------------------------------------------
 # Search tool definition tests
 # ---------------------------------------------------------------------------
@@ -425,6 +470,52 @@ async def test_agent_loop_retries_bad_json():
     assert mock.call_count == 2
 
 
+@pytest.mark.asyncio
+async def test_agent_loop_sends_phase_schema_and_counts_parse_retries():
+    """A declared schema goes out as response_format; parse retries avoided / still needed are counted."""
+    from pipeline_client.agent.agent import _apply_finance_patch
+    from pipeline_client.agent.cost import _cost_ctx
+    from pipeline_client.agent.schemas import FINANCE_VOTING_FORMAT
+
+    schema = FINANCE_VOTING_FORMAT["json_schema"]["schema"]
+    entry = schema["$defs"]["FinanceVotingEntry"]
+    assert FINANCE_VOTING_FORMAT["json_schema"]["strict"] is True
+    assert entry["additionalProperties"] is False and set(entry["required"]) == set(entry["properties"])
+
+    answer = {
+        "candidates": [
+            {
+                "name": "Jane Doe",
+                "donor_summary": "Funded by PACs.",
+                "donor_source_url": None,
+                "voting_summary": None,
+                "voting_source_url": None,
+                "links": [],
+            }
+        ]
+    }
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _cost_ctx.set(acc)
+    try:
+        with patch("pipeline_client.agent.agent._call_openai", new_callable=AsyncMock) as mock:
+            mock.return_value = _mock_openai_response(content=json.dumps(answer))
+            result = await _agent_loop(
+                "system", "user", model="gpt-5.4-mini", phase_name="test", response_format=FINANCE_VOTING_FORMAT
+            )
+            assert mock.call_args.kwargs["response_format"] is FINANCE_VOTING_FORMAT
+
+            mock.reset_mock(return_value=True)
+            mock.side_effect = [_mock_openai_response(content="not json"), _mock_openai_response(content="{}")]
+            await _agent_loop("system", "user", model="gpt-5.4-mini", phase_name="test", response_format=FINANCE_VOTING_FORMAT)
+    finally:
+        _cost_ctx.reset(token)
+
+    assert acc["metrics"]["structured_output"] == {"parse_retries_avoided": 1, "parse_retries": 1}
+    race = {"candidates": [{"name": "Jane Doe", "links": []}]}
+    _apply_finance_patch(race, result, lambda *a: None)
+    assert race["candidates"][0]["donor_summary"] == "Funded by PACs."
+
+
 @pytest.mark.asyncio
 async def test_agent_loop_raises_on_max_iterations():
     """_agent_loop raises RuntimeError when max iterations reached."""
@@ -476,6 +567,127 @@ async def test_agent_loop_passes_race_id_to_search():
     mock_search.assert_called_once_with("test", race_id="my-race-2024")
 
 
+@pytest.mark.asyncio
+async def test_agent_loop_runs_network_tools_concurrently_in_order():
+    """Network tool calls from one turn overlap, but tool messages keep tool_call_id order."""
+    import asyncio
+
+    tool_response = _mock_openai_response(
+        tool_calls=[
+            {"id": "call_1", "function": {"name": "fetch_page", "arguments": json.dumps({"url": "https://slow.com"})}},
+            {"id": "call_2", "function": {"name": "web_search", "arguments": json.dumps({"query": "fast"})}},
+            {"id": "call_3", "function": {"name": "set_issue_stance", "arguments": json.dumps({"issue": "Economy"})}},
+        ],
+    )
+    final_response = _mock_openai_response(content=json.dumps({"done": True}))
+    seen_messages = []
+
+    async def fake_call(messages, **kwargs):
+        seen_messages.append(list(messages))
+        return [tool_response, final_response][len(seen_messages) - 1]
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch(url, race_id=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return "slow page"
+
+    async def fake_search(query, race_id=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return [{"title": "fast", "snippet": "", "url": "https://fast.com"}]
+
+    with (
+        patch("pipeline_client.agent.agent._call_openai", side_effect=fake_call),
+        patch("pipeline_client.agent.agent._fetch_page", side_effect=fake_fetch),
+        patch("pipeline_client.agent.agent._serper_search", side_effect=fake_search),
+    ):
+        result = await _agent_loop(
+            "system",
+            "user",
+            model="gpt-5.4-mini",
+            phase_name="test",
+            extra_tools=[{"type": "function", "function": {"name": "set_issue_stance", "parameters": {}}}],
+            extra_tool_handlers={"set_issue_stance": lambda args: "stance set"},
+        )
+
+    assert result == {"done": True}
+    assert peak == 2
+    tool_msgs = [m for m in seen_messages[1] if m.get("role") == "tool"]
+    assert [m["tool_call_id"] for m in tool_msgs] == ["call_1", "call_2", "call_3"]
+    assert tool_msgs[0]["content"] == "slow page"
+    assert tool_msgs[2]["content"] == "stance set"
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_keeps_call_order_around_editing_tools():
+    """An editing call runs after the network calls issued before it and before those issued after it."""
+    import asyncio
+
+    tool_response = _mock_openai_response(
+        tool_calls=[
+            {"id": "call_1", "function": {"name": "fetch_page", "arguments": json.dumps({"url": "https://a.com"})}},
+            {"id": "call_2", "function": {"name": "set_issue_stance", "arguments": json.dumps({"issue": "Economy"})}},
+            {"id": "call_3", "function": {"name": "web_search", "arguments": json.dumps({"query": "q"})}},
+            {"id": "call_4", "function": {"name": "fetch_page", "arguments": json.dumps({"url": "https://b.com"})}},
+        ],
+    )
+    final_response = _mock_openai_response(content=json.dumps({"done": True}))
+    seen_messages = []
+    events = []
+
+    async def fake_call(messages, **kwargs):
+        seen_messages.append(list(messages))
+        return [tool_response, final_response][len(seen_messages) - 1]
+
+    async def fake_fetch(url, race_id=None):
+        events.append(f"start {url}")
+        await asyncio.sleep(0.02 if url == "https://b.com" else 0.01)
+        events.append(f"end {url}")
+        return f"page {url}"
+
+    async def fake_search(query, race_id=None):
+        events.append("start search")
+        await asyncio.sleep(0)
+        events.append("end search")
+        return [{"title": "t", "snippet": "", "url": "https://c.com"}]
+
+    def set_stance(args):
+        events.append("set_issue_stance")
+        return "stance set"
+
+    with (
+        patch("pipeline_client.agent.agent._call_openai", side_effect=fake_call),
+        patch("pipeline_client.agent.agent._fetch_page", side_effect=fake_fetch),
+        patch("pipeline_client.agent.agent._serper_search", side_effect=fake_search),
+    ):
+        await _agent_loop(
+            "system",
+            "user",
+            model="gpt-5.4-mini",
+            phase_name="test",
+            extra_tools=[{"type": "function", "function": {"name": "set_issue_stance", "parameters": {}}}],
+            extra_tool_handlers={"set_issue_stance": set_stance},
+        )
+
+    assert events[:3] == ["start https://a.com", "end https://a.com", "set_issue_stance"]
+    # The two calls after the edit still overlap; the search finishes first
+    assert events[3:5] == ["start search", "start https://b.com"]
+    assert events[5:] == ["end search", "end https://b.com"]
+    tool_msgs = [m for m in seen_messages[1] if m.get("role") == "tool"]
+    assert [m["tool_call_id"] for m in tool_msgs] == ["call_1", "call_2", "call_3", "call_4"]
+    assert [m["content"] for m in tool_msgs[:2]] == ["page https://a.com", "stance set"]
+    assert tool_msgs[3]["content"] == "page https://b.com"
+
+
 # ---------------------------------------------------------------------------
 # Serper search tests
 # ---------------------------------------------------------------------------
@@ -499,13 +711,13 @@ async def test_serper_search_no_api_key():
 async def test_serper_search_uses_cache():
     """_serper_search returns cached results when available."""
     mock_cache = MagicMock()
-    mock_cache.get.return_value = {"results": [{"title": "Cached", "snippet": "...", "url": "https://cached.com"}]}
+    mock_cache.aget = AsyncMock(return_value={"results": [{"title": "Cached", "snippet": "...", "url": "https://cached.com"}]})
 
     with patch("pipeline_client.agent.agent._get_search_cache", return_value=mock_cache):
         results = await _serper_search("test query", race_id="my-race")
 
     assert results == [{"title": "Cached", "snippet": "...", "url": "https://cached.com"}]
-    mock_cache.get.assert_called_once_with("test query", "my-race")
+    mock_cache.aget.assert_awaited_once_with("test query", "my-race", num_results=8)
 
 
 def test_is_unusable_page_text_detects_block_pages():
@@ -514,6 +726,56 @@ def test_is_unusable_page_text_detects_block_pages():
     assert _is_unusable_page_text(blocked) is True
 
 
+def test_extract_text_skips_scripts_decodes_entities_and_stops_at_limit():
+    """Page text keeps one line per block, drops script/style content and stops past max_chars."""
+    from pipeline_client.agent.html_text import extract_text
+
+    html = (
+        "<html><head><title>Jane Doe</title><style>p { color: red }</style></head><body>"
+        "<p>Lower&nbsp;costs &amp; <b>better</b> schools&rsquo; funding</p>"
+        "<script type='text/javascript'>var s = '<p>not text</p>';</script >"
+        "<noscript><p>Enable JS</p></noscript><!-- <p>comment</p> -->"
+        "<ul><li>Housing</li><li>Jobs<br/>now</li></ul>\x07</body></html>"
+    )
+
+    assert extract_text(html) == "Jane Doe\n\nLower costs & better schools’ funding\n\nHousing\n\nJobs\nnow"
+    long_page = "<p>" + "word " * 1000 + "</p><p>never reached</p>"
+    assert len(extract_text(long_page, max_chars=100)) == 101
+
+
+class _StreamedResp:
+    """Streaming view of a canned response, as ``client.stream`` yields it."""
+
+    def __init__(self, resp, chunk_size: int = 4096):
+        self._resp = resp
+        self._chunk_size = chunk_size
+        self.status_code = getattr(resp, "status_code", 200)
+        self.headers = resp.headers
+        self.charset_encoding = None
+        self.num_bytes_downloaded = 0
+
+    def raise_for_status(self):
+        return self._resp.raise_for_status()
+
+    async def aiter_bytes(self):
+        data = self._resp.text.encode("utf-8")
+        for start in range(0, len(data), self._chunk_size):
+            chunk = data[start : start + self._chunk_size]
+            self.num_bytes_downloaded += len(chunk)
+            yield chunk
+
+
+def _stream_via_get(client):
+    """Serve ``client.stream(method, url, **kw)`` from the canned ``client.get(url, **kw)`` responses."""
+
+    @asynccontextmanager
+    async def stream(method, url, **kwargs):
+        yield _StreamedResp(await client.get(url, **kwargs))
+
+    client.stream = stream
+    return client
+
+
 @pytest.mark.asyncio
 async def test_fetch_page_uses_proxy_fallback_when_primary_unusable():
     """_fetch_page falls back to proxy when direct fetch is too short/useless."""
@@ -537,7 +799,7 @@ async def test_fetch_page_uses_proxy_fallback_when_primary_unusable():
 
     with (
         patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
-        patch("pipeline_client.agent.agent._get_fetch_client", return_value=mock_client),
+        patch("pipeline_client.agent.agent._get_fetch_client", return_value=_stream_via_get(mock_client)),
     ):
         result = await _fetch_page("https://www.example.com/issues")
 
@@ -563,7 +825,7 @@ async def test_fetch_page_attempts_jeff_wadlin_issues_url():
 
     with (
         patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
-        patch("pipeline_client.agent.agent._get_fetch_client", return_value=mock_client),
+        patch("pipeline_client.agent.agent._get_fetch_client", return_value=_stream_via_get(mock_client)),
     ):
         result = await _fetch_page(target_url)
 
@@ -602,7 +864,7 @@ async def test_fetch_page_jeff_wadlin_blocked_falls_back_to_proxy_with_correct_u
 
     with (
         patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
-        patch("pipeline_client.agent.agent._get_fetch_client", return_value=mock_client),
+        patch("pipeline_client.agent.agent._get_fetch_client", return_value=_stream_via_get(mock_client)),
     ):
         result = await _fetch_page(target_url)
 
@@ -640,7 +902,7 @@ async def test_fetch_page_short_low_signal_content_prefers_proxy_text():
 
     with (
         patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
-        patch("pipeline_client.agent.agent._get_fetch_client", return_value=mock_client),
+        patch("pipeline_client.agent.agent._get_fetch_client", return_value=_stream_via_get(mock_client)),
     ):
         result = await _fetch_page(target_url)
 
@@ -650,6 +912,171 @@ async def test_fetch_page_short_low_signal_content_prefers_proxy_text():
     assert "public option" in result
 
 
+@pytest.mark.asyncio
+async def test_fetch_page_learns_blocked_hosts_and_caches_failures(tmp_path):
+    """A host that keeps blocking direct fetches goes straight to the proxy; failed URLs are not retried."""
+    from pipeline_client.agent.search_cache import SearchCache
+
+    class _Resp:
+        def __init__(self, text: str, content_type: str = "text/html; charset=utf-8"):
+            self.text = text
+            self.headers = {"content-type": content_type}
+
+        def raise_for_status(self):
+            return None
+
+    async def fake_get(url, headers=None):
+        if url.startswith("https://r.jina.ai/"):
+            if "dead" in url:
+                raise RuntimeError("proxy down")
+            return _Resp("Proxy page text " + ("x" * 1000), "text/plain")
+        return _Resp("<html><body>Please enable JavaScript</body></html>")
+
+    cache = SearchCache(cache_dir=str(tmp_path))
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(side_effect=fake_get)
+
+    with (
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=cache),
+        patch("pipeline_client.agent.agent._get_fetch_client", return_value=_stream_via_get(mock_client)),
+    ):
+        assert "Proxy page text" in await _fetch_page("https://blocked.example/a")
+        assert mock_client.get.await_count == 3  # direct, alternate headers, proxy
+
+        # The proxy worked for this host, so it goes first
+        mock_client.get.reset_mock()
+        assert "Proxy page text" in await _fetch_page("https://blocked.example/b")
+        assert [c.args[0] for c in mock_client.get.call_args_list] == ["https://r.jina.ai/https://blocked.example/b"]
+
+        mock_client.get.reset_mock()
+        failed = await _fetch_page("https://blocked.example/dead")
+        assert failed.startswith("[Failed to fetch")
+        assert mock_client.get.await_count == 3
+        # Served from the failure cache
+        assert await _fetch_page("https://blocked.example/dead") == failed
+        assert mock_client.get.await_count == 3
+
+        # Direct strategies have now failed twice in a row for this host and are skipped
+        mock_client.get.reset_mock()
+        assert (await _fetch_page("https://blocked.example/dead-too")).startswith("[Failed to fetch")
+        assert mock_client.get.await_count == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_revalidates_expired_page_with_conditional_get(tmp_path):
+    from pipeline_client.agent.search_cache import SearchCache
+
+    class _Resp:
+        def __init__(self, status_code: int, text: str = "", headers: dict | None = None):
+            self.status_code = status_code
+            self.text = text
+            self.headers = {"content-type": "text/html", **(headers or {})}
+
+        def raise_for_status(self):
+            return None
+
+    url = "https://site.example/issues"
+    body = "<html><body>" + "Detailed policy positions. " * 60 + "</body></html>"
+    cache = SearchCache(cache_dir=str(tmp_path))
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(side_effect=[_Resp(200, body, {"etag": '"v1"'}), _Resp(304)])
+
+    with (
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=cache),
+        patch("pipeline_client.agent.agent._get_fetch_client", return_value=_stream_via_get(mock_client)),
+    ):
+        first = await _fetch_page(url)
+        with cache._pool.connection() as conn:
+            conn.execute("UPDATE page_cache SET expires_at = '2000-01-01T00:00:00'")
+            conn.commit()
+        assert cache.get_page(url) is None
+        assert await _fetch_page(url) == first
+
+    assert mock_client.get.await_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert cache.get_page(url) == first
+    # A first copy has no change time; new content sets it, identical content keeps it
+    assert cache.pages_changed_since([url, "https://never-cached.example"], "2000-01-01T00:00:00Z") == {}
+    cache.set_page(url, first + " Updated.")
+    assert cache.pages_changed_since([url], "2000-01-01T00:00:00Z") == {url: True}
+    checked = datetime.utcnow().isoformat()
+    cache.set_page(url, first + " Updated.")
+    assert cache.pages_changed_since([url], checked) == {url: False}
+    cache.set_page(url, first)
+    assert cache.pages_changed_since([url], checked) == {url: True}
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_pages_first_cached_after_since_are_not_reported_changed(tmp_path):
+    """A page first cached after the last update is unknown, not "changed", in the update prompt."""
+    from pipeline_client.agent.agent import _source_change_note
+    from pipeline_client.agent.cache_tiers import DirectorySharedTier, TieredCache
+    from pipeline_client.agent.search_cache import SearchCache
+
+    since = datetime.utcnow().isoformat()
+    cache = SearchCache(cache_dir=str(tmp_path / "a"))
+    cache.set_page("https://new.example/a", "First copy of page A.")
+    assert cache.pages_changed_since(["https://new.example/a"], since) == {}
+    with patch("pipeline_client.agent.agent._get_search_cache", return_value=cache):
+        assert await _source_change_note([{"url": "https://new.example/a"}], since) == ""
+
+    # Promotion from the shared tier is a first copy in the local cache as well
+    shared = DirectorySharedTier(tmp_path / "shared")
+    await TieredCache(cache, shared=shared).aset_page("https://new.example/b", "First copy of page B.")
+    second = TieredCache(SearchCache(cache_dir=str(tmp_path / "b")), shared=shared)
+    assert await second.aget_page("https://new.example/b") == "First copy of page B."
+    assert second.local.pages_changed_since(["https://new.example/b"], since) == {}
+    cache.close()
+    second.local.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_streams_with_byte_cap_and_skips_non_text_bodies():
+    """Non-text responses are rejected from headers alone; text bodies stop at the byte cap."""
+    from pipeline_client.agent.cost import _cost_ctx
+
+    class _Resp:
+        def __init__(self, text, headers):
+            self.text = text
+            self.headers = headers
+
+        def raise_for_status(self):
+            return None
+
+    pdf = _Resp("%PDF" + "x" * 50000, {"content-type": "application/pdf", "content-length": "50004"})
+    big_html = "<html><body>" + "<p>Detailed plan for rural broadband access.</p>" * 4000 + "</body></html>"
+    html = _Resp(big_html, {"content-type": "text/html; charset=utf-8", "content-length": str(len(big_html))})
+
+    async def fake_get(url, headers=None):
+        if "r.jina.ai" in url:
+            raise RuntimeError("proxy down")
+        return pdf if url.endswith(".pdf") else html
+
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(side_effect=fake_get)
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _cost_ctx.set(acc)
+    try:
+        with (
+            patch("pipeline_client.agent.agent._PAGE_MAX_BYTES", 20000),
+            patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
+            patch("pipeline_client.agent.agent._get_fetch_client", return_value=_stream_via_get(mock_client)),
+        ):
+            skipped = await _fetch_page("https://site.example/plan.pdf")
+            page = await _fetch_page("https://site.example/plan")
+    finally:
+        _cost_ctx.reset(token)
+
+    assert skipped.startswith("[Failed to fetch") and "primary_fetch_unusable_content" in skipped
+    assert "rural broadband" in page
+    fetch = acc["metrics"]["fetch"]
+    assert fetch["non_text_skipped"] == 2  # direct + alternate headers
+    assert fetch["byte_capped"] == 1
+    assert 20000 <= fetch["bytes_downloaded"] < 20000 + 4096
+    assert fetch["bytes_saved"] == 2 * 50004 + len(big_html) - fetch["bytes_downloaded"]
+
+
 # ---------------------------------------------------------------------------
 # Load existing data tests
 # ---------------------------------------------------------------------------
@@ -1469,6 +1896,219 @@ def test_search_cache_list_cached_for_race():
         assert "https://r.com" in result["searches"][0]["urls"]
 
 
+def test_search_cache_keys_are_normalized_and_shared_across_races(tmp_path):
+    from pipeline_client.agent.search_cache import SearchCache, normalize_query, search_key
+
+    assert normalize_query("Jane  DOE healthcare,") == normalize_query("healthcare jane ｄｏｅ")
+    # Phrases and operators keep their order
+    assert normalize_query('"Jane Doe" site:example.com') == '"jane doe" site:example.com'
+    assert search_key("jane doe") != search_key("doe -jane")
+    assert search_key("jane doe", 8) != search_key("jane doe", 10)
+
+    cache = SearchCache(cache_dir=str(tmp_path))
+    cache.set("Jane Doe healthcare", [{"title": "R", "url": "https://r.com"}], race_id="race-a", provider="serper")
+    hit = cache.get("healthcare  jane doe", "race-b")
+    assert hit and hit["results"][0]["url"] == "https://r.com"
+    assert cache.get("healthcare jane doe", "race-b", num_results=10) is None
+
+    assert [s["query"] for s in cache.list_cached_for_race("race-b")["searches"]] == ["Jane Doe healthcare"]
+    # Still used by race-b, so clearing race-a keeps the entry
+    assert cache.clear_for_race("race-a") == 0
+    assert cache.list_cached_for_race("race-a")["searches"] == []
+    assert cache.get("Jane Doe healthcare") is not None
+    assert cache.clear_for_race("race-b") == 1
+    assert cache.get("Jane Doe healthcare") is None
+    cache.close()
+
+
+def test_search_cache_race_index_pages_and_cursor(tmp_path):
+    """Pages are listed only for the races that fetched them; changes_since returns just the new entries."""
+    from pipeline_client.agent.search_cache import SearchCache
+
+    cache = SearchCache(cache_dir=str(tmp_path))
+    cache.set("jane doe taxes", [{"url": "https://a.com"}, {"url": "https://b.com"}], race_id="race-a")
+    cache.set_page("https://a.com", "page a", race_id="race-a")
+    cache.set_page("https://other.com", "unrelated page", race_id="race-b")
+
+    first = cache.list_cached_for_race("race-a")
+    assert first["searches"] == [{"query": "jane doe taxes", "urls": ["https://a.com", "https://b.com"]}]
+    assert first["page_urls"] == ["https://a.com"]
+    assert cache.changes_since("race-a", first["cursor"]) == {"searches": [], "page_urls": [], "cursor": first["cursor"]}
+
+    # A page hit from race-a adds it to race-a's index, linked to the search that listed it
+    assert cache.get_page("https://b.com", "race-a") is None
+    cache.set_page("https://b.com", "page b")
+    assert cache.get_page("https://b.com", "race-a") == "page b"
+    cache.set("jane doe housing", [{"url": "https://c.com"}], race_id="race-a")
+
+    delta = cache.changes_since("race-a", first["cursor"])
+    assert delta["page_urls"] == ["https://b.com"]
+    assert [s["query"] for s in delta["searches"]] == ["jane doe housing"]
+    assert delta["cursor"] > first["cursor"]
+    with cache._pool.connection() as conn:
+        linked = conn.execute(
+            "SELECT s.query_text FROM race_index r JOIN search_cache s ON s.query_hash = r.query_hash "
+            "WHERE r.kind = 'page' AND r.race_id = 'race-a' ORDER BY r.seq"
+        ).fetchall()
+    assert [q for (q,) in linked] == ["jane doe taxes", "jane doe taxes"]
+    cache.close()
+
+
+def test_search_cache_rekeys_legacy_rows(tmp_path):
+    """Rows keyed by (query, race) are merged onto race-independent keys, keeping their races."""
+    import hashlib
+    import sqlite3
+
+    from pipeline_client.agent.search_cache import SearchCache
+
+    db = sqlite3.connect(tmp_path / "search_cache.db")
+    db.execute(
+        "CREATE TABLE search_cache (query_hash TEXT PRIMARY KEY, query_text TEXT NOT NULL, race_id TEXT, "
+        "provider TEXT, results TEXT NOT NULL, result_count INTEGER, searched_at TEXT NOT NULL, "
+        "expires_at TEXT NOT NULL, hit_count INTEGER DEFAULT 0)"
+    )
+    for query, race, searched, url in [
+        ("Jane Doe taxes", "race-a", "2026-01-01T00:00:00", "https://old.com"),
+        ("taxes jane doe", "race-b", "2026-01-02T00:00:00", "https://new.com"),
+    ]:
+        key = hashlib.sha256(f"{query}:{race}".encode()).hexdigest()
+        db.execute(
+            "INSERT INTO search_cache VALUES (?, ?, ?, 'serper', ?, 1, ?, '2999-01-01T00:00:00', 2)",
+            (key, query, race, json.dumps([{"url": url}]), searched),
+        )
+    db.commit()
+    db.close()
+
+    cache = SearchCache(cache_dir=str(tmp_path))
+    assert cache.get_stats()["total_entries"] == 1
+    assert cache.get("JANE DOE TAXES")["results"] == [{"url": "https://new.com"}]
+    for race in ("race-a", "race-b"):
+        assert cache.list_cached_for_race(race)["searches"][0]["urls"] == ["https://new.com"]
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_search_cache_async_api_batches_hit_counts(tmp_path):
+    """Reads through the async API do not write; hit counts land in one batched flush."""
+    import asyncio
+
+    from pipeline_client.agent.search_cache import SearchCache
+
+    cache = SearchCache(cache_dir=str(tmp_path), hit_flush_every=1000, hit_flush_interval_s=3600)
+    with cache._pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    await cache.aset("q", [{"title": "R", "url": "https://r.com"}], race_id="race", provider="serper")
+    await cache.aset_page("https://r.com", "page text")
+
+    hits = await asyncio.gather(*[cache.aget("q", "race") for _ in range(8)], cache.aget_page("https://r.com"))
+    assert all(hits)
+    assert await cache.aget("missing", "race") is None
+    with cache._pool.connection() as conn:
+        assert conn.execute("SELECT hit_count FROM search_cache").fetchone()[0] == 0
+
+    assert cache.get_stats()["total_hits"] == 8
+    with cache._pool.connection() as conn:
+        assert conn.execute("SELECT hit_count FROM page_cache").fetchone()[0] == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_shares_entries_across_instances(tmp_path):
+    """A second instance (own SQLite file) is served from the shared tier, then promotes locally."""
+    from pipeline_client.agent.cache_tiers import DirectorySharedTier, TieredCache
+    from pipeline_client.agent.search_cache import SearchCache
+
+    shared = DirectorySharedTier(tmp_path / "shared")
+    first = TieredCache(SearchCache(cache_dir=str(tmp_path / "a")), shared=shared)
+    await first.aset("q", [{"title": "R", "url": "https://r.com"}], race_id="race", provider="serper")
+    await first.aset_page("https://r.com", "page text")
+
+    second = TieredCache(SearchCache(cache_dir=str(tmp_path / "b")), shared=shared)
+    assert (await second.aget("q", "race"))["results"][0]["url"] == "https://r.com"
+    assert await second.aget_page("https://r.com") == "page text"
+    assert second.tier_stats()["shared"] == {"hits": 2, "misses": 0}
+
+    # Promoted: SQLite has it now, and the next read never leaves memory.
+    assert second.local.get("q", "race") is not None
+    assert await second.aget("q", "race") is not None
+    assert await second.aget("unknown", "race") is None
+    stats = second.tier_stats()
+    assert stats["memory"] == {"hits": 1, "misses": 3}
+    assert stats["sqlite"] == {"hits": 0, "misses": 3}
+    assert stats["shared"] == {"hits": 2, "misses": 1}
+
+
+def test_page_cache_compresses_and_reads_legacy_rows(tmp_path):
+    """Pages are stored zlib-compressed with both sizes tracked; plain-text rows still read."""
+    import hashlib
+    import sqlite3
+
+    from pipeline_client.agent.search_cache import SearchCache
+
+    cache = SearchCache(cache_dir=str(tmp_path))
+    text = "Candidate supports infrastructure spending. " * 200
+    cache.set_page("https://a.example", text)
+    with sqlite3.connect(cache.db_path) as conn:
+        content, length, stored = conn.execute("SELECT content, content_length, compressed_size FROM page_cache").fetchone()
+        conn.execute(
+            "INSERT INTO page_cache (url_hash, url, content, content_length, fetched_at, expires_at) "
+            "VALUES (?, ?, ?, ?, '2000-01-01T00:00:00', '2999-01-01T00:00:00')",
+            (hashlib.sha256(b"https://legacy.example").hexdigest(), "https://legacy.example", "old text", 8),
+        )
+    assert isinstance(content, bytes) and length == len(text) and stored == len(content) < length // 10
+    assert cache.get_page("https://a.example") == text
+    assert cache.get_page("https://legacy.example") == "old text"
+    cache.close()
+
+
+def test_search_cache_maintenance_evicts_least_recently_used(tmp_path):
+    """maintain() expires, evicts the least recently used entries down to the size bound, and vacuums."""
+    import random
+    import time
+
+    from pipeline_client.agent.search_cache import SearchCache
+
+    cache = SearchCache(cache_dir=str(tmp_path), max_db_bytes=0)
+    rng = random.Random(0)
+    for i in range(6):
+        # Incompressible bodies so each page costs ~10 KB
+        cache.set_page(f"https://p.example/{i}", "".join(rng.choice("abcdefghijklmnop") for _ in range(20000)))
+        time.sleep(0.002)
+    cache.set_page("https://p.example/expired", "gone", ttl_hours=-1)
+    cache.get_page("https://p.example/0")  # oldest write, but now the most recently used
+    cache.max_db_bytes = 45000
+
+    result = cache.maintain()
+
+    assert result["expired"] == 1
+    assert result["evicted"] == 3
+    assert cache.get_page("https://p.example/0") is not None
+    assert [cache.get_page(f"https://p.example/{i}") is None for i in range(1, 6)] == [True, True, True, False, False]
+    assert cache.get_stats()["payload_bytes"] <= 45000
+    assert result["vacuum"] in ("incremental", "full", "none")
+    cache.close()
+
+
+def test_lru_tier_evicts_by_entries_and_bytes():
+    """The memory tier drops least-recently-used entries past either bound, and expired ones on read."""
+    import time
+
+    from pipeline_client.agent.cache_tiers import LRUTier
+
+    lru = LRUTier(max_entries=3, max_bytes=100)
+    later = time.time() + 60
+    for key in "abc":
+        lru.put(key, key, 10, later)
+    lru.get("a")  # a is now most recent
+    lru.put("d", "d", 10, later)
+    assert lru.get("b") is None and lru.get("a") == "a"
+
+    lru.put("big", "big", 85, later)
+    assert len(lru) == 2 and lru.size_bytes == 95  # c and d evicted, a (10) + big (85) kept
+    lru.put("old", "old", 1, time.time() - 1)
+    assert lru.get("old") is None
+
+
 @pytest.mark.asyncio
 async def test_run_agent_update_with_candidates():
     """run_agent in update mode with existing candidates runs roster sync + tools phases."""
@@ -1502,3 +2142,1179 @@ async def test_run_agent_update_with_candidates():
     assert "updated_utc" in result
     # roster sync + meta + images + 12 issues + finance + refine + meta refine = 18
     assert mock_loop.call_count == 18
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrency, expected_peak", [(1, 1), (2, 2)])
+async def test_issue_phase_respects_concurrency_limit(concurrency, expected_peak):
+    """_run_issue_phase runs candidates concurrently but never above issue_concurrency."""
+    import asyncio
+
+    from pipeline_client.agent.agent import _run_issue_phase
+
+    race_json = {"candidates": [{"name": "Alice", "issues": {}}, {"name": "Bob", "issues": {}}]}
+    in_flight = 0
+    peak = 0
+
+    async def fake_loop(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return {}
+
+    progress = []
+
+    def track(action, step, **kwargs):
+        if action == "progress":
+            progress.append(kwargs["pct"])
+
+    with (
+        patch("pipeline_client.agent.agent._agent_loop", side_effect=fake_loop) as mock_loop,
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
+    ):
+        await _run_issue_phase(
+            ["Alice", "Bob"],
+            race_json,
+            race_id="test-2024",
+            model="gpt-5-nano",
+            track=track,
+            issue_concurrency=concurrency,
+        )
+
+    assert mock_loop.call_count == 2 * len(CANONICAL_ISSUES)
+    assert peak == expected_peak
+    assert len(progress) == 2 * len(CANONICAL_ISSUES)
+    assert sorted(progress) == progress
+
+
+@pytest.mark.asyncio
+async def test_parallel_issue_progress_reports_only_started_issues():
+    """With parallel_issues, issues still waiting for a slot are not reported as started."""
+    from pipeline_client.agent.agent import _run_issue_phase
+
+    race_json = {"candidates": [{"name": "Alice", "issues": {}}, {"name": "Bob", "issues": {}}]}
+    reported = 0
+    reported_at_start = []
+
+    async def fake_loop(*args, **kwargs):
+        reported_at_start.append(reported)
+        return {}
+
+    def track(action, step, **kwargs):
+        nonlocal reported
+        if action == "progress":
+            reported += 1
+
+    with (
+        patch("pipeline_client.agent.agent._agent_loop", side_effect=fake_loop),
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
+    ):
+        await _run_issue_phase(
+            ["Alice", "Bob"],
+            race_json,
+            race_id="test-2024",
+            model="gpt-5-nano",
+            track=track,
+            issue_concurrency=1,
+            parallel_issues=True,
+        )
+
+    # One slot: the n-th sub-agent starts with exactly n issues reported so far.
+    assert reported_at_start == list(range(1, 2 * len(CANONICAL_ISSUES) + 1))
+
+
+# ---------------------------------------------------------------------------
+# OpenAI rate limiter tests
+# ---------------------------------------------------------------------------
+
+
+def test_rate_limiter_parses_reset_durations():
+    """OpenAI reset headers like '6m0s' and '20ms' are parsed into seconds."""
+    from pipeline_client.agent.rate_limit import _parse_reset
+
+    assert _parse_reset("6m0s") == 360
+    assert _parse_reset("1.5s") == 1.5
+    assert _parse_reset("20ms") == pytest.approx(0.02)
+    assert _parse_reset("7") == 7
+    assert _parse_reset(None) is None
+
+
+def test_rate_limiter_adopts_header_limits():
+    """x-ratelimit-* headers replace the configured limits and cap the remaining budget."""
+    from pipeline_client.agent.rate_limit import ModelRateLimiter
+
+    limiter = ModelRateLimiter("gpt-5.4-mini", rpm=500, tpm=500_000)
+    limiter.update_from_headers(
+        {
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-limit-tokens": "30000",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-remaining-tokens": "1000",
+        }
+    )
+    assert limiter.rpm == 60
+    assert limiter.tpm == 30000
+    # No requests left → the next request must wait roughly one refill interval (1s at 60 RPM)
+    assert limiter._wait_needed(10) == pytest.approx(1.0, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_429_pauses_all_callers():
+    """A 429 pauses every caller of the model until Retry-After has passed."""
+    import asyncio
+    import time as _time
+
+    from pipeline_client.agent.cost import _cost_ctx
+    from pipeline_client.agent.rate_limit import ModelRateLimiter
+
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _cost_ctx.set(acc)
+    try:
+        limiter = ModelRateLimiter("gpt-5.4-mini", rpm=1000, tpm=1_000_000)
+        pause = limiter.on_rate_limited({"retry-after": "0.05"})
+        assert pause == pytest.approx(0.05)
+
+        t0 = _time.monotonic()
+        await asyncio.gather(limiter.acquire(100), limiter.acquire(100))
+        assert _time.monotonic() - t0 >= 0.05
+    finally:
+        _cost_ctx.reset(token)
+    assert limiter.stats["rate_limited"] == 1
+    assert limiter.stats["acquired"] == 2
+    # Waits and throttles are reported in agent_metrics
+    metrics = acc["metrics"]["rate_limit"]
+    assert metrics["rate_limited"] == 1
+    assert metrics["waits"] == limiter.stats["waits"] >= 1
+    assert metrics["wait_s"] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_releases_waiters_in_arrival_order():
+    """Callers queued behind an exhausted budget go in arrival order; a cancelled waiter is skipped."""
+    import asyncio
+
+    from pipeline_client.agent.rate_limit import ModelRateLimiter
+
+    limiter = ModelRateLimiter("gpt-5.4-mini", rpm=6000, tpm=1_000_000)
+    limiter.on_rate_limited({"retry-after": "0.02"})
+    order = []
+
+    async def call(name):
+        await limiter.acquire(10)
+        order.append(name)
+
+    tasks = [asyncio.ensure_future(call(name)) for name in "abcd"]
+    await asyncio.sleep(0)
+    tasks[2].cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert order == ["a", "b", "d"]
+    assert not limiter._busy and not limiter._waiters
+
+
+def test_rate_limiter_registry_drops_finished_loops():
+    """Limiters are kept per running loop and released once their loop is gone."""
+    import asyncio
+    import gc
+    import weakref
+
+    from pipeline_client.agent.rate_limit import _limiters_by_loop, get_rate_limiter
+
+    loops = []
+
+    async def use_limiter():
+        loop = asyncio.get_running_loop()
+        loops.append(weakref.ref(loop))
+        limiter = get_rate_limiter("test-registry-model")
+        assert get_rate_limiter("test-registry-model") is limiter
+        assert _limiters_by_loop[loop]["test-registry-model"] is limiter
+        limiter.on_rate_limited({"retry-after": "0.01"})
+        await asyncio.gather(limiter.acquire(10), limiter.acquire(10))
+        return limiter
+
+    first = asyncio.run(use_limiter())
+    second = asyncio.run(use_limiter())
+    assert first is not second
+    gc.collect()
+    # Idle limiters hold no reference to their loop, so the entries go with it
+    assert [ref() for ref in loops] == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_call_openai_retries_429_through_shared_limiter():
+    """_call_openai retries a 429 after the limiter pause and learns limits from headers."""
+    import httpx
+    from openai import RateLimitError
+
+    from pipeline_client.agent.agent import _call_openai
+    from pipeline_client.agent.rate_limit import get_rate_limiter
+
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    rate_limited = RateLimitError(
+        "rate limited",
+        response=httpx.Response(429, headers={"retry-after": "0.01"}, request=request),
+        body=None,
+    )
+    raw = MagicMock()
+    raw.headers = {"x-ratelimit-limit-requests": "123", "x-ratelimit-limit-tokens": "456789"}
+    raw.parse.return_value = _mock_openai_response(content="{}")
+
+    client = MagicMock()
+    client.chat.completions.with_raw_response.create = AsyncMock(side_effect=[rate_limited, raw])
+
+    with patch("pipeline_client.agent.agent._get_openai_client", return_value=client):
+        resp = await _call_openai([{"role": "user", "content": "hi"}], model="test-limiter-model")
+
+    assert resp.choices[0].message.content == "{}"
+    assert client.chat.completions.with_raw_response.create.call_count == 2
+    limiter = get_rate_limiter("test-limiter-model")
+    assert limiter.rpm == 123
+    assert limiter.tpm == 456789
+    assert limiter.stats["rate_limited"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Phase graph scheduler tests
+# ---------------------------------------------------------------------------
+
+
+def _graph_recorder():
+    events = []
+
+    def track(action, step, **kwargs):
+        events.append((action, step))
+
+    return events, track
+
+
+@pytest.mark.asyncio
+async def test_phase_graph_runs_independent_phases_concurrently():
+    """Phases sharing only the roster overlap; a phase consuming their outputs waits for all of them."""
+    import asyncio
+
+    from pipeline_client.agent.phases import Phase, run_phase_graph
+
+    active = set()
+    overlap = []
+    order = []
+
+    def _phase(name, delay):
+        async def run():
+            active.add(name)
+            overlap.append(set(active))
+            await asyncio.sleep(delay)
+            active.discard(name)
+            order.append(name)
+
+        return run
+
+    events, track = _graph_recorder()
+    await run_phase_graph(
+        [
+            Phase("images", _phase("images", 0.01), inputs=("roster",), outputs=("img",)),
+            Phase("issues", _phase("issues", 0.03), inputs=("roster",), outputs=("iss",)),
+            Phase("finance", _phase("finance", 0.02), inputs=("roster",), outputs=("fin",)),
+            Phase("refinement", _phase("refinement", 0), inputs=("img", "iss", "fin")),
+        ],
+        step_enabled=lambda s: True,
+        track=track,
+        log=lambda *a: None,
+    )
+
+    assert {"images", "issues", "finance"} in overlap
+    assert order[-1] == "refinement"
+    assert events[:3] == [("start", "images"), ("start", "issues"), ("start", "finance")]
+    assert events[-2:] == [("start", "refinement"), ("complete", "refinement")]
+
+
+@pytest.mark.asyncio
+async def test_phase_graph_skips_disabled_and_cancels_on_failure():
+    """Disabled phases are reported skipped; a failing phase cancels its siblings and propagates."""
+    import asyncio
+
+    from pipeline_client.agent.phases import Phase, run_phase_graph
+
+    cancelled = []
+
+    async def boom():
+        raise RuntimeError("issues failed")
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("finance")
+            raise
+
+    async def never():
+        raise AssertionError("refinement must not start")
+
+    events, track = _graph_recorder()
+    with pytest.raises(RuntimeError, match="issues failed"):
+        await run_phase_graph(
+            [
+                Phase("images", never, inputs=("roster",), outputs=("img",), skip_message="images skipped"),
+                Phase("issues", boom, inputs=("roster",), outputs=("iss",)),
+                Phase("finance", slow, inputs=("roster",), outputs=("fin",)),
+                Phase("refinement", never, inputs=("img", "iss", "fin")),
+            ],
+            step_enabled=lambda s: s != "images",
+            track=track,
+            log=lambda *a: None,
+        )
+
+    assert ("skip", "images") in events
+    assert cancelled == ["finance"]
+    assert ("start", "refinement") not in events
+
+
+def test_phase_dependencies_rejects_cycles():
+    """A cycle in declared inputs/outputs is rejected before anything runs."""
+    from pipeline_client.agent.phases import Phase, phase_dependencies
+
+    async def noop():
+        return None
+
+    with pytest.raises(ValueError, match="cycle"):
+        phase_dependencies(
+            [
+                Phase("a", noop, inputs=("y",), outputs=("x",)),
+                Phase("b", noop, inputs=("x",), outputs=("y",)),
+            ]
+        )
+
+
+# ---------------------------------------------------------------------------
+# Context compaction tests
+# ---------------------------------------------------------------------------
+
+
+def _tool_turn(call_id, name, args, content):
+    return [
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(args)}}],
+        },
+        {"role": "tool", "tool_call_id": call_id, "content": content},
+    ]
+
+
+def test_compact_messages_digests_old_outputs_and_keeps_recent():
+    """Old page/search outputs become digests; the recent window stays verbatim."""
+    from pipeline_client.agent.compaction import compact_messages
+
+    page_body = "Campaign platform text. " * 800
+    search_body = json.dumps([{"title": f"Result {i}", "snippet": "s" * 400, "url": f"https://r{i}.com"} for i in range(8)])
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "go"}]
+    messages += _tool_turn("c1", "fetch_page", {"url": "https://old.com/issues"}, page_body)
+    messages += _tool_turn("c2", "web_search", {"query": "old query"}, search_body)
+    messages += _tool_turn("c3", "fetch_page", {"url": "https://recent.com"}, page_body)
+
+    saved, n = compact_messages(messages, token_budget=2000, keep_recent=2)
+
+    assert n == 2
+    assert saved > 4000
+    assert len(messages) == 8
+    assert messages[3]["content"].startswith("[compacted page https://old.com/issues")
+    assert "https://r7.com" in messages[5]["content"]
+    assert "s" * 400 not in messages[5]["content"]
+    assert messages[7]["content"] == page_body
+
+
+def test_compact_messages_noop_under_budget():
+    """Histories under the budget are left untouched."""
+    from pipeline_client.agent.compaction import compact_messages
+
+    messages = [{"role": "system", "content": "sys"}]
+    messages += _tool_turn("c1", "fetch_page", {"url": "https://a.com"}, "short page " * 100)
+    original = json.dumps(messages)
+
+    assert compact_messages(messages, token_budget=10_000) == (0, 0)
+    assert json.dumps(messages) == original
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_records_compaction_savings():
+    """_agent_loop compacts past the budget and records tokens saved in the run metrics."""
+    from pipeline_client.agent.cost import _cost_ctx
+
+    turns = [
+        _mock_openai_response(
+            tool_calls=[
+                {"id": f"call_{i}", "function": {"name": "fetch_page", "arguments": json.dumps({"url": f"https://p{i}.com"})}}
+            ]
+        )
+        for i in range(6)
+    ]
+    final = _mock_openai_response(content=json.dumps({"ok": True}))
+    for resp in turns:
+        tc = resp.choices[0].message.tool_calls[0]
+        tc.model_dump.return_value = {
+            "id": tc.id,
+            "type": "function",
+            "function": {"name": "fetch_page", "arguments": tc.function.arguments},
+        }
+
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _cost_ctx.set(acc)
+    try:
+        with (
+            patch("pipeline_client.agent.agent._call_openai", new_callable=AsyncMock) as mock_call,
+            patch("pipeline_client.agent.agent._fetch_page", new_callable=AsyncMock) as mock_fetch,
+        ):
+            mock_call.side_effect = turns + [final]
+            mock_fetch.return_value = "Long page body. " * 1000
+            result = await _agent_loop(
+                "system",
+                "user",
+                model="gpt-5.4-mini",
+                phase_name="test",
+                max_iterations=10,
+                context_token_budget=6000,
+            )
+    finally:
+        _cost_ctx.reset(token)
+
+    assert result == {"ok": True}
+    stats = acc["metrics"]["context_compaction"]
+    assert stats["tokens_saved"] > 0
+    assert stats["messages_compacted"] >= 1
+
+
+# ---------------------------------------------------------------------------
+# Streaming completion tests
+# ---------------------------------------------------------------------------
+
+
+class _FakeStream:
+    """Async iterator over pre-built ChatCompletionChunk objects."""
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed >= len(self._chunks):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return self._chunks[self.consumed - 1]
+
+    async def close(self):
+        self.closed = True
+
+
+def _chunk(delta=None, finish_reason=None, usage=None):
+    from openai.types.chat import ChatCompletionChunk
+
+    choices = [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "m",
+            "choices": choices,
+            "usage": usage,
+        }
+    )
+
+
+def _stream_client(*streams):
+    raws = []
+    for stream in streams:
+        raw = MagicMock()
+        raw.headers = {}
+        raw.parse.return_value = stream
+        raws.append(raw)
+    client = MagicMock()
+    client.chat.completions.with_raw_response.create = AsyncMock(side_effect=raws)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_call_openai_stream_assembles_tool_call_deltas():
+    """Streamed tool-call fragments are joined per index; TTFT and throughput are reported."""
+    from pipeline_client.agent.agent import _call_openai
+
+    stream = _FakeStream(
+        [
+            _chunk(
+                {
+                    "role": "assistant",
+                    "tool_calls": [
+                        {
+                            "index": 0,
+                            "id": "call_a",
+                            "type": "function",
+                            "function": {"name": "web_search", "arguments": '{"que'},
+                        },
+                    ],
+                }
+            ),
+            _chunk(
+                {
+                    "tool_calls": [
+                        {"index": 0, "function": {"arguments": 'ry": "x"}'}},
+                        {
+                            "index": 1,
+                            "id": "call_b",
+                            "type": "function",
+                            "function": {"name": "fetch_page", "arguments": "{}"},
+                        },
+                    ]
+                }
+            ),
+            _chunk({}, finish_reason="tool_calls"),
+            _chunk(usage={"prompt_tokens": 50, "completion_tokens": 20, "total_tokens": 70}),
+        ]
+    )
+    client = _stream_client(stream)
+    stats = {}
+    with patch("pipeline_client.agent.agent._get_openai_client", return_value=client):
+        resp = await _call_openai(
+            [{"role": "user", "content": "hi"}], model="test-stream-model", stream=True, stream_stats=stats
+        )
+
+    kwargs = client.chat.completions.with_raw_response.create.call_args.kwargs
+    assert kwargs["stream"] is True
+    choice = resp.choices[0]
+    assert choice.finish_reason == "tool_calls"
+    assert [tc.id for tc in choice.message.tool_calls] == ["call_a", "call_b"]
+    assert json.loads(choice.message.tool_calls[0].function.arguments) == {"query": "x"}
+    assert resp.usage.completion_tokens == 20
+    assert stats["ttft_s"] >= 0
+    assert stats["tokens_per_s"] > 0
+    assert stats["aborted_not_json"] is False
+
+
+@pytest.mark.asyncio
+async def test_call_openai_stream_stops_early_on_non_json_answer():
+    """A final answer that is clearly prose is cut off mid-stream and its tokens estimated."""
+    from pipeline_client.agent.agent import _call_openai
+    from pipeline_client.agent.cost import _cost_ctx
+
+    prose = _FakeStream([_chunk({"content": "I think the candidate supports many things. " * 5}) for _ in range(20)])
+    client = _stream_client(prose)
+
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    stats = {}
+    token = _cost_ctx.set(acc)
+    try:
+        with patch("pipeline_client.agent.agent._get_openai_client", return_value=client):
+            resp = await _call_openai(
+                [{"role": "user", "content": "hi"}],
+                model="test-stream-model",
+                stream=True,
+                expect_json=True,
+                stream_stats=stats,
+            )
+    finally:
+        _cost_ctx.reset(token)
+
+    assert stats["aborted_not_json"] is True
+    assert prose.closed and prose.consumed < 20
+    assert resp.choices[0].finish_reason == "stop"
+    assert resp.choices[0].message.content.startswith("I think")
+    assert acc["prompt_tokens"] > 0 and acc["completion_tokens"] > 0
+
+
+# ---------------------------------------------------------------------------
+# Record/replay cassette tests
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_cassette_records_then_replays_without_calling_out(tmp_path):
+    """Recorded results and token usage are served on replay; timestamps do not change keys."""
+    from pipeline_client.agent.cassette import Cassette, CassetteMiss, _cassette_ctx, recorded
+    from pipeline_client.agent.cost import _cost_ctx, accumulate
+
+    calls = []
+
+    @recorded("test_kind", decode=tuple)
+    async def outbound(query, *, stamp):
+        calls.append(query)
+        accumulate(10, 5, "m")
+        return (True, f"result for {query}")
+
+    path = tmp_path / "run.json"
+    recorder = Cassette(path, "record")
+    token = _cassette_ctx.set(recorder)
+    try:
+        assert await outbound("q1", stamp="2026-01-01T00:00:00+00:00") == (True, "result for q1")
+    finally:
+        _cassette_ctx.reset(token)
+    recorder.save()
+    assert calls == ["q1"]
+
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    cost_token = _cost_ctx.set(acc)
+    token = _cassette_ctx.set(Cassette(path, "replay"))
+    try:
+        assert await outbound("q1", stamp="2026-10-16T12:34:56.789+00:00") == (True, "result for q1")
+        with pytest.raises(CassetteMiss):
+            await outbound("q2", stamp="2026-01-01T00:00:00+00:00")
+    finally:
+        _cassette_ctx.reset(token)
+        _cost_ctx.reset(cost_token)
+
+    assert calls == ["q1"]
+    assert acc["model_breakdown"] == {"m": {"prompt_tokens": 10, "completion_tokens": 5}}
+
+
+@pytest.mark.asyncio
+async def test_call_openai_replays_recorded_completion(tmp_path):
+    """_call_openai is served from the cassette on replay, without an OpenAI client."""
+    from openai.types.chat import ChatCompletion
+
+    from pipeline_client.agent.agent import _call_openai
+    from pipeline_client.agent.cassette import Cassette, _cassette_ctx
+
+    completion = ChatCompletion.model_validate(
+        {
+            "id": "c1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "test-cassette-model",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": '{"ok": true}'}}],
+            "usage": {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10},
+        }
+    )
+    raw = MagicMock()
+    raw.headers = {}
+    raw.parse.return_value = completion
+    client = MagicMock()
+    client.chat.completions.with_raw_response.create = AsyncMock(return_value=raw)
+    messages = [{"role": "user", "content": "hi"}]
+
+    path = tmp_path / "openai.json"
+    recorder = Cassette(path, "record")
+    token = _cassette_ctx.set(recorder)
+    try:
+        with patch("pipeline_client.agent.agent._get_openai_client", return_value=client):
+            await _call_openai(messages, model="test-cassette-model")
+    finally:
+        _cassette_ctx.reset(token)
+    recorder.save()
+
+    token = _cassette_ctx.set(Cassette(path, "replay"))
+    try:
+        with patch("pipeline_client.agent.agent._get_openai_client", side_effect=AssertionError("network")):
+            replayed = await _call_openai(messages, model="test-cassette-model", max_retries=1)
+    finally:
+        _cassette_ctx.reset(token)
+
+    assert replayed.choices[0].message.content == '{"ok": true}'
+    assert replayed.usage.completion_tokens == 3
+    assert client.chat.completions.with_raw_response.create.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_issue_research_does_not_swallow_cassette_misses():
+    """A replay diverging inside an issue sub-agent fails the phase instead of dropping the issue."""
+    from pipeline_client.agent.agent import _run_issue_phase
+    from pipeline_client.agent.cassette import CassetteMiss
+
+    race_json = {"candidates": [{"name": "Alice", "issues": {}}]}
+    with (
+        patch("pipeline_client.agent.agent._agent_loop", side_effect=CassetteMiss("no recorded call")),
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
+    ):
+        with pytest.raises(CassetteMiss):
+            await _run_issue_phase(["Alice"], race_json, race_id="test-2024", model="gpt-5-nano")
+
+
+@pytest.mark.asyncio
+async def test_run_agent_saves_cassette_of_failed_run(tmp_path):
+    """A recorded run that fails still writes its cassette, with the calls made up to the failure."""
+    from pipeline_client.agent.cassette import Cassette
+
+    path = tmp_path / "failed.json"
+    with (
+        patch("pipeline_client.agent.agent._agent_loop", new_callable=AsyncMock, side_effect=RuntimeError("boom")),
+        patch("pipeline_client.agent.agent._load_existing", return_value=None),
+    ):
+        with pytest.raises(RuntimeError, match="boom"):
+            await run_agent(
+                "test-2024",
+                cheap_mode=True,
+                enabled_steps=["discovery"],
+                cassette_path=str(path),
+                cassette_mode="record",
+            )
+
+    assert Cassette(path, "replay").inputs["existing_data"] == {}
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint / resume tests
+# ---------------------------------------------------------------------------
+
+
+def _counting_loop(discovery_result):
+    """_agent_loop stand-in that charges 10+5 tokens per call and answers discovery first."""
+    from pipeline_client.agent.cost import accumulate
+
+    calls = []
+
+    async def fake_loop(*args, **kwargs):
+        calls.append(kwargs.get("phase_name"))
+        accumulate(10, 5, "gpt-5.4-mini")
+        if kwargs.get("phase_name") == "discovery":
+            return discovery_result
+        return {}
+
+    return fake_loop, calls
+
+
+@pytest.mark.asyncio
+async def test_run_agent_resumes_after_review_failure(tmp_path):
+    """A run that dies in review resumes without re-running research and keeps its token spend."""
+    from pipeline_client.backend.storage_backend import LocalStorageBackend
+
+    store = LocalStorageBackend(tmp_path)
+    fake_loop, calls = _counting_loop({"id": "test-2024", "candidates": [{"name": "Alice", "issues": {}}]})
+    steps = ["discovery", "images", "issues", "finance", "refinement", "review"]
+
+    with (
+        patch("pipeline_client.agent.agent._agent_loop", side_effect=fake_loop),
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
+        patch("pipeline_client.agent.agent.run_reviews", side_effect=RuntimeError("review provider down")),
+    ):
+        with pytest.raises(RuntimeError):
+            await run_agent("test-2024", existing_data={}, enabled_steps=steps, checkpoint_store=store)
+
+    saved = store.load_checkpoint("test-2024")
+    assert saved["mode"] == "fresh"
+    assert saved["phases"][0] == "discovery"
+    assert set(saved["phases"]) == {"discovery", "images", "issues", "finance", "refinement"}
+    assert len(saved["units"]) == len(CANONICAL_ISSUES)
+    first_run_calls = len(calls)
+    assert saved["cost"]["prompt_tokens"] == 10 * first_run_calls
+
+    completed = []
+    with (
+        patch("pipeline_client.agent.agent._agent_loop", side_effect=fake_loop),
+        patch("pipeline_client.agent.agent.run_reviews", new_callable=AsyncMock, return_value=[]),
+    ):
+        result = await run_agent(
+            "test-2024",
+            enabled_steps=steps,
+            checkpoint_store=store,
+            resume=True,
+            step_tracker={"complete": lambda step, **kw: completed.append(step)},
+        )
+
+    assert len(calls) == first_run_calls  # nothing re-researched
+    assert result["candidates"][0]["name"] == "Alice"
+    assert result["agent_metrics"]["prompt_tokens"] == 10 * first_run_calls
+    assert set(completed) == set(steps)
+    assert store.load_checkpoint("test-2024")["phases"][-1] == "review"
+
+
+@pytest.mark.asyncio
+async def test_run_agent_resumes_mid_issue_phase(tmp_path):
+    """Resume skips issue units already checkpointed and runs only the rest."""
+    from pipeline_client.backend.storage_backend import LocalStorageBackend
+
+    store = LocalStorageBackend(tmp_path)
+    race = {"id": "test-2024", "candidates": [{"name": "Alice", "issues": {}}]}
+    done = CANONICAL_ISSUES[:5]
+    store.save_checkpoint(
+        "test-2024",
+        {
+            "version": 1,
+            "race_id": "test-2024",
+            "mode": "fresh",
+            "phases": ["discovery", "images"],
+            "units": [f"Alice|{issue}" for issue in done],
+            "race_json": race,
+            "cost": {"prompt_tokens": 100, "completion_tokens": 50},
+        },
+    )
+    fake_loop, calls = _counting_loop(race)
+
+    with (
+        patch("pipeline_client.agent.agent._agent_loop", side_effect=fake_loop),
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=None),
+    ):
+        result = await run_agent(
+            "test-2024",
+            enabled_steps=["discovery", "images", "issues", "finance", "refinement"],
+            checkpoint_store=store,
+            resume=True,
+        )
+
+    issue_calls = [c for c in calls if c.startswith("issue-")]
+    assert len(issue_calls) == len(CANONICAL_ISSUES) - len(done)
+    assert not any(c.endswith(issue[:15]) for c in issue_calls for issue in done)
+    assert "discovery" not in calls
+    # finance + per-candidate refine + meta refine
+    assert len(calls) == len(issue_calls) + 3
+    assert result["agent_metrics"]["prompt_tokens"] == 100 + 10 * len(calls)
+    assert len(store.load_checkpoint("test-2024")["units"]) == len(CANONICAL_ISSUES)
+
+
+# ---------------------------------------------------------------------------
+# Single-flight coalescing tests
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_request():
+    """Identical in-flight searches make one Serper call and one cache write; the rest are counted."""
+    import asyncio
+
+    from pipeline_client.agent.cost import _cost_ctx
+
+    async def slow_post(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        resp = MagicMock()
+        resp.json.return_value = {"organic": [{"title": "T", "snippet": "S", "link": "https://a.example"}]}
+        return resp
+
+    client = MagicMock()
+    client.post = AsyncMock(side_effect=slow_post)
+    cache = MagicMock()
+    cache.aget = AsyncMock(return_value=None)
+    cache.aset = AsyncMock(return_value=True)
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _cost_ctx.set(acc)
+    try:
+        with (
+            patch.dict(os.environ, {"SERPER_API_KEY": "k"}),
+            patch("pipeline_client.agent.agent._get_search_cache", return_value=cache),
+            patch("pipeline_client.agent.agent._get_serper_client", return_value=client),
+        ):
+            results = await asyncio.gather(*[_serper_search("same query", race_id="r") for _ in range(3)])
+            await _serper_search("other query", race_id="r")
+    finally:
+        _cost_ctx.reset(token)
+
+    assert all(r == results[0] for r in results)
+    assert client.post.call_count == 2
+    assert cache.aset.await_count == 2
+    assert acc["metrics"]["single_flight"] == {"searches_coalesced": 2}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_survives_caller_cancellation():
+    """A failure reaches every waiter; cancelling one waiter leaves the shared call running."""
+    import asyncio
+
+    from pipeline_client.agent.single_flight import SingleFlight
+
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        raise ValueError("boom")
+
+    first = asyncio.ensure_future(flight.do("k", fetch))
+    second = asyncio.ensure_future(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    with pytest.raises(ValueError):
+        await second
+    assert calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_bounds_hosts_and_reports_hits_and_waste():
+    """Top eligible results are prefetched one at a time per host; unread pages count as wasted bytes."""
+    import asyncio
+
+    from pipeline_client.agent.cost import _cost_ctx
+    from pipeline_client.agent.prefetch import Prefetcher
+
+    active = {"total": 0, "peak": 0, "a.example": 0, "a_peak": 0}
+    fetched = []
+
+    async def fake_fetch(url):
+        host = url.split("/")[2]
+        active["total"] += 1
+        active["peak"] = max(active["peak"], active["total"])
+        if host == "a.example":
+            active["a.example"] += 1
+            active["a_peak"] = max(active["a_peak"], active["a.example"])
+        await asyncio.sleep(0.01)
+        active["total"] -= 1
+        if host == "a.example":
+            active["a.example"] -= 1
+        fetched.append(url)
+        return "[Failed to fetch https://c.example/]" if host == "c.example" else "x" * 100
+
+    results = [
+        {"url": "https://www.facebook.com/jane"},
+        {"url": "https://a.example/1"},
+        {"url": "https://a.example/2"},
+        {"url": "https://b.example/report.pdf"},
+        {"url": "https://b.example/"},
+        {"url": "https://c.example/"},
+        {"url": "https://d.example/"},
+    ]
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _cost_ctx.set(acc)
+    try:
+        prefetcher = Prefetcher(fake_fetch, top_n=4, concurrency=2, per_host_interval_s=0)
+        assert prefetcher.schedule(results) == [
+            "https://a.example/1",
+            "https://a.example/2",
+            "https://b.example/",
+            "https://c.example/",
+        ]
+        assert prefetcher.schedule(results) == []
+        assert prefetcher.claim("https://a.example/2")
+        assert not prefetcher.claim("https://d.example/")
+        await asyncio.sleep(0.1)
+        # Finished prefetches are hits only when they produced a page
+        assert prefetcher.claim("https://b.example/")
+        assert not prefetcher.claim("https://c.example/")
+        summary = await prefetcher.close()
+    finally:
+        _cost_ctx.reset(token)
+
+    assert len(fetched) == 4
+    assert active["peak"] <= 2 and active["a_peak"] == 1
+    assert summary == {"scheduled": 4, "hits": 2, "hit_rate": 0.5, "wasted_bytes": 100}
+    metrics = acc["metrics"]["prefetch"]
+    assert metrics["fetched"] == 3 and metrics["fetched_bytes"] == 300
+    assert metrics["wasted_bytes"] == 100
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_tool_uses_prefetched_page():
+    """A fetch_page call for a prefetched URL is served from the cache the prefetch filled."""
+    import asyncio
+
+    from pipeline_client.agent.agent import _prefetch_page, _run_network_tool
+    from pipeline_client.agent.prefetch import Prefetcher, _prefetch_ctx
+
+    pages = {}
+    downloads = []
+
+    async def fake_download(url, cache, race_id):
+        downloads.append(url)
+        pages[url] = "page text"
+        return "page text"
+
+    cache = MagicMock()
+    cache.aget_page = AsyncMock(side_effect=lambda url, race_id=None: pages.get(url))
+    cache.ahas_page = AsyncMock(side_effect=lambda url: url in pages)
+    cache.aget_fetch_failure = AsyncMock(return_value=None)
+    search = MagicMock(arguments=json.dumps({"query": "q"}))
+    search.name = "web_search"
+    fetch = MagicMock(arguments=json.dumps({"url": "https://a.example/"}))
+    fetch.name = "fetch_page"
+
+    prefetcher = Prefetcher(_prefetch_page, top_n=2, per_host_interval_s=0)
+    token = _prefetch_ctx.set(prefetcher)
+    try:
+        with (
+            patch("pipeline_client.agent.agent._get_search_cache", return_value=cache),
+            patch("pipeline_client.agent.agent._download_page", side_effect=fake_download),
+            patch(
+                "pipeline_client.agent.agent._serper_search",
+                AsyncMock(return_value=[{"url": "https://a.example/"}, {"url": "https://b.example/"}]),
+            ),
+        ):
+            await _run_network_tool(search, lambda *a: None, "race")
+            await asyncio.sleep(0.05)
+            text = await _run_network_tool(fetch, lambda *a: None, "race")
+            summary = await prefetcher.close()
+    finally:
+        _prefetch_ctx.reset(token)
+
+    assert text == "page text"
+    assert sorted(downloads) == ["https://a.example/", "https://b.example/"]
+    assert summary["hits"] == 1 and summary["wasted_bytes"] == len("page text")
+
+
+@pytest.mark.asyncio
+async def test_prefetch_cache_check_does_not_count_hits(tmp_path):
+    """Checking whether a prefetch is needed leaves hit counts, recency and tier stats untouched."""
+    from pipeline_client.agent.agent import _prefetch_page
+    from pipeline_client.agent.cache_tiers import TieredCache
+    from pipeline_client.agent.search_cache import SearchCache
+
+    cache = TieredCache(SearchCache(cache_dir=str(tmp_path)))
+    await cache.aset_page("https://a.example/", "page text")
+    with cache._pool.connection() as conn:
+        accessed = conn.execute("SELECT last_accessed FROM page_cache").fetchone()[0]
+    stats = cache.tier_stats()
+
+    with (
+        patch("pipeline_client.agent.agent._get_search_cache", return_value=cache),
+        patch("pipeline_client.agent.agent._download_page", new_callable=AsyncMock) as mock_download,
+    ):
+        assert await _prefetch_page("https://a.example/") is None
+
+    mock_download.assert_not_called()
+    cache.flush_hits()
+    with cache._pool.connection() as conn:
+        assert tuple(conn.execute("SELECT hit_count, last_accessed FROM page_cache").fetchone()) == (0, accessed)
+    assert cache.tier_stats() == stats
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_run_agent_closes_prefetcher_when_a_phase_fails():
+    """A failing run still cancels outstanding prefetches and clears the run's prefetcher."""
+    from pipeline_client.agent.prefetch import Prefetcher, get_prefetcher
+
+    with (
+        patch("pipeline_client.agent.agent._agent_loop", new_callable=AsyncMock, side_effect=RuntimeError("boom")),
+        patch("pipeline_client.agent.agent._load_existing", return_value=None),
+        patch.object(Prefetcher, "close", new_callable=AsyncMock) as mock_close,
+    ):
+        mock_close.return_value = {"scheduled": 0, "hits": 0, "hit_rate": 0.0, "wasted_bytes": 0}
+        with pytest.raises(RuntimeError, match="boom"):
+            await run_agent("test-2024", cheap_mode=True, enabled_steps=["discovery"], prefetch=True)
+
+    mock_close.assert_awaited_once()
+    assert get_prefetcher() is None
+
+
+def test_select_passages_ranks_focus_passages_past_the_head():
+    """A focused page keeps its title and the passages about the focus, marking dropped text with [...]."""
+    from pipeline_client.agent.passages import select_passages
+
+    boilerplate = "\n\n".join(f"Donate today and join our volunteer team number {i}. " * 6 for i in range(60))
+    text = (
+        "Jane Doe for Senate\n\n"
+        + boilerplate
+        + "\n\nHealthcare: Jane will cap insulin costs and expand rural clinics.\n\n"
+        + boilerplate
+    )
+
+    selected, dropped = select_passages(text, "healthcare costs", max_tokens=200)
+
+    assert selected.startswith("Jane Doe for Senate")
+    assert "cap insulin costs" in selected
+    assert "[...]" in selected
+    assert len(selected) <= 800 and dropped > 0
+    assert select_passages("short page", "healthcare", max_tokens=200) == ("short page", 0)
+    # Nothing matches the focus → the head of the page
+    head, _ = select_passages(text, "zoning", max_tokens=200)
+    assert head.startswith("Jane Doe for Senate") and "insulin" not in head
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_tool_focus_returns_relevant_passages():
+    """fetch_page with a focus returns relevant text beyond the head-truncation limit."""
+    from pipeline_client.agent.agent import _PAGE_MAX_CHARS, _run_network_tool
+
+    page = "Jane Doe for Senate\n\n" + "\n\n".join(["Sign up for updates and donate now. " * 10] * 80)
+    page += "\n\nOn education, Jane will raise teacher pay and fund universal pre-K."
+    assert len(page) > _PAGE_MAX_CHARS
+
+    def tool_call(args):
+        fn = MagicMock(arguments=json.dumps(args))
+        fn.name = "fetch_page"
+        return fn
+
+    with patch("pipeline_client.agent.agent._fetch_page", AsyncMock(return_value=page)):
+        plain = await _run_network_tool(tool_call({"url": "https://jane.example"}), lambda *a: None, "race")
+        focused = await _run_network_tool(
+            tool_call({"url": "https://jane.example", "focus": "Education"}), lambda *a: None, "race"
+        )
+
+    assert "teacher pay" not in plain and plain.endswith(f"[...truncated at {_PAGE_MAX_CHARS} chars]")
+    assert "teacher pay" in focused and len(focused) <= _PAGE_MAX_CHARS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["thread", "process"])
+async def test_run_cpu_offloads_large_inputs_and_records_histogram(mode):
+    """Large inputs run on the offload executor; the histogram counts every call, offloaded or not."""
+    from pipeline_client.agent import offload
+    from pipeline_client.agent.cost import _cost_ctx
+    from pipeline_client.agent.html_text import extract_text
+
+    offload.shutdown_cpu_executor()
+    acc = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _cost_ctx.set(acc)
+    try:
+        with patch.dict(os.environ, {"CPU_OFFLOAD_MODE": mode, "CPU_OFFLOAD_WORKERS": "2"}):
+            before = offload.timing_histograms()["functions"].get("_extract_json", {"count": 0, "offloaded": 0})
+            big = json.dumps({"items": ["x" * 100] * 500})
+            assert await offload.run_cpu(_extract_json, big, min_size=len(big)) == json.loads(big)
+            assert await offload.run_cpu(_extract_json, '{"a": 1}', min_size=8) == {"a": 1}
+            assert await offload.run_cpu(extract_text, "<p>Hi</p>") == "Hi"
+            with pytest.raises(ValueError):
+                await offload.run_cpu(_extract_json, "not json " * 5000, min_size=45000)
+            stats = offload.timing_histograms()
+    finally:
+        _cost_ctx.reset(token)
+        offload.shutdown_cpu_executor()
+
+    assert stats["mode"] == mode
+    extract_json = stats["functions"]["_extract_json"]
+    assert extract_json["count"] - before["count"] == 2
+    assert extract_json["offloaded"] - before["offloaded"] == 1
+    assert sum(extract_json["buckets"].values()) == extract_json["count"]
+    assert acc["metrics"]["offload"]["_extract_json_calls"] == 1
+    assert acc["metrics"]["offload"]["extract_text_calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_polite_transport_limits_hosts_and_counts_connection_reuse():
+    """Per-host concurrency and spacing are enforced (subdomains included); new connections are counted."""
+    import asyncio
+    import time
+
+    import httpx
+
+    from pipeline_client.agent import http_client
+    from pipeline_client.agent.http_client import PoliteTransport, _parse_host_limits
+
+    in_flight = {"now": 0, "peak": 0}
+    starts = []
+    opened = set()
+
+    async def handler(request):
+        # The first request to each host opens a connection; later ones reuse it
+        if request.url.host not in opened:
+            opened.add(request.url.host)
+            await request.extensions["trace"]("connection.connect_tcp.complete", {})
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        starts.append((request.url.host, time.monotonic()))
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return httpx.Response(200, text="ok")
+
+    policies = _parse_host_limits("slow.example=1:0.05, bad-entry=x")
+    assert policies == {"slow.example": (1, 0.05)}
+    transport = PoliteTransport(httpx.MockTransport(handler), policies=policies, default_concurrency=3)
+    http_client._stats.pop("a.slow.example", None)
+    http_client._stats.pop("b.slow.example", None)
+    async with httpx.AsyncClient(transport=transport) as client:
+        urls = ["https://a.slow.example/1", "https://b.slow.example/2", "https://a.slow.example/3"]
+        await asyncio.gather(*[client.get(url) for url in urls])
+        assert in_flight["peak"] == 1
+        gaps = [b - a for (_, a), (_, b) in zip(starts, starts[1:])]
+        assert all(gap >= 0.045 for gap in gaps)
+
+        in_flight["peak"] = 0
+        await asyncio.gather(*[client.get(f"https://fast.example/{i}") for i in range(6)])
+        assert in_flight["peak"] == 3
+
+    stats = http_client.connection_stats()["hosts"]
+    assert stats["a.slow.example"]["requests"] == 2
+    assert stats["a.slow.example"]["new_connections"] == 1
+    assert stats["a.slow.example"]["reuse_rate"] == 0.5
+    assert stats["b.slow.example"]["politeness_wait_s"] > 0
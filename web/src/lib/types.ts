@@ -225,6 +225,9 @@ export interface RunOptions {
   max_candidates?: number;
   target_no_info?: boolean;
   candidate_names?: string[];
+  issue_concurrency?: number;
+  parallel_issues?: boolean;
+  resume?: boolean;
 }
 
 export interface RunStep {